@@ -6,8 +6,9 @@ backtest_microstructure.py
 Comprehensive backtesting script for the SpreadMomentum microstructure strategy.
 
 This script:
-1. Fetches historical S5 (5-second) candle data from OANDA
-2. Runs the SpreadMomentum strategy on this data
+1. Fetches historical S5 (5-second) candle data from OANDA for each
+   instrument given on the command line (default: EUR_USD)
+2. Runs the SpreadMomentum strategy on this data, one process per instrument
 3. Computes comprehensive performance metrics including:
    - Win rate
    - Profit factor
@@ -19,14 +20,17 @@ This script:
 
 import sys
 import json
+import os
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 # Import from oanda_bot package
 from oanda_bot.data import get_candles
 from oanda_bot.strategy.spread_momentum import StrategySpreadMomentum
 from oanda_bot.strategy.macd_trends import sl_tp_levels
+from oanda_bot.strategy import warmup as warmup_kernels
 
 
 def compute_performance_metrics(
@@ -250,6 +254,50 @@ def run_backtest(
     return metrics, trades, equity_curve
 
 
+def _run_job(
+    candles: List[dict],
+    params: Dict[str, Any],
+    warmup: int,
+    initial_capital: float,
+    position_size_pct: float,
+) -> Tuple[Dict, List[Dict], List[float]]:
+    """``run_backtest`` on a fresh strategy built from ``params`` (one worker job)."""
+    return run_backtest(
+        StrategySpreadMomentum(dict(params)),
+        candles,
+        warmup=warmup,
+        initial_capital=initial_capital,
+        position_size_pct=position_size_pct,
+    )
+
+
+def run_backtests_parallel(
+    jobs: Iterable[Tuple[str, List[dict], Dict[str, Any]]],
+    warmup: int = 50,
+    initial_capital: float = 10000.0,
+    position_size_pct: float = 0.01,
+    max_workers: Optional[int] = None,
+) -> List[Tuple[str, Dict, List[Dict], List[float]]]:
+    """
+    Backtest several ``(instrument, candles, params)`` jobs in parallel.
+
+    Each job runs ``run_backtest`` in its own process on its own strategy
+    instance; instances share no state, so the only inter-process traffic
+    is the candles in and the results back.
+
+    Returns one ``(instrument, metrics, trades, equity_curve)`` tuple per
+    job, in job order - the same instrument may appear in several jobs
+    (e.g. with different params) without their results colliding.
+    """
+    jobs = list(jobs)
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as ex:
+        futures = [
+            ex.submit(_run_job, candles, params, warmup, initial_capital, position_size_pct)
+            for _, candles, params in jobs
+        ]
+        return [(job[0], *future.result()) for job, future in zip(jobs, futures)]
+
+
 def main():
     """Main backtesting execution."""
     print("=" * 80)
@@ -258,7 +306,7 @@ def main():
     print("=" * 80)
 
     # Parameters
-    instrument = "EUR_USD"
+    instruments = list(dict.fromkeys(sys.argv[1:])) or ["EUR_USD"]
     granularity = "S5"  # 5-second bars (closest to 2-second on OANDA)
     count = 5000  # Maximum allowed by OANDA API
     warmup = 50
@@ -278,125 +326,134 @@ def main():
         "max_duration": 12,
     }
 
-    print(f"\nFetching {count} candles for {instrument} @ {granularity}...")
+    candles_by_instrument = {}
+    for instrument in instruments:
+        print(f"\nFetching {count} candles for {instrument} @ {granularity}...")
 
-    try:
-        candles = get_candles(instrument, granularity, count, price="M")
-        print(f"Successfully fetched {len(candles)} candles")
-    except Exception as e:
-        print(f"ERROR: Failed to fetch candles: {e}")
-        print("\nNote: This requires valid OANDA API credentials in .env file")
-        print("OANDA_TOKEN and OANDA_ACCOUNT_ID must be set")
-        sys.exit(1)
+        try:
+            candles = get_candles(instrument, granularity, count, price="M")
+            print(f"Successfully fetched {len(candles)} candles")
+        except Exception as e:
+            print(f"ERROR: Failed to fetch candles: {e}")
+            print("\nNote: This requires valid OANDA API credentials in .env file")
+            print("OANDA_TOKEN and OANDA_ACCOUNT_ID must be set")
+            sys.exit(1)
 
-    if not candles:
-        print("ERROR: No candles returned from API")
-        sys.exit(1)
+        if not candles:
+            print(f"ERROR: No candles returned from API for {instrument}")
+            sys.exit(1)
+        candles_by_instrument[instrument] = candles
 
-    # Initialize strategy
     print(f"\nInitializing SpreadMomentum strategy with parameters:")
     for key, value in params.items():
         if not key.startswith("_"):
             print(f"  {key}: {value}")
 
-    strategy = StrategySpreadMomentum(params)
+    # Compile kernels once here; forked workers inherit them
+    warmup_kernels()
 
-    # Run backtest
+    # Run one backtest per instrument, in parallel
     print("\n" + "=" * 80)
     print("RUNNING BACKTEST")
     print("=" * 80)
 
-    metrics, trades, equity_curve = run_backtest(
-        strategy,
-        candles,
+    runs = run_backtests_parallel(
+        [(instrument, candles_by_instrument[instrument], params) for instrument in instruments],
         warmup=warmup,
         initial_capital=10000.0,
         position_size_pct=0.01,
     )
 
-    # Print results
-    print("\n" + "=" * 80)
-    print("BACKTEST RESULTS")
-    print("=" * 80)
-
-    print(f"\nTRADE STATISTICS:")
-    print(f"  Total Trades:        {metrics['total_trades']}")
-    print(f"  Wins:                {metrics['wins']}")
-    print(f"  Losses:              {metrics['losses']}")
-    print(f"  Win Rate:            {metrics['win_rate']:.2%}")
-    print(f"  Average Win:         ${metrics['avg_win']:.2f}")
-    print(f"  Average Loss:        ${metrics['avg_loss']:.2f}")
-    print(f"  Expectancy:          ${metrics['expectancy']:.2f}")
-
-    print(f"\nPERFORMANCE METRICS:")
-    print(f"  Total PnL:           ${metrics['total_pnl']:.2f}")
-    print(f"  Total Return:        {metrics['total_pnl_pct']:.2f}%")
-    print(f"  Profit Factor:       {metrics['profit_factor']:.2f}")
-    print(f"  Max Drawdown:        ${metrics['max_drawdown']:.2f} ({metrics['max_drawdown_pct']:.2f}%)")
-    print(f"  Sharpe Ratio:        {metrics['sharpe_ratio']:.2f}")
-
-    print(f"\nFINAL EQUITY:          ${equity_curve[-1]:.2f}")
-
-    # Save detailed results
-    results = {
-        "strategy": "SpreadMomentum",
-        "instrument": instrument,
-        "granularity": granularity,
-        "total_candles": len(candles),
-        "parameters": params,
-        "metrics": metrics,
-        "trades_summary": {
-            "first_10": trades[:10] if len(trades) > 10 else trades,
-            "last_10": trades[-10:] if len(trades) > 10 else [],
-        },
-    }
-
-    output_file = "backtest_results_microstructure.json"
-    with open(output_file, "w") as f:
-        json.dump(results, f, indent=2)
-
-    print(f"\nDetailed results saved to: {output_file}")
-
-    # Analysis
-    print("\n" + "=" * 80)
-    print("ANALYSIS")
-    print("=" * 80)
-
-    if metrics["total_trades"] > 0:
-        if metrics["win_rate"] >= 0.55 and metrics["profit_factor"] >= 1.5:
-            print("\n✓ STRATEGY SHOWS PROMISE:")
-            print("  - Win rate above 55%")
-            print("  - Profit factor above 1.5")
-            print("  - Consider live testing with small position sizes")
-        elif metrics["win_rate"] >= 0.50 and metrics["profit_factor"] >= 1.2:
-            print("\n~ STRATEGY NEEDS REFINEMENT:")
-            print("  - Positive expectancy but marginal edge")
-            print("  - Consider parameter optimization")
-            print("  - Test on different market conditions")
-        else:
-            print("\n✗ STRATEGY NEEDS IMPROVEMENT:")
-            print("  - Win rate or profit factor too low")
-            print("  - Review entry/exit logic")
-            print("  - Consider different market microstructure patterns")
-
-        if metrics["sharpe_ratio"] >= 1.5:
-            print("  - Excellent risk-adjusted returns (Sharpe > 1.5)")
-        elif metrics["sharpe_ratio"] >= 1.0:
-            print("  - Good risk-adjusted returns (Sharpe > 1.0)")
-        else:
-            print("  - Risk-adjusted returns need improvement")
+    for instrument, metrics, trades, equity_curve in runs:
+        candles = candles_by_instrument[instrument]
+
+        # Print results
+        print("\n" + "=" * 80)
+        print(f"BACKTEST RESULTS: {instrument}")
+        print("=" * 80)
+
+        print(f"\nTRADE STATISTICS:")
+        print(f"  Total Trades:        {metrics['total_trades']}")
+        print(f"  Wins:                {metrics['wins']}")
+        print(f"  Losses:              {metrics['losses']}")
+        print(f"  Win Rate:            {metrics['win_rate']:.2%}")
+        print(f"  Average Win:         ${metrics['avg_win']:.2f}")
+        print(f"  Average Loss:        ${metrics['avg_loss']:.2f}")
+        print(f"  Expectancy:          ${metrics['expectancy']:.2f}")
+
+        print(f"\nPERFORMANCE METRICS:")
+        print(f"  Total PnL:           ${metrics['total_pnl']:.2f}")
+        print(f"  Total Return:        {metrics['total_pnl_pct']:.2f}%")
+        print(f"  Profit Factor:       {metrics['profit_factor']:.2f}")
+        print(f"  Max Drawdown:        ${metrics['max_drawdown']:.2f} ({metrics['max_drawdown_pct']:.2f}%)")
+        print(f"  Sharpe Ratio:        {metrics['sharpe_ratio']:.2f}")
+
+        print(f"\nFINAL EQUITY:          ${equity_curve[-1]:.2f}")
+
+        # Save detailed results
+        results = {
+            "strategy": "SpreadMomentum",
+            "instrument": instrument,
+            "granularity": granularity,
+            "total_candles": len(candles),
+            "parameters": params,
+            "metrics": metrics,
+            "trades_summary": {
+                "first_10": trades[:10] if len(trades) > 10 else trades,
+                "last_10": trades[-10:] if len(trades) > 10 else [],
+            },
+        }
 
-        if metrics["max_drawdown_pct"] <= 10.0:
-            print("  - Manageable drawdown (<10%)")
-        elif metrics["max_drawdown_pct"] <= 20.0:
-            print("  - Moderate drawdown (10-20%)")
+        output_file = (
+            "backtest_results_microstructure.json"
+            if len(instruments) == 1
+            else f"backtest_results_microstructure_{instrument}.json"
+        )
+        with open(output_file, "w") as f:
+            json.dump(results, f, indent=2)
+
+        print(f"\nDetailed results saved to: {output_file}")
+
+        # Analysis
+        print("\n" + "=" * 80)
+        print("ANALYSIS")
+        print("=" * 80)
+
+        if metrics["total_trades"] > 0:
+            if metrics["win_rate"] >= 0.55 and metrics["profit_factor"] >= 1.5:
+                print("\n✓ STRATEGY SHOWS PROMISE:")
+                print("  - Win rate above 55%")
+                print("  - Profit factor above 1.5")
+                print("  - Consider live testing with small position sizes")
+            elif metrics["win_rate"] >= 0.50 and metrics["profit_factor"] >= 1.2:
+                print("\n~ STRATEGY NEEDS REFINEMENT:")
+                print("  - Positive expectancy but marginal edge")
+                print("  - Consider parameter optimization")
+                print("  - Test on different market conditions")
+            else:
+                print("\n✗ STRATEGY NEEDS IMPROVEMENT:")
+                print("  - Win rate or profit factor too low")
+                print("  - Review entry/exit logic")
+                print("  - Consider different market microstructure patterns")
+
+            if metrics["sharpe_ratio"] >= 1.5:
+                print("  - Excellent risk-adjusted returns (Sharpe > 1.5)")
+            elif metrics["sharpe_ratio"] >= 1.0:
+                print("  - Good risk-adjusted returns (Sharpe > 1.0)")
+            else:
+                print("  - Risk-adjusted returns need improvement")
+
+            if metrics["max_drawdown_pct"] <= 10.0:
+                print("  - Manageable drawdown (<10%)")
+            elif metrics["max_drawdown_pct"] <= 20.0:
+                print("  - Moderate drawdown (10-20%)")
+            else:
+                print("  - High drawdown (>20%) - risk management needed")
         else:
-            print("  - High drawdown (>20%) - risk management needed")
-    else:
-        print("\n! NO TRADES EXECUTED:")
-        print("  - Strategy may be too conservative")
-        print("  - Consider relaxing entry conditions")
-        print("  - Verify data quality and timeframe")
+            print("\n! NO TRADES EXECUTED:")
+            print("  - Strategy may be too conservative")
+            print("  - Consider relaxing entry conditions")
+            print("  - Verify data quality and timeframe")
 
     print("\n" + "=" * 80)
     print("MICROSTRUCTURE EDGE ANALYSIS")
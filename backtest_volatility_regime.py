@@ -27,6 +27,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from oanda_bot.data.core import get_candles
 from oanda_bot.strategy.volatility_regime import StrategyVolatilityRegime
+from oanda_bot.strategy import warmup as warmup_kernels
 
 
 def calculate_drawdown(equity_curve):
@@ -82,10 +83,13 @@ def sl_tp_levels(bars, signal, params):
         close_arr = np.array([float(c["mid"]["c"]) for c in bars])
 
         atr_period = params.get("atr_period", 14)
-        tr1 = high - low
-        tr2 = np.abs(high - np.roll(close_arr, 1))
-        tr3 = np.abs(low - np.roll(close_arr, 1))
-        tr = np.maximum(np.maximum(tr1, tr2), tr3)
+        # Previous close, wrapping at the start as np.roll did
+        close_prev = np.empty_like(close_arr)
+        close_prev[0] = close_arr[-1]
+        close_prev[1:] = close_arr[:-1]
+        tr = high - low
+        np.maximum(tr, np.abs(high - close_prev), out=tr)
+        np.maximum(tr, np.abs(low - close_prev), out=tr)
 
         atr = np.mean(tr[-atr_period:])
         close = close_arr[-1]
@@ -322,6 +326,8 @@ def main():
     print(f"# {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"{'#'*80}\n")
 
+    warmup_kernels()
+
     # Test configurations
     pairs = ["EUR_USD", "GBP_USD", "USD_JPY", "AUD_USD"]
     granularities = ["M1", "M5", "M15"]  # 1-min, 5-min, 15-min
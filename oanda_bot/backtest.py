@@ -15,7 +15,9 @@ import logging.handlers
 from pythonjsonlogger import jsonlogger
 from .data import get_candles
 from .strategy.base import BaseStrategy
+from .strategy._candle import CandleBatch
 from .strategy.macd_trends import sl_tp_levels
+from .strategy import warmup as warmup_kernels
 
 # Configure rotating log handler
 handler = logging.handlers.RotatingFileHandler(
@@ -71,6 +73,11 @@ def run_backtest(
         len(candles),
     )
     position = None  # holds current open trade or None
+    # Strategies with a batch entry point get the candles converted once
+    batch = (
+        CandleBatch.from_raw(candles)
+        if hasattr(strategy, "next_signal_batch") else None
+    )
     for idx, candle in enumerate(candles):
         bars.append(candle)
 
@@ -119,7 +126,12 @@ def run_backtest(
 
         # -------- look for a new entry signal --------------------------------
         if position is None and idx < len(candles) - 1:
-            signal = strategy.next_signal(list(bars))
+            if batch is not None:
+                signal = strategy.next_signal_batch(
+                    batch.window(max(0, idx + 1 - bars.maxlen), idx + 1)
+                )
+            else:
+                signal = strategy.next_signal(list(bars))
             if signal in ("BUY", "SELL"):
                 entry_price = float(candle["mid"]["c"])
                 sl, tp = sl_tp_levels(list(bars), signal, strategy.params)
@@ -196,6 +208,7 @@ def main():
 
     logger.info("Loading strategy %s with params %s", args.strategy, params)
     strat = load_strategy(args.strategy, params)
+    warmup_kernels()
 
     logger.info(
         "Fetching %d historical candles for %s @ %s",
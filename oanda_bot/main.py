@@ -82,6 +82,7 @@ else:
         return iter([])
 from oanda_bot.strategy.base import BaseStrategy
 from oanda_bot.strategy.utils import sl_tp_levels
+from oanda_bot.strategy import warmup as warmup_kernels
 from oanda_bot.backtest import run_backtest
 from dotenv import load_dotenv
 
@@ -1056,18 +1057,18 @@ if __name__ == "__main__":
     logger.info(f"Active trading pairs ({len(ACTIVE_PAIRS)}): {ACTIVE_PAIRS}")
     reconcile_positions(verbose=True)
 
+    # Compile strategy kernels now rather than on the first live bar
+    warmup_kernels()
+
     # Pre-seed each strategy's internal state with recent historical bars
     logger.info("Pre-seeding strategy state with historical bars")
     for strat in strategy_manager.get_snapshot():
+        seed = getattr(strat, "seed", None)
+        if seed is None:
+            continue
         try:
             for pair in ALL_PAIRS:
-                candles = get_candles(symbol=pair, count=300)
-                for c in candles:
-                    bar = getattr(strat, "_candle_to_bar", lambda x: None)(c)
-                    if bar and hasattr(strat, "closes"):
-                        strat.highs.append(bar["high"])
-                        strat.lows.append(bar["low"])
-                        strat.closes.append(bar["close"])
+                seed(get_candles(symbol=pair, count=300))
             logger.info(f"Pre-seeded state for strategy {strat.name}")
         except Exception as e:
             logger.warning(f"Failed to pre-seed {strat.name}: {e}", exc_info=True)
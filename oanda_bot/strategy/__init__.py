@@ -21,6 +21,9 @@ from .trend_ma import StrategyTrendMA
 # Legacy utilities from the strategy utils module
 from .utils import update_strategy_performance
 
+# Opt-in kernel warm-up for entry points (see _jit.py)
+from ._jit import warmup
+
 __all__ = [
     "generate_signal",
     "compute_atr",
@@ -36,4 +39,5 @@ __all__ = [
     "StrategyStatArb",
     "StrategyTrendMA",
     "update_strategy_performance",
+    "warmup",
 ]
@@ -0,0 +1,255 @@
+"""
+strategy/_candle.py
+-------------------
+
+Candle normalisation shared by the strategies that accept raw candles.
+
+* ``dispatch_on_type`` – strategies that accept raw candles (tuples, dicts,
+  OANDA objects) used to walk an ``isinstance`` chain for every candle.
+  The dispatcher picks the converter with a single dict lookup on the
+  candle's exact type and only falls back to the general (chain-based)
+  converter for anything else, including subclasses, so behaviour is
+  unchanged.
+* ``candle_to_bar`` – the tolerant converter (tuple of 4–6 fields, flat or
+  nested mid/bid/ask dict, OANDA candle object) used by ``TrendMA`` and as
+  the default for ``CandleBatch``.
+* ``CandleBatch`` – a whole candle series converted once into column arrays,
+  so a backtest normalises each candle a single time instead of on every
+  ``next_signal`` call.
+* ``bars_added`` – how many candles a ``next_signal`` window gained since
+  the previous call, so strategies that keep per-candle state only parse
+  the new ones.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+
+def dispatch_on_type(
+    handlers: Dict[type, Callable[..., Any]],
+    fallback: Callable[..., Any],
+) -> Callable[..., Any]:
+    """
+    Build ``normalise(candle, ...)`` that calls ``handlers[type(candle)]``
+    when the exact type is registered and ``fallback`` otherwise; any extra
+    arguments are passed through.
+    """
+    lookup = handlers.get
+    type_of = type  # closure cell: cheaper than a builtins lookup per call
+
+    def normalise(candle, *args, **kwargs):
+        return lookup(type_of(candle), fallback)(candle, *args, **kwargs)
+
+    return normalise
+
+
+def safe_float(val):
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return None
+
+
+# The converters below bind their helpers as default arguments so CPython
+# resolves them once, at definition, instead of per candle.
+
+def _from_sequence(candle, _len=len, _float=float, _safe=safe_float):
+    """Tuple/list candle of length 4–6."""
+    try:
+        length = _len(candle)
+        if length == 6:
+            t, o, h, l, c, v = candle
+        elif length == 5:
+            t = None
+            o, h, l, c, v = candle
+        elif length == 4:
+            t = None
+            o, h, l, c = candle
+            v = 0
+        else:
+            return None
+        if o.__class__ is h.__class__ is l.__class__ is c.__class__ is _float:
+            # Pre-typed prices (e.g. backtest storage): nothing to convert
+            return {
+                "time": t, "open": o, "high": h, "low": l, "close": c,
+                "volume": v if v.__class__ is _float else _safe(v),
+            }
+        return {
+            "time": t,
+            "open":  _safe(o),
+            "high":  _safe(h),
+            "low":   _safe(l),
+            "close": _safe(c),
+            "volume": _safe(v),
+        }
+    except Exception:
+        return None
+
+
+def _from_dict(candle, _isinstance=isinstance, _dict=dict, _float=float, _safe=safe_float):
+    """Dict with open/high/low/close or nested mid/bid/ask."""
+    try:
+        get = candle.get
+        leg = get("mid") or get("bid") or get("ask")
+        base = leg.get if _isinstance(leg, _dict) else get
+        o = base("o") or base("open")
+        h = base("h") or base("high")
+        l = base("l") or base("low")
+        c = base("c") or base("close")
+        v = get("volume") or get("tradeCount")
+        t = get("time") or get("timestamp")
+        if o.__class__ is h.__class__ is l.__class__ is c.__class__ is _float:
+            # Pre-typed prices: nothing to convert
+            return {
+                "time": t, "open": o, "high": h, "low": l, "close": c,
+                "volume": v if v.__class__ is _float else _safe(v),
+            }
+        return {
+            "time":   t,
+            "open":   _safe(o),
+            "high":   _safe(h),
+            "low":    _safe(l),
+            "close":  _safe(c),
+            "volume": _safe(v),
+        }
+    except Exception:
+        return None
+
+
+def _from_any(candle):
+    """
+    Normalises a raw candle (tuple, dict, or OANDA object) into a bar dict.
+    Supports lists/tuples of length 4–6, dicts with open/high/low/close or nested mid/bid/ask, and objects.
+    """
+    try:
+        # 1) Tuple or list formats
+        if isinstance(candle, (list, tuple)):
+            return _from_sequence(candle)
+
+        # 2) Dict formats
+        if isinstance(candle, dict):
+            return _from_dict(candle)
+
+        # 3) OANDA Candle objects
+        if hasattr(candle, "__dict__") and hasattr(candle, "complete"):
+            return {
+                "time":   getattr(candle, "time", None) or getattr(candle, "timestamp", None),
+                "open":   safe_float(getattr(candle, "open", None)),
+                "high":   safe_float(getattr(candle, "high", None)),
+                "low":    safe_float(getattr(candle, "low", None)),
+                "close":  safe_float(getattr(candle, "close", None)),
+                "volume": safe_float(getattr(candle, "volume", None)),
+            }
+
+        # Unsupported format
+        return None
+    except Exception:
+        return None
+
+
+candle_to_bar = dispatch_on_type(
+    {list: _from_sequence, tuple: _from_sequence, dict: _from_dict}, _from_any
+)
+
+
+def bars_added(prev: Optional[Sequence[Any]], bars: Sequence[Any]) -> int:
+    """
+    Number of candles appended to ``prev`` to give ``bars`` (0 if ``bars``
+    is not such a continuation).  Candles may also have been dropped from
+    the front, as a ``deque(maxlen=...)`` window does; the check is by
+    candle identity at both ends.
+    """
+    if not prev:
+        return 0
+    tail = prev[-1]
+    n = len(bars)
+    for k in range(1, n):
+        if bars[n - 1 - k] is tail:
+            dropped = len(prev) + k - n
+            if dropped >= 0 and bars[0] is prev[dropped]:
+                return k
+            return 0
+    return 0
+
+
+class CandleBatch(NamedTuple):
+    """
+    Column (SoA) view of a candle series, oldest first.
+
+    Row ``i`` is candle ``i`` of the source sequence.  Price and volume
+    fields a candle lacks – or a candle that cannot be converted at all –
+    are NaN, so row indices always line up with the source.
+    """
+
+    time: np.ndarray    # object array of the raw timestamps
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def from_raw(
+        cls,
+        candles: Sequence[Any],
+        normalise: Callable[[Any], Optional[Dict[str, Any]]] = candle_to_bar,
+    ) -> "CandleBatch":
+        """Convert every candle once with ``normalise`` (``candle_to_bar`` by default)."""
+        if normalise is candle_to_bar:
+            batch = cls._from_mid_dicts(candles)
+            if batch is not None:
+                return batch
+
+        n = len(candles)
+        bars = [normalise(c) or {} for c in candles]
+        time = np.empty(n, dtype=object)
+        time[:] = [bar.get("time") for bar in bars]
+
+        def column(key):
+            values = (bar.get(key) for bar in bars)
+            return np.fromiter(
+                (np.nan if v is None else v for v in values), dtype=np.float64, count=n
+            )
+
+        return cls(time, column("open"), column("high"), column("low"),
+                   column("close"), column("volume"))
+
+    @classmethod
+    def _from_mid_dicts(cls, candles: Sequence[Any]) -> Optional["CandleBatch"]:
+        """
+        ``from_raw`` for the usual OANDA shape (dicts with a ``mid`` dict of
+        o/h/l/c), reading each column straight out of the candles instead
+        of building a bar dict per candle.  Returns None as soon as a
+        candle does not fit - including missing or falsy fields, which
+        ``candle_to_bar`` resolves through its fallbacks - so the caller
+        can take the general path and results stay identical.
+        """
+        n = len(candles)
+        try:
+            mids = [c["mid"] for c in candles]
+
+            def column(key):
+                return np.fromiter(
+                    (float(m[key] or None) for m in mids), dtype=np.float64, count=n
+                )
+
+            opens, highs, lows, closes = column("o"), column("h"), column("l"), column("c")
+            volume = np.fromiter(
+                (float(c.get("volume") or c.get("tradeCount")) for c in candles),
+                dtype=np.float64, count=n,
+            )
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return None
+        time = np.empty(n, dtype=object)
+        time[:] = [c.get("time") or c.get("timestamp") for c in candles]
+        return cls(time, opens, highs, lows, closes, volume)
+
+    def window(self, start: int, stop: int) -> "CandleBatch":
+        """Rows ``start:stop`` as views, without copying."""
+        return CandleBatch(*(col[start:stop] for col in self))
+
+
+__all__ = ["CandleBatch", "bars_added", "candle_to_bar", "dispatch_on_type", "safe_float"]
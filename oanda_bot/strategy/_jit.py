@@ -0,0 +1,78 @@
+"""
+strategy/_jit.py
+----------------
+
+Optional Numba support for the numeric kernels used by strategies.
+
+Numba is **not** a hard dependency (see ``base.py`` guidelines).  When it
+is installed, ``njit`` compiles kernels to machine code and ``jitclass``
+compiles whole classes; otherwise both are no-op decorators and the code
+runs as plain Python, so every strategy keeps working on a bare NumPy
+install.
+
+Compiled kernels are cached on disk.  ``NUMBA_CACHE_DIR`` defaults to
+``~/.cache/oanda_bot/numba`` so the cache survives container restarts and
+does not depend on the package directory being writable.
+
+Strategy modules register a small kernel warm-up with ``register_warmup``;
+nothing runs at import.  Entry points that care about first-bar latency
+call ``warmup()`` once after importing the strategies they use.
+"""
+
+from __future__ import annotations
+
+import os
+
+os.environ.setdefault(
+    "NUMBA_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "oanda_bot", "numba"),
+)
+
+try:
+    from numba import njit, prange, types
+    from numba.experimental import jitclass as _jitclass
+
+    HAVE_NUMBA = True
+
+    def jitclass(spec):
+        """
+        ``numba.experimental.jitclass`` with member types given as strings
+        (``"int64"``, ``"float32[::1]"``), like ``njit`` signatures, so
+        callers need not import Numba types.
+        """
+        namespace = vars(types)
+        return _jitclass(
+            [(name, eval(typ, {"__builtins__": {}}, namespace)) for name, typ in spec]
+        )
+
+except ImportError:  # pragma: no cover - exercised only without numba
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Fallback for ``numba.njit``: return the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+    def jitclass(spec):
+        """Fallback for ``jitclass``: return the class unchanged."""
+        return lambda cls: cls
+
+
+_WARMUPS = []
+
+
+def register_warmup(fn):
+    """Decorator: have ``warmup()`` call ``fn`` (no arguments)."""
+    _WARMUPS.append(fn)
+    return fn
+
+
+def warmup() -> None:
+    """Run the warm-up of every strategy module imported so far."""
+    for fn in _WARMUPS:
+        fn()
+
+
+__all__ = ["HAVE_NUMBA", "jitclass", "njit", "prange", "register_warmup", "warmup"]
@@ -35,6 +35,10 @@ class BaseStrategy(ABC):
     #: Human‑readable name, overridden by subclasses
     name: str = "Base"
 
+    # Slotted so subclasses may declare ``__slots__`` and drop the per-
+    # instance ``__dict__``; subclasses without ``__slots__`` are unaffected.
+    __slots__ = ("params", "cumulative_pnl", "pull_count")
+
     def __init__(self, params: Optional[Dict[str, Any]] = None) -> None:
         self.params: Dict[str, Any] = params or {}
         self.cumulative_pnl: float = 0.0
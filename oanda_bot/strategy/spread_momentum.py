@@ -69,14 +69,556 @@ Parameters:
     max_hold_bars: int = 12          # Max hold time (60 seconds at 5s bars)
     profit_target_atr: float = 1.2   # TP in ATR units
     stop_loss_atr: float = 0.8       # SL in ATR units
+    spread_expansion_strong: float = 1.7  # Min spread ratio for breakouts
+    volume_surge_strong: float = 2.5      # Min volume ratio for absorption
+    absorption_efficiency: float = 0.25   # Max efficiency for absorption
 """
 
 from __future__ import annotations
-from typing import Sequence, Optional, Dict, Any
+from typing import Sequence, Optional, Dict, Any, Callable, NamedTuple
 from collections import deque
 import numpy as np
 
 from .base import BaseStrategy
+from ._jit import jitclass, njit, register_warmup
+
+
+@njit(
+    "float64(float64[::1], float64[::1], float64[::1], int64)",
+    cache=True,
+    fastmath=True,
+    boundscheck=False,
+)
+def _atr_kernel(highs, lows, closes, lookback):
+    """
+    Mean true range over the last ``lookback`` bars of aligned arrays.
+
+    The three-way max is written as two selects so the loop stays
+    branch-free and LLVM can vectorise it (max/and-not-sign instructions).
+    """
+    n = highs.shape[0]
+    acc = 0.0
+    for i in range(n - lookback, n):
+        prev_c = closes[i - 1]
+        hl = highs[i] - lows[i]
+        hc = abs(highs[i] - prev_c)
+        lc = abs(lows[i] - prev_c)
+        tr = hl if hl > hc else hc
+        tr = tr if tr > lc else lc
+        acc += tr
+    return acc / lookback
+
+
+@njit(
+    "UniTuple(float64, 2)(float32[::1], int64)",
+    cache=True,
+    fastmath=True,
+    boundscheck=False,
+)
+def _tick_velocity_kernel(changes, window):
+    """
+    Mean |change| over the last 3 bars and over the (up to) 3 bars before,
+    taken from the trailing ``window`` price changes.
+    """
+    n = changes.shape[0]
+    start = n - window
+    current = 0.0
+    for i in range(n - 3, n):
+        current += abs(changes[i])
+    previous = 0.0
+    for i in range(max(n - 6, start), n - 3):
+        previous += abs(changes[i])
+    return current / 3, previous / 3
+
+
+#: Bars of history ``next_signal`` keeps per series; spread/volume/velocity
+#: windows longer than this never fill, so they never produce a signal.
+_SERIES_LEN = 100
+
+#: Ring capacities for _SMCore; the bar rings must hold the 100-bar VWAP
+#: window plus the bar that drops out of it.
+_CORE_CAPACITY = 128
+_CORE_VELOCITY_CAPACITY = 16
+
+_SM_CORE_SPEC = [
+    # Parameters
+    ("spread_window", "int64"),
+    ("volume_window", "int64"),
+    ("velocity_window", "int64"),
+    ("expansion", "float64"),
+    ("inv_expansion", "float64"),
+    ("volume_surge", "float64"),
+    ("velocity_accel", "float64"),
+    ("efficiency_min", "float64"),
+    ("max_hold_bars", "int64"),
+    ("profit_target_atr", "float64"),
+    ("stop_loss_atr", "float64"),
+    ("spread_strong", "float64"),
+    ("volume_strong", "float64"),
+    ("absorption_efficiency", "float64"),
+    ("atr_cache_bars", "int64"),
+    # Rolling series (double-written rings, see _RingBuffer)
+    ("prices", "float64[::1]"),
+    ("highs", "float64[::1]"),
+    ("lows", "float64[::1]"),
+    ("volumes", "float32[::1]"),
+    ("spreads", "float32[::1]"),
+    ("head", "int64"),
+    ("n", "int64"),
+    ("changes", "float32[::1]"),
+    ("change_head", "int64"),
+    ("n_changes", "int64"),
+    ("velocities", "float32[::1]"),
+    ("velocity_head", "int64"),
+    ("n_velocities", "int64"),
+    # Running window sums
+    ("spread_sum", "float64"),
+    ("volume_sum", "float64"),
+    ("vwap_pv", "float64"),
+    ("vwap_v", "float64"),
+    # State
+    ("position", "int64"),
+    ("entry_price", "float64"),
+    ("entry_vwap", "float64"),
+    ("entry_atr", "float64"),
+    ("bars_in_position", "int64"),
+    ("cooldown", "int64"),
+    ("bar_count", "int64"),
+    ("atr_cache", "float64"),
+    ("atr_cache_bar", "int64"),
+]
+
+
+@jitclass(_SM_CORE_SPEC)
+class _SMCore:
+    """
+    :meth:`StrategySpreadMomentum.next_signal` rules as a compiled class.
+
+    Holds the same rolling series and position state in flat typed members
+    (window statistics as running sums) so a backtest runs entirely in
+    native code; see :func:`_run_core`.  Without Numba it is a plain
+    Python class with identical behaviour.
+    """
+
+    def __init__(
+        self,
+        spread_window,
+        volume_window,
+        velocity_window,
+        expansion,
+        inv_expansion,
+        volume_surge,
+        velocity_accel,
+        efficiency_min,
+        max_hold_bars,
+        profit_target_atr,
+        stop_loss_atr,
+        spread_strong,
+        volume_strong,
+        absorption_efficiency,
+        atr_cache_bars,
+    ):
+        self.spread_window = spread_window
+        self.volume_window = volume_window
+        self.velocity_window = velocity_window
+        self.expansion = expansion
+        self.inv_expansion = inv_expansion
+        self.volume_surge = volume_surge
+        self.velocity_accel = velocity_accel
+        self.efficiency_min = efficiency_min
+        self.max_hold_bars = max_hold_bars
+        self.profit_target_atr = profit_target_atr
+        self.stop_loss_atr = stop_loss_atr
+        self.spread_strong = spread_strong
+        self.volume_strong = volume_strong
+        self.absorption_efficiency = absorption_efficiency
+        self.atr_cache_bars = atr_cache_bars
+
+        cap = _CORE_CAPACITY
+        self.prices = np.zeros(2 * cap)
+        self.highs = np.zeros(2 * cap)
+        self.lows = np.zeros(2 * cap)
+        self.volumes = np.zeros(2 * cap, dtype=np.float32)
+        self.spreads = np.zeros(2 * cap, dtype=np.float32)
+        self.head = 0
+        self.n = 0
+        self.changes = np.zeros(2 * cap, dtype=np.float32)
+        self.change_head = 0
+        self.n_changes = 0
+        self.velocities = np.zeros(2 * _CORE_VELOCITY_CAPACITY, dtype=np.float32)
+        self.velocity_head = 0
+        self.n_velocities = 0
+
+        self.spread_sum = 0.0
+        self.volume_sum = 0.0
+        self.vwap_pv = 0.0
+        self.vwap_v = 0.0
+
+        self.position = 0
+        self.entry_price = 0.0
+        self.entry_vwap = 0.0
+        self.entry_atr = 0.0
+        self.bars_in_position = 0
+        self.cooldown = 0
+        self.bar_count = 0
+        self.atr_cache = 0.0
+        self.atr_cache_bar = -999
+
+    def next_signal_bar(self, high, low, close, volume, spread):
+        """Feed one bar; returns 1 = BUY, -1 = SELL, 0 = none."""
+        self.bar_count += 1
+        if self.cooldown > 0:
+            self.cooldown -= 1
+        price = close
+        if price == 0.0:
+            return 0
+
+        # Append to the bar rings; volume/spread are used as stored (float32)
+        cap = _CORE_CAPACITY
+        k = self.head
+        prev_price = self.prices[k + cap - 1]
+        self.prices[k] = price
+        self.prices[k + cap] = price
+        self.highs[k] = high
+        self.highs[k + cap] = high
+        self.lows[k] = low
+        self.lows[k + cap] = low
+        self.volumes[k] = volume
+        self.volumes[k + cap] = volume
+        self.spreads[k] = spread
+        self.spreads[k + cap] = spread
+        volume = float(self.volumes[k])
+        spread = float(self.spreads[k])
+        self.head = (k + 1) % cap
+        end = self.head + cap  # bar tails are [end - m:end]
+
+        if self.n > 0:
+            j = self.change_head
+            change = price - prev_price
+            self.changes[j] = change
+            self.changes[j + cap] = change
+            self.change_head = (j + 1) % cap
+            self.n_changes += 1
+        self.n += 1
+        change_end = self.change_head + cap
+        n = self.n
+        n_changes = self.n_changes
+
+        self.spread_sum += spread
+        if n > self.spread_window:
+            self.spread_sum -= self.spreads[end - 1 - self.spread_window]
+        self.volume_sum += volume
+        if n > self.volume_window:
+            self.volume_sum -= self.volumes[end - 1 - self.volume_window]
+        self.vwap_pv += price * volume
+        self.vwap_v += volume
+        if n > 100:
+            self.vwap_pv -= self.prices[end - 101] * self.volumes[end - 101]
+            self.vwap_v -= self.volumes[end - 101]
+
+        if n < max(self.spread_window, self.volume_window, self.velocity_window):
+            return 0
+
+        # Take profit / stop loss / time exits
+        position = self.position
+        exit_now = False
+        if position != 0:
+            self.bars_in_position += 1
+            atr = self.entry_atr
+            if position == 1:
+                exit_now = (
+                    price >= self.entry_vwap + self.profit_target_atr * atr
+                    or price < self.entry_price - self.stop_loss_atr * atr
+                )
+            else:
+                exit_now = (
+                    price <= self.entry_vwap - self.profit_target_atr * atr
+                    or price > self.entry_price + self.stop_loss_atr * atr
+                )
+            exit_now = exit_now or self.bars_in_position >= self.max_hold_bars
+        elif self.cooldown > 0:
+            return 0
+
+        # Tick velocity (also feeds the velocity history)
+        window = self.velocity_window
+        velocity = 0.0
+        is_accelerating = False
+        if not exit_now and n_changes >= window and window >= 4:
+            velocity, previous = _tick_velocity_kernel(
+                self.changes[change_end - window:change_end], window
+            )
+            vcap = _CORE_VELOCITY_CAPACITY
+            j = self.velocity_head
+            self.velocities[j] = velocity
+            self.velocities[j + vcap] = velocity
+            self.velocity_head = (j + 1) % vcap
+            self.n_velocities += 1
+            if previous != 0.0:
+                is_accelerating = velocity / previous >= self.velocity_accel
+
+        if position != 0:
+            # Velocity reversal exit
+            if exit_now or (not is_accelerating and self.bars_in_position >= 3):
+                self.position = 0
+                self.entry_price = 0.0
+                self.entry_vwap = 0.0
+                self.entry_atr = 0.0
+                self.bars_in_position = 0
+                self.cooldown = 5
+                return -position
+            return 0
+
+        # Spread regime
+        regime = 1
+        spread_ratio = 1.0
+        avg_spread = self.spread_sum / self.spread_window
+        if avg_spread != 0.0:
+            spread_ratio = spread / avg_spread
+            regime = (
+                int(spread_ratio >= self.expansion)
+                - int(spread_ratio <= self.inv_expansion)
+                + 1
+            )
+
+        # Volume surge
+        is_surge = False
+        volume_ratio = 1.0
+        avg_volume = (self.volume_sum - volume) / (self.volume_window - 1)
+        if avg_volume != 0.0:
+            volume_ratio = volume / avg_volume
+            is_surge = volume_ratio >= self.volume_surge
+
+        # Efficiency ratio
+        efficiency = 0.0
+        if n_changes >= window:
+            net = 0.0
+            total = 0.0
+            for j in range(change_end - window, change_end):
+                net += self.changes[j]
+                total += abs(self.changes[j])
+            if total != 0.0:
+                efficiency = abs(net) / total
+
+        vwap = self.vwap_pv / self.vwap_v if self.vwap_v != 0.0 else 0.0
+        if self.bar_count - self.atr_cache_bar < self.atr_cache_bars:
+            atr = self.atr_cache
+        elif n >= 15:
+            atr = _atr_kernel(
+                self.highs[end - 15:end],
+                self.lows[end - 15:end],
+                self.prices[end - 15:end],
+                14,
+            )
+            self.atr_cache = atr
+            self.atr_cache_bar = self.bar_count
+        else:
+            atr = 0.0
+        if atr == 0.0 or vwap == 0.0:
+            return 0
+
+        distance = (price - vwap) / atr
+        signal = 0
+
+        # SIGNAL 1: breakout
+        if regime == 2 and is_surge and is_accelerating:
+            if (
+                efficiency >= self.efficiency_min
+                and spread_ratio >= self.spread_strong
+                and n_changes >= 3
+            ):
+                consistency = 0
+                for j in range(change_end - 3, change_end):
+                    if self.changes[j] > 0:
+                        consistency += 1
+                last_move = self.changes[change_end - 1]
+                if consistency >= 2 and last_move > 0:
+                    signal = 1
+                elif consistency <= 1 and last_move < 0:
+                    signal = -1
+
+        # SIGNAL 2: absorption
+        if (
+            signal == 0
+            and is_surge
+            and efficiency < self.absorption_efficiency
+            and volume_ratio >= self.volume_strong
+        ):
+            if not is_accelerating:
+                if distance > 2.0:
+                    signal = -1
+                elif distance < -2.0:
+                    signal = 1
+
+        # SIGNAL 3: spread contraction reversion
+        if signal == 0 and regime == 0 and n >= 8:
+            max_spread = self.spreads[end - 8]
+            for j in range(end - 7, end):
+                if self.spreads[j] > max_spread:
+                    max_spread = self.spreads[j]
+            if max_spread > avg_spread * 1.8 and spread < max_spread * 0.7:
+                slow = self.n_velocities < 10
+                if not slow and not is_accelerating:
+                    vel_end = self.velocity_head + _CORE_VELOCITY_CAPACITY
+                    vel_sum = 0.0
+                    for j in range(vel_end - 10, vel_end):
+                        vel_sum += self.velocities[j]
+                    slow = velocity < vel_sum / 10
+                if slow:
+                    if distance > 1.5:
+                        signal = -1
+                    elif distance < -1.5:
+                        signal = 1
+
+        if signal != 0:
+            self.position = signal
+            self.entry_price = price
+            self.entry_vwap = vwap
+            self.entry_atr = atr
+            self.bars_in_position = 0
+        return signal
+
+
+@njit
+def _run_core(core, ohlcvs):
+    """Stream an ``(N, 6)`` bar array through ``core``; one int8 signal per bar."""
+    n_bars = ohlcvs.shape[0]
+    out = np.zeros(n_bars, dtype=np.int8)
+    for i in range(n_bars):
+        out[i] = core.next_signal_bar(
+            ohlcvs[i, 1], ohlcvs[i, 2], ohlcvs[i, 3], ohlcvs[i, 4], ohlcvs[i, 5]
+        )
+    return out
+
+
+class BarData(NamedTuple):
+    """One bar as consumed by :class:`StrategySpreadMomentum`."""
+
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    spread: float
+
+
+# Per-layout bar readers.  Each returns a ``BarData`` and raises
+# KeyError/TypeError/ValueError on a bar of a different layout.
+def _extract_oanda_mid(bar) -> BarData:
+    """OANDA candle with mid OHLC; spread from bid/ask or 30% of the range."""
+    mid = bar["mid"]
+    h = float(mid["h"])
+    l = float(mid["l"])
+    if "bid" in bar and "ask" in bar:
+        bid = bar["bid"]
+        ask = bar["ask"]
+        bid = float(bid["c"]) if bid.__class__ is dict else float(bid)
+        ask = float(ask["c"]) if ask.__class__ is dict else float(ask)
+        spread = ask - bid
+    else:
+        spread = (h - l) * 0.3  # Approximate spread as 30% of bar range
+    return BarData(
+        float(mid["o"]), h, l, float(mid["c"]), float(bar.get("volume", 1)), spread
+    )
+
+
+def _extract_generic_ohlcv(bar) -> BarData:
+    """Flat dict with long or short OHLCV keys and an optional ``spread``."""
+    close = float(bar["close"] if "close" in bar else bar["c"])
+    h = float(bar.get("high", bar.get("h", 0)))
+    l = float(bar.get("low", bar.get("l", 0)))
+    spread = float(bar.get("spread", 0))
+    if spread == 0:
+        spread = (h - l) * 0.3
+    return BarData(
+        float(bar.get("open", bar.get("o", 0))),
+        h,
+        l,
+        close,
+        float(bar.get("volume", bar.get("v", 1))),
+        spread,
+    )
+
+
+def _extract_scalar(bar) -> BarData:
+    """Bare price; ``+ 0.0`` rejects strings and dicts with TypeError."""
+    price = float(bar + 0.0)
+    return BarData(price, price, price, price, 1.0, 0.0001)
+
+
+def _detect_extractor(bar) -> Optional[Callable[[Any], BarData]]:
+    """Pick the reader for ``bar``'s layout, or ``None`` if unsupported."""
+    if isinstance(bar, dict):
+        if isinstance(bar.get("mid"), dict):
+            return _extract_oanda_mid
+        if "close" in bar or "c" in bar:
+            return _extract_generic_ohlcv
+        return None
+    if isinstance(bar, (int, float)):
+        return _extract_scalar
+    return None
+
+
+def _extract_lenient(bar) -> Optional[BarData]:
+    """Slow path for OANDA candles with missing mid fields (defaults to 0)."""
+    try:
+        mid = bar["mid"]
+        h = float(mid.get("h", 0))
+        l = float(mid.get("l", 0))
+        if "bid" in bar and "ask" in bar:
+            bid = float(bar["bid"]["c"]) if isinstance(bar["bid"], dict) else float(bar["bid"])
+            ask = float(bar["ask"]["c"]) if isinstance(bar["ask"], dict) else float(bar["ask"])
+            spread = ask - bid
+        else:
+            spread = (h - l) * 0.3
+        return BarData(
+            float(mid.get("o", 0)),
+            h,
+            l,
+            float(mid.get("c", 0)),
+            float(bar.get("volume", 1)),
+            spread,
+        )
+    except (TypeError, ValueError, KeyError, AttributeError):
+        return None
+
+
+class _RingBuffer:
+    """
+    Fixed-capacity float buffer whose tail is always a contiguous view.
+
+    Every value is written twice (at ``i`` and ``i + capacity``) so the
+    last ``n`` items are one slice of the backing array - no wrap-around
+    copy, and the view can be handed straight to a kernel.  Values read
+    back through ``[]`` are always Python floats, whatever ``dtype`` is.
+    """
+
+    __slots__ = ("_data", "_capacity", "_head", "_size")
+
+    def __init__(self, capacity: int, dtype=np.float64) -> None:
+        self._data = np.zeros(2 * capacity, dtype=dtype)
+        self._capacity = capacity
+        self._head = 0
+        self._size = 0
+
+    def append(self, value: float) -> None:
+        i = self._head
+        self._data[i] = value
+        self._data[i + self._capacity] = value
+        self._head = (i + 1) % self._capacity
+        if self._size < self._capacity:
+            self._size += 1
+
+    def tail(self, n: int) -> np.ndarray:
+        """View of the last ``n`` items, oldest first."""
+        end = self._head + self._capacity
+        return self._data[end - n:end]
+
+    def __getitem__(self, idx: int) -> float:
+        """Negative indexing from the newest item (``buf[-1]`` is the latest)."""
+        return float(self._data[self._head + self._capacity + idx])
+
+    def __len__(self) -> int:
+        return self._size
 
 
 class StrategySpreadMomentum(BaseStrategy):
@@ -88,6 +630,36 @@ class StrategySpreadMomentum(BaseStrategy):
 
     name = "SpreadMomentum"
 
+    #: Spread regimes indexed by ``(ratio >= t) - (ratio <= 1/t) + 1``
+    _REGIMES = ("contracting", "normal", "expanding")
+
+    #: Bars for which a computed ATR is reused (see ``_compute_atr``)
+    _ATR_CACHE_BARS = 3
+
+    #: Closed trades kept for adaptive tuning
+    _HISTORY_LEN = 50
+
+    __slots__ = (
+        # Parameters
+        "spread_window", "volume_window", "velocity_window",
+        "spread_expansion_threshold", "volume_surge_threshold",
+        "velocity_accel_threshold", "efficiency_threshold", "max_hold_bars",
+        "profit_target_atr", "stop_loss_atr", "_inv_expansion",
+        "_spread_expansion_strong", "_abs_volume_surge_strong",
+        "_absorption_efficiency",
+        # Microstructure series
+        "spreads", "volumes", "prices", "highs", "lows", "price_changes",
+        "tick_velocities", "_tv_sum",
+        # VWAP
+        "vwap_sum_pv", "vwap_sum_v", "vwap_prices", "vwap_volumes",
+        # State
+        "_position", "_entry_price", "_entry_vwap", "_entry_atr",
+        "_bars_in_position", "_cooldown", "_bar_count", "_extract",
+        "_atr_cache", "_atr_cache_bar",
+        # Trade history ring
+        "_history_win", "_history_pnl", "_history_idx", "_history_count",
+    )
+
     def __init__(self, params: Optional[Dict[str, Any]] = None) -> None:
         super().__init__(params or {})
 
@@ -102,15 +674,23 @@ class StrategySpreadMomentum(BaseStrategy):
         self.max_hold_bars = int(self.params.get("max_hold_bars", 12))
         self.profit_target_atr = float(self.params.get("profit_target_atr", 1.2))
         self.stop_loss_atr = float(self.params.get("stop_loss_atr", 0.8))
-
-        # Data structures for microstructure analysis
-        self.spreads: deque = deque(maxlen=100)
-        self.volumes: deque = deque(maxlen=100)
-        self.prices: deque = deque(maxlen=100)
-        self.highs: deque = deque(maxlen=100)
-        self.lows: deque = deque(maxlen=100)
-        self.price_changes: deque = deque(maxlen=100)
-        self.tick_velocities: deque = deque(maxlen=50)
+        self._inv_expansion = 1.0 / self.spread_expansion_threshold
+        self._spread_expansion_strong = float(self.params.get("spread_expansion_strong", 1.7))
+        self._abs_volume_surge_strong = float(self.params.get("volume_surge_strong", 2.5))
+        self._absorption_efficiency = float(self.params.get("absorption_efficiency", 0.25))
+
+        # Data structures for microstructure analysis.  Spreads, volumes and
+        # price changes are small relative quantities and fit float32, which
+        # halves the memory the window scans touch; absolute prices (close,
+        # high, low) need float64 to resolve a fraction of a pip.
+        self.spreads = _RingBuffer(_SERIES_LEN, np.float32)
+        self.volumes = _RingBuffer(_SERIES_LEN, np.float32)
+        self.prices = _RingBuffer(_SERIES_LEN)
+        self.highs = _RingBuffer(_SERIES_LEN)
+        self.lows = _RingBuffer(_SERIES_LEN)
+        self.price_changes = _RingBuffer(_SERIES_LEN, np.float32)
+        self.tick_velocities = _RingBuffer(50, np.float32)
+        self._tv_sum: float = 0.0  # Running sum of the last 10 tick velocities
 
         # VWAP calculation
         self.vwap_sum_pv: float = 0.0  # Sum of price * volume
@@ -126,68 +706,40 @@ class StrategySpreadMomentum(BaseStrategy):
         self._bars_in_position: int = 0
         self._cooldown: int = 0
         self._bar_count: int = 0
+        self._extract: Optional[Callable[[Any], BarData]] = None
+        self._atr_cache: float = 0.0
+        self._atr_cache_bar: int = -999
+
+        # Trade history ring buffer for adaptive tuning
+        self._history_win = np.zeros(self._HISTORY_LEN, dtype=np.bool_)
+        self._history_pnl = np.zeros(self._HISTORY_LEN, dtype=np.float64)
+        self._history_idx: int = 0
+        self._history_count: int = 0
 
-    def _extract_bar_data(self, bar) -> Optional[Dict[str, float]]:
-        """Extract OHLCV and spread from bar."""
+    def _extract_bar_data(self, bar) -> Optional[BarData]:
+        """
+        Extract a :class:`BarData` (OHLCV plus spread) from a bar.
+
+        After the first bar, ``_extract`` holds the reader for the feed's
+        layout and later bars go straight through it with no type checks;
+        a bar that does not fit triggers re-detection.
+        """
+        extract = self._extract
+        if extract is not None:
+            try:
+                return extract(bar)
+            except (KeyError, TypeError, ValueError):
+                pass
+
+        extract = _detect_extractor(bar)
+        if extract is None:
+            return None
         try:
-            if isinstance(bar, dict):
-                # OANDA format with mid prices
-                if "mid" in bar and isinstance(bar["mid"], dict):
-                    mid = bar["mid"]
-                    volume = float(bar.get("volume", 1))
-
-                    # Extract spread if bid/ask available
-                    spread = 0.0
-                    if "bid" in bar and "ask" in bar:
-                        bid = float(bar["bid"]["c"]) if isinstance(bar["bid"], dict) else float(bar["bid"])
-                        ask = float(bar["ask"]["c"]) if isinstance(bar["ask"], dict) else float(bar["ask"])
-                        spread = ask - bid
-                    else:
-                        # Estimate spread from high-low if bid/ask not available
-                        h = float(mid.get("h", 0))
-                        l = float(mid.get("l", 0))
-                        spread = (h - l) * 0.3  # Approximate spread as 30% of bar range
-
-                    return {
-                        "open": float(mid.get("o", 0)),
-                        "high": float(mid.get("h", 0)),
-                        "low": float(mid.get("l", 0)),
-                        "close": float(mid.get("c", 0)),
-                        "volume": volume,
-                        "spread": spread
-                    }
-
-                # Generic OHLCV format
-                if "close" in bar or "c" in bar:
-                    volume = float(bar.get("volume", bar.get("v", 1)))
-                    spread = float(bar.get("spread", 0))
-                    if spread == 0:
-                        h = float(bar.get("high", bar.get("h", 0)))
-                        l = float(bar.get("low", bar.get("l", 0)))
-                        spread = (h - l) * 0.3
-
-                    return {
-                        "open": float(bar.get("open", bar.get("o", 0))),
-                        "high": float(bar.get("high", bar.get("h", 0))),
-                        "low": float(bar.get("low", bar.get("l", 0))),
-                        "close": float(bar.get("close", bar.get("c", 0))),
-                        "volume": volume,
-                        "spread": spread
-                    }
-
-            # Fallback for simple price data
-            if isinstance(bar, (int, float)):
-                return {
-                    "open": float(bar),
-                    "high": float(bar),
-                    "low": float(bar),
-                    "close": float(bar),
-                    "volume": 1.0,
-                    "spread": 0.0001
-                }
-        except (TypeError, ValueError, KeyError):
-            pass
-        return None
+            bd = extract(bar)
+        except (KeyError, TypeError, ValueError):
+            return _extract_lenient(bar) if extract is _extract_oanda_mid else None
+        self._extract = extract
+        return bd
 
     def _compute_vwap(self) -> float:
         """Calculate Volume-Weighted Average Price."""
@@ -205,47 +757,52 @@ class StrategySpreadMomentum(BaseStrategy):
         self.vwap_sum_v = sum(self.vwap_volumes)
 
     def _compute_atr(self, lookback: int = 14) -> float:
-        """Calculate Average True Range."""
+        """
+        Calculate Average True Range.
+
+        The default 14-bar ATR is reused for ``_ATR_CACHE_BARS`` bars; it
+        moves slowly and that much staleness is invisible to ATR stops.
+        """
+        cached = lookback == 14
+        if cached and self._bar_count - self._atr_cache_bar < self._ATR_CACHE_BARS:
+            return self._atr_cache
+
         if len(self.prices) < lookback + 1:
             return 0.0
 
-        trs = []
-        for i in range(-lookback, 0):
-            if i - 1 < -len(self.prices):
-                continue
-            h = self.highs[i]
-            l = self.lows[i]
-            prev_c = self.prices[i - 1]
-            tr = max(h - l, abs(h - prev_c), abs(l - prev_c))
-            trs.append(tr)
-
-        return sum(trs) / len(trs) if trs else 0.0
+        n = lookback + 1
+        atr = _atr_kernel(
+            self.highs.tail(n), self.lows.tail(n), self.prices.tail(n), lookback
+        )
+        if cached:
+            self._atr_cache = atr
+            self._atr_cache_bar = self._bar_count
+        return atr
 
-    def _analyze_spread_regime(self) -> tuple[str, float]:
+    def _analyze_spread_regime(self) -> tuple[str, float, float]:
         """
         Classify spread regime.
-        Returns: (regime, spread_ratio)
+        Returns: (regime, spread_ratio, avg_spread)
         - regime: "normal", "expanding", "contracting"
         - spread_ratio: current_spread / avg_spread
+        - avg_spread: mean spread over ``spread_window`` (0.0 during warm-up)
         """
         if len(self.spreads) < self.spread_window:
-            return "normal", 1.0
+            return "normal", 1.0, 0.0
 
-        recent_spreads = list(self.spreads)[-self.spread_window:]
-        avg_spread = sum(recent_spreads) / len(recent_spreads)
+        avg_spread = float(self.spreads.tail(self.spread_window).sum(dtype=np.float64)) / self.spread_window
         current_spread = self.spreads[-1]
 
         if avg_spread == 0:
-            return "normal", 1.0
+            return "normal", 1.0, 0.0
 
         spread_ratio = current_spread / avg_spread
-
-        if spread_ratio >= self.spread_expansion_threshold:
-            return "expanding", spread_ratio
-        elif spread_ratio <= (1.0 / self.spread_expansion_threshold):
-            return "contracting", spread_ratio
-        else:
-            return "normal", spread_ratio
+        regime_idx = (
+            int(spread_ratio >= self.spread_expansion_threshold)
+            - int(spread_ratio <= self._inv_expansion)
+            + 1
+        )
+        return self._REGIMES[regime_idx], spread_ratio, avg_spread
 
     def _analyze_volume_surge(self) -> tuple[bool, float]:
         """
@@ -255,8 +812,8 @@ class StrategySpreadMomentum(BaseStrategy):
         if len(self.volumes) < self.volume_window:
             return False, 1.0
 
-        recent_volumes = list(self.volumes)[-self.volume_window:]
-        avg_volume = sum(recent_volumes[:-1]) / (len(recent_volumes) - 1)
+        recent_volumes = self.volumes.tail(self.volume_window)
+        avg_volume = float(recent_volumes[:-1].sum(dtype=np.float64)) / (self.volume_window - 1)
         current_volume = self.volumes[-1]
 
         if avg_volume == 0:
@@ -275,19 +832,19 @@ class StrategySpreadMomentum(BaseStrategy):
         if len(self.price_changes) < self.velocity_window:
             return 0.0, False
 
-        recent_changes = list(self.price_changes)[-self.velocity_window:]
-
-        # Calculate velocity as absolute price change per bar
-        velocities = [abs(c) for c in recent_changes]
-
-        if len(velocities) < 4:
+        if self.velocity_window < 4:
             return 0.0, False
 
-        # Current velocity vs previous velocity
-        current_velocity = sum(velocities[-3:]) / 3
-        previous_velocity = sum(velocities[-6:-3]) / 3
+        # Current vs previous velocity (mean absolute price change per bar)
+        current_velocity, previous_velocity = _tick_velocity_kernel(
+            self.price_changes.tail(self.velocity_window), self.velocity_window
+        )
 
+        if len(self.tick_velocities) >= 10:
+            self._tv_sum -= self.tick_velocities[-10]
         self.tick_velocities.append(current_velocity)
+        # Add the stored float32 value so the running sum stays exact
+        self._tv_sum += self.tick_velocities[-1]
 
         if previous_velocity == 0:
             return current_velocity, False
@@ -297,6 +854,10 @@ class StrategySpreadMomentum(BaseStrategy):
 
         return current_velocity, is_accelerating
 
+    def _tv_mean10(self) -> float:
+        """Mean of the last 10 tick velocities in O(1); valid once 10 are stored."""
+        return self._tv_sum / 10
+
     def _compute_efficiency_ratio(self) -> float:
         """
         Calculate price efficiency: net price change / sum of absolute changes.
@@ -305,9 +866,9 @@ class StrategySpreadMomentum(BaseStrategy):
         if len(self.price_changes) < self.velocity_window:
             return 0.0
 
-        recent_changes = list(self.price_changes)[-self.velocity_window:]
-        net_change = abs(sum(recent_changes))
-        sum_abs_changes = sum(abs(c) for c in recent_changes)
+        recent_changes = self.price_changes.tail(self.velocity_window)
+        net_change = abs(float(recent_changes.sum(dtype=np.float64)))
+        sum_abs_changes = float(np.abs(recent_changes).sum(dtype=np.float64))
 
         if sum_abs_changes == 0:
             return 0.0
@@ -338,7 +899,13 @@ class StrategySpreadMomentum(BaseStrategy):
         return efficiency * 10000  # Scale for readability
 
     def next_signal(self, bars: Sequence[dict]) -> Optional[str]:
-        """Generate signal based on microstructure analysis."""
+        """
+        Generate signal based on microstructure analysis.
+
+        The per-bar statistics are computed inline rather than through the
+        ``_analyze_*`` / ``_compute_*`` helpers, saving a Python call each;
+        those methods remain for callers that want a single statistic.
+        """
         if not bars:
             return None
 
@@ -347,36 +914,42 @@ class StrategySpreadMomentum(BaseStrategy):
             self._cooldown -= 1
 
         # Extract bar data
-        bar_data = self._extract_bar_data(bars[-1])
-        if not bar_data or bar_data["close"] == 0:
+        bd = self._extract_bar_data(bars[-1])
+        if bd is None or bd.close == 0:
             return None
 
-        current_price = bar_data["close"]
-        current_volume = bar_data["volume"]
-        current_spread = bar_data["spread"]
-
-        # Update data structures
-        self.prices.append(current_price)
-        self.highs.append(bar_data["high"])
-        self.lows.append(bar_data["low"])
-        self.volumes.append(current_volume)
-        self.spreads.append(current_spread)
-
-        if len(self.prices) > 1:
-            price_change = current_price - self.prices[-2]
-            self.price_changes.append(price_change)
-
-        self._update_vwap(current_price, current_volume)
+        current_price = bd.close
+        prices = self.prices
+        spreads = self.spreads
+        volumes = self.volumes
+        price_changes = self.price_changes
+
+        # Update data structures; read volume/spread back as stored (float32)
+        prices.append(current_price)
+        self.highs.append(bd.high)
+        self.lows.append(bd.low)
+        volumes.append(bd.volume)
+        spreads.append(bd.spread)
+        current_volume = volumes[-1]
+        current_spread = spreads[-1]
+
+        if len(prices) > 1:
+            price_changes.append(current_price - prices[-2])
+
+        # VWAP over the last 100 bars
+        self.vwap_prices.append(current_price)
+        self.vwap_volumes.append(current_volume)
+        self.vwap_sum_pv = sum(p * v for p, v in zip(self.vwap_prices, self.vwap_volumes))
+        self.vwap_sum_v = sum(self.vwap_volumes)
 
         # Need minimum data
-        if len(self.prices) < max(self.spread_window, self.volume_window, self.velocity_window):
+        if len(prices) < max(self.spread_window, self.volume_window, self.velocity_window):
             return None
 
         # Position management
         if self._position != 0:
             self._bars_in_position += 1
 
-            vwap = self._compute_vwap()
             atr = self._entry_atr if self._entry_atr > 0 else self._compute_atr()
 
             # Take profit - reversion to VWAP
@@ -405,8 +978,28 @@ class StrategySpreadMomentum(BaseStrategy):
                 self._reset_position()
                 return side
 
+        # Entry logic
+        elif self._cooldown > 0:
+            return None
+
+        # Tick velocity and acceleration (see _compute_tick_velocity)
+        velocity = 0.0
+        is_accelerating = False
+        window = self.velocity_window
+        if len(price_changes) >= window and window >= 4:
+            velocity, previous_velocity = _tick_velocity_kernel(
+                price_changes.tail(window), window
+            )
+            tick_velocities = self.tick_velocities
+            if len(tick_velocities) >= 10:
+                self._tv_sum -= tick_velocities[-10]
+            tick_velocities.append(velocity)
+            self._tv_sum += tick_velocities[-1]
+            if previous_velocity != 0:
+                is_accelerating = velocity / previous_velocity >= self.velocity_accel_threshold
+
+        if self._position != 0:
             # Exit on velocity reversal
-            velocity, is_accelerating = self._compute_tick_velocity()
             if not is_accelerating and self._bars_in_position >= 3:
                 # Velocity slowing down, take profit
                 side = "SELL" if self._position > 0 else "BUY"
@@ -415,19 +1008,50 @@ class StrategySpreadMomentum(BaseStrategy):
 
             return None
 
-        # Entry logic
-        if self._cooldown > 0:
-            return None
-
-        # Analyze microstructure conditions
-        spread_regime, spread_ratio = self._analyze_spread_regime()
-        is_volume_surge, volume_ratio = self._analyze_volume_surge()
-        velocity, is_accelerating = self._compute_tick_velocity()
-        efficiency_ratio = self._compute_efficiency_ratio()
-        vp_efficiency = self._compute_volume_price_efficiency()
-
-        vwap = self._compute_vwap()
-        atr = self._compute_atr()
+        # Spread regime as an index into _REGIMES (see _analyze_spread_regime)
+        regime = 1
+        spread_ratio = 1.0
+        avg_spread = 0.0
+        if len(spreads) >= self.spread_window:
+            avg_spread = float(spreads.tail(self.spread_window).sum(dtype=np.float64)) / self.spread_window
+            if avg_spread != 0:
+                spread_ratio = current_spread / avg_spread
+                regime = (
+                    int(spread_ratio >= self.spread_expansion_threshold)
+                    - int(spread_ratio <= self._inv_expansion)
+                    + 1
+                )
+
+        # Volume surge (see _analyze_volume_surge)
+        is_volume_surge = False
+        volume_ratio = 1.0
+        if len(volumes) >= self.volume_window:
+            avg_volume = float(
+                volumes.tail(self.volume_window)[:-1].sum(dtype=np.float64)
+            ) / (self.volume_window - 1)
+            if avg_volume != 0:
+                volume_ratio = current_volume / avg_volume
+                is_volume_surge = volume_ratio >= self.volume_surge_threshold
+
+        # Efficiency ratio (see _compute_efficiency_ratio)
+        efficiency_ratio = 0.0
+        if len(price_changes) >= window:
+            recent_changes = price_changes.tail(window)
+            sum_abs_changes = float(np.abs(recent_changes).sum(dtype=np.float64))
+            if sum_abs_changes != 0:
+                efficiency_ratio = abs(float(recent_changes.sum(dtype=np.float64))) / sum_abs_changes
+
+        vwap = self.vwap_sum_pv / self.vwap_sum_v if self.vwap_sum_v else 0.0
+
+        # 14-bar ATR, reused for _ATR_CACHE_BARS bars (see _compute_atr)
+        if self._bar_count - self._atr_cache_bar < self._ATR_CACHE_BARS:
+            atr = self._atr_cache
+        elif len(prices) >= 15:
+            atr = _atr_kernel(self.highs.tail(15), self.lows.tail(15), prices.tail(15), 14)
+            self._atr_cache = atr
+            self._atr_cache_bar = self._bar_count
+        else:
+            atr = 0.0
 
         if atr == 0 or vwap == 0:
             return None
@@ -437,15 +1061,16 @@ class StrategySpreadMomentum(BaseStrategy):
 
         # SIGNAL 1: Spread expansion + volume surge + acceleration = Breakout
         # More selective: require stronger confirmation
-        if spread_regime == "expanding" and is_volume_surge and is_accelerating:
-            if efficiency_ratio >= self.efficiency_threshold and spread_ratio >= 1.7:
+        if regime == 2 and is_volume_surge and is_accelerating:
+            if efficiency_ratio >= self.efficiency_threshold and spread_ratio >= self._spread_expansion_strong:
                 # Need stronger price movement confirmation
-                if len(self.price_changes) >= 3:
-                    recent_moves = list(self.price_changes)[-3:]
-                    directional_consistency = sum(1 for m in recent_moves if m > 0)
+                if len(price_changes) >= 3:
+                    recent3 = price_changes.tail(3)
+                    directional_consistency = int((recent3 > 0).sum())
+                    last_move = float(recent3[-1])
 
                     # Upward breakout - need 2+ positive moves
-                    if directional_consistency >= 2 and recent_moves[-1] > 0:
+                    if directional_consistency >= 2 and last_move > 0:
                         self._position = 1
                         self._entry_price = current_price
                         self._entry_vwap = vwap
@@ -453,7 +1078,7 @@ class StrategySpreadMomentum(BaseStrategy):
                         self._bars_in_position = 0
                         return "BUY"
                     # Downward breakout - need 2+ negative moves
-                    elif directional_consistency <= 1 and recent_moves[-1] < 0:
+                    elif directional_consistency <= 1 and last_move < 0:
                         self._position = -1
                         self._entry_price = current_price
                         self._entry_vwap = vwap
@@ -463,7 +1088,11 @@ class StrategySpreadMomentum(BaseStrategy):
 
         # SIGNAL 2: Volume surge + low efficiency = Absorption/Reversal
         # More stringent filters
-        if is_volume_surge and efficiency_ratio < 0.25 and volume_ratio >= 2.5:
+        if (
+            is_volume_surge
+            and efficiency_ratio < self._absorption_efficiency
+            and volume_ratio >= self._abs_volume_surge_strong
+        ):
             # High volume but price not moving = absorption
             # Also check velocity is NOT accelerating (confirming exhaustion)
             if not is_accelerating:
@@ -486,17 +1115,13 @@ class StrategySpreadMomentum(BaseStrategy):
 
         # SIGNAL 3: Spread contracting after expansion + velocity deceleration = Reversion
         # Best performing signal - focus on this
-        if spread_regime == "contracting" and len(self.spreads) >= 8:
+        if regime == 0 and len(spreads) >= 8:
             # Check if spread was recently expanded significantly
-            recent_spreads = list(self.spreads)[-8:]
-            recent_max_spread = max(recent_spreads)
-            recent_avg_spread = sum(list(self.spreads)[-self.spread_window:]) / self.spread_window
-            current_spread = self.spreads[-1]
-
+            recent_max_spread = float(spreads.tail(8).max())
             # Require substantial expansion followed by contraction
-            if recent_max_spread > recent_avg_spread * 1.8 and current_spread < recent_max_spread * 0.7:
+            if recent_max_spread > avg_spread * 1.8 and current_spread < recent_max_spread * 0.7:
                 # Spread contracted after significant expansion
-                if not is_accelerating and velocity < np.mean(list(self.tick_velocities)[-10:]) if len(self.tick_velocities) >= 10 else True:
+                if len(self.tick_velocities) < 10 or (not is_accelerating and velocity < self._tv_mean10()):
                     # Velocity slowing = reversion trade
                     # More extreme price distance required
                     if price_distance_from_vwap > 1.5:
@@ -516,6 +1141,42 @@ class StrategySpreadMomentum(BaseStrategy):
 
         return None
 
+    def backtest_signals(self, ohlcvs: np.ndarray) -> np.ndarray:
+        """
+        Backtest path: signals for a whole bar array in one compiled pass.
+
+        ``ohlcvs`` is an ``(N, 6)`` array of open, high, low, close, volume,
+        spread.  Applies the :meth:`next_signal` rules with the current
+        parameters from a fresh state; this instance's live buffers are left
+        untouched.  Returns an ``int8`` array: 1 = BUY, -1 = SELL, 0 = none.
+
+        The bars run through a compiled :class:`_SMCore`.  Numba cannot
+        cache jitclasses on disk, so the first call in a process pays a
+        few seconds of compilation; later calls are pure native code.
+        """
+        if max(self.spread_window, self.volume_window, self.velocity_window) > _SERIES_LEN:
+            # next_signal's series never fill such a window; the core's
+            # rings are not sized for it either
+            return np.zeros(len(ohlcvs), dtype=np.int8)
+        core = _SMCore(
+            self.spread_window,
+            self.volume_window,
+            self.velocity_window,
+            self.spread_expansion_threshold,
+            self._inv_expansion,
+            self.volume_surge_threshold,
+            self.velocity_accel_threshold,
+            self.efficiency_threshold,
+            self.max_hold_bars,
+            self.profit_target_atr,
+            self.stop_loss_atr,
+            self._spread_expansion_strong,
+            self._abs_volume_surge_strong,
+            self._absorption_efficiency,
+            self._ATR_CACHE_BARS,
+        )
+        return _run_core(core, np.ascontiguousarray(ohlcvs, dtype=np.float64))
+
     def _reset_position(self):
         """Reset position state."""
         self._position = 0
@@ -529,17 +1190,17 @@ class StrategySpreadMomentum(BaseStrategy):
         """Track results and adapt parameters."""
         super().update_trade_result(win, pnl)
 
-        history = self.params.setdefault("_history", [])
-        history.append({"win": win, "pnl": pnl})
-
-        if len(history) > 50:
-            history.pop(0)
+        i = self._history_idx
+        self._history_win[i] = win
+        self._history_pnl[i] = pnl
+        self._history_idx = (i + 1) % self._HISTORY_LEN
+        self._history_count = min(self._HISTORY_LEN, self._history_count + 1)
 
         # Adaptive parameter tuning based on recent performance
-        if len(history) >= 20:
-            recent = history[-20:]
-            win_rate = sum(1 for h in recent if h["win"]) / 20
-            avg_pnl = sum(h["pnl"] for h in recent) / 20
+        if self._history_count >= 20:
+            recent = np.arange(self._history_idx - 20, self._history_idx)
+            win_rate = float(np.take(self._history_win, recent, mode="wrap").mean())
+            avg_pnl = float(np.take(self._history_pnl, recent, mode="wrap").mean())
 
             # If losing, be more selective
             if win_rate < 0.45:
@@ -552,3 +1213,13 @@ class StrategySpreadMomentum(BaseStrategy):
                 self.spread_expansion_threshold = max(1.3, self.spread_expansion_threshold - 0.02)
                 self.volume_surge_threshold = max(1.5, self.volume_surge_threshold - 0.05)
                 self.efficiency_threshold = max(0.6, self.efficiency_threshold - 0.01)
+
+            self._inv_expansion = 1.0 / self.spread_expansion_threshold
+
+
+@register_warmup
+def _warmup_kernels() -> None:
+    """Compile or cache-load the ATR and tick-velocity kernels."""
+    zeros = np.zeros(2, dtype=np.float64)
+    _atr_kernel(zeros, zeros, zeros, 1)
+    _tick_velocity_kernel(np.zeros(6, dtype=np.float32), 6)
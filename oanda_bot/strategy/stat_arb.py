@@ -33,10 +33,48 @@ Parameters::
 """
 
 from __future__ import annotations
-from typing import Sequence, Optional, Dict, Any, List
+from typing import Sequence, Optional, Dict, Any, List, Set, Tuple
 from collections import deque
+import functools
+import math
 import numpy as np
 from .base import BaseStrategy
+from ._jit import njit, register_warmup
+
+
+@njit("UniTuple(float64, 2)(float64[::1])", cache=True, fastmath=True, boundscheck=False)
+def _ratio_sums(ratios):
+    """Sum and sum of squares of ``ratios`` in one pass, no temporaries."""
+    total = 0.0
+    sumsq = 0.0
+    for i in range(ratios.shape[0]):
+        r = ratios[i]
+        total += r
+        sumsq += r * r
+    return total, sumsq
+
+
+@functools.lru_cache(maxsize=None)
+def _make_ratio_sums(lookback: int):
+    """
+    ``_ratio_sums`` specialised to windows of exactly ``lookback`` ratios.
+
+    The loop bound is a compile-time constant, so LLVM can fully unroll and
+    vectorise it for the usual small lookbacks.  One kernel per distinct
+    lookback, shared by all instances.
+    """
+
+    @njit("UniTuple(float64, 2)(float64[::1])", cache=True, fastmath=True, boundscheck=False)
+    def ratio_sums(ratios):
+        total = 0.0
+        sumsq = 0.0
+        for i in range(lookback):
+            r = ratios[i]
+            total += r
+            sumsq += r * r
+        return total, sumsq
+
+    return ratio_sums
 
 
 class StrategyStatArb(BaseStrategy):
@@ -58,6 +96,8 @@ class StrategyStatArb(BaseStrategy):
     - This strategy requires access to multiple pairs' prices
     - Uses handle_bar() with instrument info instead of next_signal()
     - Maintains internal state for spread calculations
+    - A pair's ratio is sampled once both legs have a new close; its z-score
+      comes from a running sum / sum of squares over the last ``lookback``
     """
 
     name = "StatArb"
@@ -72,8 +112,8 @@ class StrategyStatArb(BaseStrategy):
     def __init__(self, params: Optional[Dict[str, Any]] = None) -> None:
         super().__init__(params or {})
 
-        # Price history for each instrument
-        self._prices: Dict[str, deque] = {}
+        # Latest close of each instrument (the ratio only needs the last one)
+        self._prices: Dict[str, float] = {}
 
         # Position tracking: {pair_key: {side, entry_spread, entry_zscore, entry_bar}}
         self._positions: Dict[str, Dict] = {}
@@ -81,45 +121,98 @@ class StrategyStatArb(BaseStrategy):
         # Bar counter for max hold
         self._bar_count: int = 0
 
+        # Rolling price-ratio window per pair, with its running sum and sum
+        # of squares so the z-score is O(1) per update
+        self._ratio_window: Dict[str, deque] = {}
+        self._ratio_sum: Dict[str, float] = {}
+        self._ratio_sumsq: Dict[str, float] = {}
+        self._ratio_samples: Dict[str, int] = {}
+
+        # Legs of each pair that have printed since its last ratio sample
+        self._pending_legs: Dict[str, Set[str]] = {}
+
         # Get target pairs from params or use defaults
         self._target_pairs = self.params.get("target_pairs", [
             ["AUD_USD", "NZD_USD"],
             ["EUR_USD", "USD_CHF"],
             ["EUR_USD", "GBP_USD"]
         ])
-
-    def _get_lookback(self) -> int:
-        return self.params.get("lookback", 40)
-
-    def _get_entry_threshold(self) -> float:
-        return self.params.get("entry_threshold", 1.5)
-
-    def _get_exit_threshold(self) -> float:
-        return self.params.get("exit_threshold", 0.3)
-
-    def _get_stop_loss_threshold(self) -> float:
-        return self.params.get("stop_loss_threshold", 2.5)
-
-    def _get_max_hold_bars(self) -> int:
-        return self.params.get("max_hold_bars", 100)
-
-    def _calculate_spread_ratio(self, prices1: np.ndarray, prices2: np.ndarray) -> np.ndarray:
-        """Calculate spread as price ratio."""
-        return prices1 / prices2
-
-    def _calculate_zscore(self, spread: np.ndarray) -> float:
-        """Calculate z-score of current spread vs historical."""
-        if len(spread) < 2:
-            return 0.0
+        # (pair1, pair2, pair_key) built once rather than per bar
+        self._pair_specs: Tuple[Tuple[str, str, str], ...] = tuple(
+            (p[0], p[1], f"{p[0]}_{p[1]}") for p in self._target_pairs
+        )
+
+        # Per-pair readiness: flips once the pair's ratio window is full
+        self._pair_ready: Dict[str, bool] = {pk: False for _, _, pk in self._pair_specs}
+
+        # Thresholds, cached from params (update_trade_result keeps
+        # _entry_thr in step with params["entry_threshold"])
+        self._lookback: int = self.params.get("lookback", 40)
+        self._entry_thr: float = self.params.get("entry_threshold", 1.5)
+        self._exit_thr: float = self.params.get("exit_threshold", 0.3)
+        self._stop_thr: float = self.params.get("stop_loss_threshold", 2.5)
+        self._max_hold: int = self.params.get("max_hold_bars", 100)
+        self._ratio_sums_fixed = _make_ratio_sums(self._lookback)
+
+        # Last 50 trades; kept off ``params`` so it stays JSON-serialisable
+        self._trade_history: deque = deque(self.params.get("_trade_history", ()), maxlen=50)
+        # Win flags of the last 30 trades and their running count
+        self._win_window: deque = deque(
+            (bool(t["win"]) for t in self._trade_history), maxlen=30
+        )
+        self._recent_wins: int = sum(self._win_window)
+
+    def _update_ratio(self, pair_key: str, ratio: float, lookback: int) -> Optional[float]:
+        """
+        Append ``ratio`` to the pair's window and return its z-score vs the
+        previous ``lookback - 1`` ratios, or None until the window is full.
+        """
+        window = self._ratio_window.get(pair_key)
+        if window is None:
+            window = self._ratio_window[pair_key] = deque(maxlen=lookback)
+            self._ratio_sum[pair_key] = 0.0
+            self._ratio_sumsq[pair_key] = 0.0
+            self._ratio_samples[pair_key] = 0
+
+        total = self._ratio_sum[pair_key]
+        sumsq = self._ratio_sumsq[pair_key]
+        if len(window) == window.maxlen:
+            evicted = window[0]
+            total -= evicted
+            sumsq -= evicted * evicted
+        window.append(ratio)
+        total += ratio
+        sumsq += ratio * ratio
+
+        # Re-derive the sums from the window every ``lookback`` samples so
+        # add/subtract rounding cannot accumulate over a long session
+        samples = self._ratio_samples[pair_key] + 1
+        self._ratio_samples[pair_key] = samples
+        if samples % lookback == 0:
+            ratios = np.fromiter(window, dtype=np.float64, count=len(window))
+            if len(ratios) == self._lookback:
+                total, sumsq = self._ratio_sums_fixed(ratios)
+            else:
+                total, sumsq = _ratio_sums(ratios)
+        self._ratio_sum[pair_key] = total
+        self._ratio_sumsq[pair_key] = sumsq
+
+        if not self._pair_ready.get(pair_key, False):
+            if len(window) < lookback:
+                return None
+            self._pair_ready[pair_key] = True
 
         # Use all but current for mean/std
-        mean = np.mean(spread[:-1])
-        std = np.std(spread[:-1])
+        n = len(window) - 1
+        if n < 1:
+            return 0.0
+        mean = (total - ratio) / n
+        var = (sumsq - ratio * ratio) / n - mean * mean
 
-        if std < 1e-10:
+        if var < 1e-20:  # std < 1e-10
             return 0.0
 
-        return (spread[-1] - mean) / std
+        return (ratio - mean) / math.sqrt(var)
 
     def next_signal(self, bars: Sequence[dict]) -> Optional[str]:
         """
@@ -140,44 +233,60 @@ class StrategyStatArb(BaseStrategy):
         Returns:
             List of order dicts or None
         """
-        instrument = bar.get("instrument")
-        close_price = bar.get("close")
+        return self.handle_bars([bar])
 
-        if not instrument or close_price is None:
-            return None
+    def handle_bars(self, bars: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Process every bar of one tick, then scan the target pairs once.
+
+        Feeding AUD_USD and NZD_USD together samples their ratio in a
+        single pass instead of one ``handle_bar`` call per leg.
+
+        Args:
+            bars: List of bar dicts, as accepted by ``handle_bar``
+
+        Returns:
+            List of order dicts or None
+        """
+        lookback = self._lookback
+        updated = set()
 
-        self._bar_count += 1
-        lookback = self._get_lookback()
+        for bar in bars:
+            instrument = bar.get("instrument")
+            close_price = bar.get("close")
 
-        # Initialize price history if needed
-        if instrument not in self._prices:
-            self._prices[instrument] = deque(maxlen=lookback + 10)
+            if not instrument or close_price is None:
+                continue
+
+            self._bar_count += 1
 
-        # Store price
-        self._prices[instrument].append(close_price)
+            self._prices[instrument] = float(close_price)
+            updated.add(instrument)
+
+        if not updated:
+            return None
 
         # Check for signals across all target pairs
         orders = []
 
-        for pair_config in self._target_pairs:
-            pair1, pair2 = pair_config[0], pair_config[1]
-            pair_key = f"{pair1}_{pair2}"
-
-            # Only check if we have data for both pairs
-            if pair1 not in self._prices or pair2 not in self._prices:
+        for pair1, pair2, pair_key in self._pair_specs:
+            if pair1 not in updated and pair2 not in updated:
                 continue
 
-            # Need enough history
-            if len(self._prices[pair1]) < lookback or len(self._prices[pair2]) < lookback:
+            # Sample the spread ratio once both legs have a new price
+            pending = self._pending_legs.setdefault(pair_key, set())
+            pending.update(updated.intersection((pair1, pair2)))
+            if len(pending) < 2:
                 continue
+            pending.clear()
 
-            # Get price arrays
-            prices1 = np.array(list(self._prices[pair1]))[-lookback:]
-            prices2 = np.array(list(self._prices[pair2]))[-lookback:]
+            prices = self._prices
+            ratio = prices[pair1] / prices[pair2]
+            zscore = self._update_ratio(pair_key, ratio, lookback)
 
-            # Calculate spread and z-score
-            spread = self._calculate_spread_ratio(prices1, prices2)
-            zscore = self._calculate_zscore(spread)
+            # Need enough history
+            if zscore is None:
+                continue
 
             # Check for exits first
             if pair_key in self._positions:
@@ -186,20 +295,20 @@ class StrategyStatArb(BaseStrategy):
                 exit_reason = ""
 
                 # Stop loss
-                if abs(zscore) > self._get_stop_loss_threshold():
+                if abs(zscore) > self._stop_thr:
                     should_exit = True
                     exit_reason = "STOP_LOSS"
 
                 # Profit target (mean reversion)
-                elif pos['side'] == 'LONG' and zscore > -self._get_exit_threshold():
+                elif pos['side'] == 'LONG' and zscore > -self._exit_thr:
                     should_exit = True
                     exit_reason = "PROFIT_TARGET"
-                elif pos['side'] == 'SHORT' and zscore < self._get_exit_threshold():
+                elif pos['side'] == 'SHORT' and zscore < self._exit_thr:
                     should_exit = True
                     exit_reason = "PROFIT_TARGET"
 
                 # Max hold time
-                elif self._bar_count - pos['entry_bar'] >= self._get_max_hold_bars():
+                elif self._bar_count - pos['entry_bar'] >= self._max_hold:
                     should_exit = True
                     exit_reason = "MAX_HOLD"
 
@@ -218,13 +327,13 @@ class StrategyStatArb(BaseStrategy):
 
             # Check for new entries (only if not already positioned)
             elif pair_key not in self._positions:
-                entry_threshold = self._get_entry_threshold()
+                entry_threshold = self._entry_thr
 
                 # Spread too low - buy spread (long pair1, short pair2)
                 if zscore < -entry_threshold:
                     self._positions[pair_key] = {
                         'side': 'LONG',
-                        'entry_spread': spread[-1],
+                        'entry_spread': ratio,
                         'entry_zscore': zscore,
                         'entry_bar': self._bar_count,
                         'pair1': pair1,
@@ -237,7 +346,7 @@ class StrategyStatArb(BaseStrategy):
                 elif zscore > entry_threshold:
                     self._positions[pair_key] = {
                         'side': 'SHORT',
-                        'entry_spread': spread[-1],
+                        'entry_spread': ratio,
                         'entry_zscore': zscore,
                         'entry_bar': self._bar_count,
                         'pair1': pair1,
@@ -255,27 +364,27 @@ class StrategyStatArb(BaseStrategy):
         super().update_trade_result(win, pnl)
 
         # Adaptive logic based on recent performance
-        history = self.params.setdefault("_trade_history", [])
-        history.append({"win": win, "pnl": pnl})
+        self._trade_history.append({"win": win, "pnl": pnl})
 
-        # Keep last 50 trades
-        if len(history) > 50:
-            history.pop(0)
+        window = self._win_window
+        if len(window) == window.maxlen:
+            self._recent_wins -= window[0]
+        window.append(bool(win))
+        self._recent_wins += bool(win)
 
         # Adjust thresholds based on performance
-        if len(history) >= 30:
-            recent_wins = sum(1 for t in history[-30:] if t["win"])
-            win_rate = recent_wins / 30
+        if len(window) >= 30:
+            win_rate = self._recent_wins / len(window)
 
             # If losing, widen entry threshold (more selective)
             if win_rate < 0.40:
-                current = self.params.get("entry_threshold", 1.5)
-                self.params["entry_threshold"] = min(2.5, current + 0.1)
+                self._entry_thr = min(2.5, self._entry_thr + 0.1)
+                self.params["entry_threshold"] = self._entry_thr
 
             # If winning well, can be slightly more aggressive
             elif win_rate > 0.55:
-                current = self.params.get("entry_threshold", 1.5)
-                self.params["entry_threshold"] = max(1.2, current - 0.05)
+                self._entry_thr = max(1.2, self._entry_thr - 0.05)
+                self.params["entry_threshold"] = self._entry_thr
 
     def get_position_info(self) -> Dict[str, Any]:
         """Return current position information for monitoring."""
@@ -332,16 +441,20 @@ def test_stat_arb():
         base_nzd = bar_nzd["close"]
 
         # Process bars
-        orders_aud = strategy.handle_bar(bar_aud)
-        orders_nzd = strategy.handle_bar(bar_nzd)
+        orders = strategy.handle_bars([bar_aud, bar_nzd])
 
-        if orders_aud:
-            print(f"Bar {i}: {orders_aud}")
-        if orders_nzd:
-            print(f"Bar {i}: {orders_nzd}")
+        if orders:
+            print(f"Bar {i}: {orders}")
 
     print(f"\nFinal position info: {strategy.get_position_info()}")
 
 
+@register_warmup
+def _warmup_kernels() -> None:
+    """Compile the ratio-sum kernel, including the default 40-bar specialisation."""
+    _ratio_sums(np.zeros(2, dtype=np.float64))
+    _make_ratio_sums(40)(np.zeros(40, dtype=np.float64))  # default lookback
+
+
 if __name__ == "__main__":
     test_stat_arb()
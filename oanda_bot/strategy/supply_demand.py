@@ -24,11 +24,125 @@ Parameters:
 """
 
 from __future__ import annotations
-from typing import Sequence, Optional, Dict, Any, List, Tuple
-import numpy as np
+from typing import Sequence, Optional, Dict, Any, NamedTuple, Callable
 from collections import deque
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 from .base import BaseStrategy
+from ._jit import njit, register_warmup
+
+
+@njit(
+    "int64(float64[:, ::1], float64, float64, int64)",
+    cache=True,
+    fastmath=True,
+    boundscheck=False,
+)
+def _count_touches_nb(ohlc, zone_low, zone_high, max_touches):
+    """
+    Number of OHLC rows whose high/low range overlaps the zone.
+
+    Stops as soon as the count exceeds ``max_touches``: callers only need
+    to know the zone is stale, not by how much.
+    """
+    touches = 0
+    for i in range(ohlc.shape[0]):
+        if ohlc[i, 2] <= zone_high and ohlc[i, 1] >= zone_low:
+            touches += 1
+            if touches > max_touches:
+                break
+    return touches
+
+
+@njit(
+    "float64(float64[:], float64[:], float64[:])",
+    cache=True,
+    fastmath=True,
+    boundscheck=False,
+)
+def _atr_nb(highs, lows, closes):
+    """Mean true range of bars 1..n-1 of aligned arrays, in one pass."""
+    n = highs.shape[0]
+    acc = 0.0
+    for i in range(1, n):
+        prev_c = closes[i - 1]
+        hl = highs[i] - lows[i]
+        hc = abs(highs[i] - prev_c)
+        lc = abs(lows[i] - prev_c)
+        tr = hl if hl > hc else hc
+        tr = tr if tr > lc else lc
+        acc += tr
+    return acc / (n - 1)
+
+
+# OHLC parsers, one per input layout.  Each returns an (N, 4) float64 array
+# and raises KeyError/TypeError/ValueError/IndexError on bars of another
+# layout.
+def _ohlc_from_array(bars: np.ndarray) -> np.ndarray:
+    """Bars already given as an ``(N, 4)`` OHLC array."""
+    if bars.ndim != 2 or bars.shape[1] != 4:
+        raise TypeError("expected an (N, 4) OHLC array")
+    return np.ascontiguousarray(bars, dtype=np.float64)
+
+
+def _ohlc_from_scalars(bars: Sequence) -> np.ndarray:
+    """Bare prices: every OHLC column is the price."""
+    closes = np.fromiter((float(b) for b in bars), dtype=np.float64, count=len(bars))
+    return np.repeat(closes[:, None], 4, axis=1)
+
+
+def _ohlc_from_mid(bars: Sequence) -> np.ndarray:
+    """OANDA candles with a complete ``mid`` o/h/l/c, read straight into the array."""
+    return np.fromiter(
+        (float(mid[k]) for bar in bars for mid in (bar["mid"],) for k in "ohlc"),
+        dtype=np.float64,
+        count=4 * len(bars),
+    ).reshape(-1, 4)
+
+
+def _ohlc_lenient(bars: Sequence) -> Optional[np.ndarray]:
+    """Slow path for OANDA candles with long or missing mid keys."""
+    try:
+        ohlc = []
+        for bar in bars:
+            if isinstance(bar, dict) and "mid" in bar:
+                mid = bar["mid"]
+                o = float(mid.get("o", mid.get("open", 0)))
+                h = float(mid.get("h", mid.get("high", 0)))
+                l = float(mid.get("l", mid.get("low", 0)))
+                c = float(mid.get("c", mid.get("close", 0)))
+                ohlc.append([o, h, l, c])
+            else:
+                return None
+
+        return np.array(ohlc)
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+def _detect_ohlc_parser(bars: Sequence) -> Optional[Callable[[Sequence], np.ndarray]]:
+    """Pick the parser for the layout of ``bars``, or ``None`` if unsupported."""
+    if isinstance(bars, np.ndarray) and bars.ndim == 2:
+        return _ohlc_from_array
+    first = bars[0]
+    if isinstance(first, (int, float, np.floating)):
+        return _ohlc_from_scalars
+    if isinstance(first, dict) and "mid" in first:
+        return _ohlc_from_mid
+    return None
+
+
+class _ZoneArrays(NamedTuple):
+    """Arrays shared by the demand and supply scans of one ``next_signal``."""
+
+    ohlc: np.ndarray
+    atr: float
+    idx: np.ndarray        # start bars of candidates with a narrow base
+    base_high: np.ndarray  # max high of the 5 bars before each candidate
+    base_low: np.ndarray   # min low of the 5 bars before each candidate
+    move_high: np.ndarray  # max high of the (up to) 10 bars from it
+    move_low: np.ndarray   # min low of the (up to) 10 bars from it
 
 
 class StrategySupplyDemand(BaseStrategy):
@@ -53,79 +167,111 @@ class StrategySupplyDemand(BaseStrategy):
         self.require_rejection = bool(self.params.get("require_rejection", True))
         self.atr_period = int(self.params.get("atr_period", 14))
 
-        # Detected zones
-        self.demand_zones: List[Dict] = []  # {"low": x, "high": x, "touches": n, "strength": s}
-        self.supply_zones: List[Dict] = []
+        # OHLC parser for the feed's bar layout, detected on first use
+        self._ohlc_parser: Optional[Callable[[Sequence], np.ndarray]] = None
+
+        # Last 30 trades; kept off ``params`` so it stays JSON-serialisable
+        self._trade_history: deque = deque(self.params.get("_history", ()), maxlen=30)
+        # Win flags of the last 20 trades and their running count
+        self._win_window: deque = deque(
+            (bool(h["win"]) for h in self._trade_history), maxlen=20
+        )
+        self._recent_wins: int = sum(self._win_window)
 
-        # History for zone detection
-        self.ohlc_history = deque(maxlen=self.lookback + 50)
+        # Detected zones as parallel arrays, strongest first (at most 5)
+        self.demand_lows = np.empty(0)
+        self.demand_highs = np.empty(0)
+        self.demand_strength = np.empty(0)
+        self.supply_lows = np.empty(0)
+        self.supply_highs = np.empty(0)
+        self.supply_strength = np.empty(0)
 
     def _extract_ohlc(self, bars: Sequence) -> Optional[np.ndarray]:
-        """Extract OHLC as numpy array."""
-        if not bars:
+        """
+        Extract OHLC as numpy array.
+
+        The parser for the bars' layout is detected once and reused, so
+        later calls skip the per-bar type checks; bars that do not fit it
+        trigger re-detection.
+        """
+        if len(bars) == 0:
             return None
 
-        try:
-            first = bars[0]
-            if isinstance(first, (int, float, np.floating)):
-                closes = np.array([float(b) for b in bars])
-                return np.column_stack([closes, closes, closes, closes])
-
-            ohlc = []
-            for bar in bars:
-                if isinstance(bar, dict) and "mid" in bar:
-                    mid = bar["mid"]
-                    o = float(mid.get("o", mid.get("open", 0)))
-                    h = float(mid.get("h", mid.get("high", 0)))
-                    l = float(mid.get("l", mid.get("low", 0)))
-                    c = float(mid.get("c", mid.get("close", 0)))
-                    ohlc.append([o, h, l, c])
-                else:
-                    return None
-
-            return np.array(ohlc)
-        except (ValueError, TypeError, KeyError):
+        parser = self._ohlc_parser
+        if parser is not None:
+            try:
+                return parser(bars)
+            except (ValueError, TypeError, KeyError, IndexError):
+                pass
+
+        parser = _detect_ohlc_parser(bars)
+        if parser is None:
             return None
+        try:
+            ohlc = parser(bars)
+        except (ValueError, TypeError, KeyError, IndexError):
+            return _ohlc_lenient(bars) if parser is _ohlc_from_mid else None
+        self._ohlc_parser = parser
+        return ohlc
 
     def _compute_atr(self, ohlc: np.ndarray) -> float:
         """Compute ATR."""
         if len(ohlc) < self.atr_period + 1:
             return 0.0
 
-        highs = ohlc[-self.atr_period-1:, 1]
-        lows = ohlc[-self.atr_period-1:, 2]
-        closes = ohlc[-self.atr_period-1:, 3]
-
-        tr = np.maximum(
-            highs[1:] - lows[1:],
-            np.maximum(
-                np.abs(highs[1:] - closes[:-1]),
-                np.abs(lows[1:] - closes[:-1])
-            )
-        )
-
-        return float(tr.mean())
+        window = ohlc[-self.atr_period-1:]
+        return _atr_nb(window[:, 1], window[:, 2], window[:, 3])
 
     def _is_pin_bar(self, bar: np.ndarray, direction: str) -> bool:
-        """Check if bar is a pin bar in given direction."""
+        """Check if bar is a pin bar in given direction ("BUY" or "SELL")."""
         o, h, l, c = bar
-        body = abs(c - o)
         total_range = h - l
-
-        if total_range == 0:
+        if total_range <= 0:
             return False
 
-        upper_wick = h - max(o, c)
-        lower_wick = min(o, c) - l
-
-        if direction == "BUY":
-            return lower_wick > body * 2.0 and body / total_range < 0.4
-        elif direction == "SELL":
-            return upper_wick > body * 2.0 and body / total_range < 0.4
-
-        return False
+        body = abs(c - o)
+        # BUY wants a long lower wick, SELL a long upper wick
+        wick = min(o, c) - l if direction == "BUY" else h - max(o, c)
+        return wick > body * 2.0 and body < 0.4 * total_range
 
-    def _find_supply_demand_zones(self, ohlc: np.ndarray, atr: float):
+    def _precompute_arrays(self, ohlc: np.ndarray) -> _ZoneArrays:
+        """
+        ATR and the sliding-window reductions both zone scans need, built
+        once per ``next_signal``.  Window arrays are empty when there is too
+        little history (< 20 bars) or no ATR.
+        """
+        atr = self._compute_atr(ohlc)
+        n = len(ohlc)
+        if n < 20 or atr == 0:
+            empty = np.empty(0)
+            return _ZoneArrays(ohlc, atr, np.empty(0, dtype=np.int64), empty, empty, empty, empty)
+
+        highs = ohlc[:, 1]
+        lows = ohlc[:, 2]
+
+        # Candidate zones start at bars 10 .. n-6.  For each, the base is
+        # the 5 bars before it and the move is the (up to) 10 bars from it.
+        idx = np.arange(10, n - 5)
+
+        # Base range in one reduction: ptp over 5-bar windows of the
+        # interleaved high/low stream (h0, l0, h1, l1, ...).  Only narrow
+        # consolidations go on to the base/move reductions below.
+        hl = ohlc[:, 1:3].ravel()
+        base_range = np.ptp(sliding_window_view(hl, 10)[::2], axis=1)
+        idx = idx[base_range[idx - 5] <= 2 * atr]
+
+        base_high = sliding_window_view(highs, 5)[idx - 5].max(axis=1)
+        base_low = sliding_window_view(lows, 5)[idx - 5].min(axis=1)
+        # Pad so windows running past the last bar are truncated
+        move_high = sliding_window_view(
+            np.concatenate([highs, np.full(9, -np.inf)]), 10
+        )[idx].max(axis=1)
+        move_low = sliding_window_view(
+            np.concatenate([lows, np.full(9, np.inf)]), 10
+        )[idx].min(axis=1)
+        return _ZoneArrays(ohlc, atr, idx, base_high, base_low, move_high, move_low)
+
+    def _find_supply_demand_zones(self, arrays: _ZoneArrays):
         """
         Identify supply and demand zones from price history.
 
@@ -134,95 +280,51 @@ class StrategySupplyDemand(BaseStrategy):
         2. Followed by strong upward move (> min_zone_strength * ATR)
         3. Zone hasn't been tested more than max_zone_touches times
 
-        Supply zone is opposite.
+        Supply zone is opposite.  ``arrays`` comes from
+        :meth:`_precompute_arrays`, already narrowed to consolidations; with
+        too little history or no ATR the previous zones are kept.
         """
-        if len(ohlc) < 20 or atr == 0:
+        if len(arrays.ohlc) < 20 or arrays.atr == 0:
             return
 
-        # Clear old zones
-        self.demand_zones = []
-        self.supply_zones = []
-
-        # Look for zones
-        for i in range(10, len(ohlc) - 5):
-            # Get base area (consolidation)
-            base_start = i - 5
-            base_end = i
-            base_bars = ohlc[base_start:base_end]
-            base_high = base_bars[:, 1].max()
-            base_low = base_bars[:, 2].min()
-            base_range = base_high - base_low
-
-            # Must be narrow consolidation
-            if base_range > 2 * atr:
-                continue
-
-            # Check move away from base
-            move_bars = ohlc[base_end:min(base_end + 10, len(ohlc))]
-            if len(move_bars) == 0:
-                continue
-
-            move_high = move_bars[:, 1].max()
-            move_low = move_bars[:, 2].min()
-
-            # Demand zone (strong move up)
-            up_move = move_high - base_high
-            if up_move > self.min_zone_strength * atr:
-                # Count how many times this zone has been touched
-                touches = self._count_zone_touches(ohlc[i:], base_low, base_high)
-
-                if touches <= self.max_zone_touches:
-                    strength = up_move / atr
-                    zone = {
-                        "low": base_low,
-                        "high": base_high,
-                        "touches": touches,
-                        "strength": strength,
-                        "bar_index": i
-                    }
-                    self.demand_zones.append(zone)
-
-            # Supply zone (strong move down)
-            down_move = base_low - move_low
-            if down_move > self.min_zone_strength * atr:
-                touches = self._count_zone_touches(ohlc[i:], base_low, base_high)
-
-                if touches <= self.max_zone_touches:
-                    strength = down_move / atr
-                    zone = {
-                        "low": base_low,
-                        "high": base_high,
-                        "touches": touches,
-                        "strength": strength,
-                        "bar_index": i
-                    }
-                    self.supply_zones.append(zone)
+        ohlc, atr, idx = arrays.ohlc, arrays.atr, arrays.idx
+        base_high, base_low = arrays.base_high, arrays.base_low
+        move_high, move_low = arrays.move_high, arrays.move_low
+
+        # Must be followed by a strong move away from the base
+        min_move = self.min_zone_strength * atr
+        up_move = move_high - base_high
+        down_move = base_low - move_low
+        is_demand = up_move > min_move
+        is_supply = down_move > min_move
+
+        # Touches: bars from the zone's start whose range overlaps the base
+        touches = np.zeros(len(idx), dtype=np.int64)
+        max_touches = self.max_zone_touches
+        for k in np.flatnonzero(is_demand | is_supply):
+            touches[k] = _count_touches_nb(
+                ohlc[idx[k]:], base_low[k], base_high[k], max_touches
+            )
+        fresh = touches <= self.max_zone_touches
 
         # Keep only strongest zones
-        self.demand_zones = sorted(
-            self.demand_zones,
-            key=lambda z: z["strength"],
-            reverse=True
-        )[:5]
-
-        self.supply_zones = sorted(
-            self.supply_zones,
-            key=lambda z: z["strength"],
-            reverse=True
-        )[:5]
-
-    def _count_zone_touches(self, ohlc: np.ndarray, zone_low: float, zone_high: float) -> int:
-        """Count how many times price has touched this zone."""
-        touches = 0
-        for bar in ohlc:
-            h, l = bar[1], bar[2]
-            if l <= zone_high and h >= zone_low:
-                touches += 1
-        return touches
-
-    def _in_zone(self, price: float, zone: Dict) -> bool:
-        """Check if price is within zone."""
-        return zone["low"] <= price <= zone["high"]
+        up_strength = up_move / atr
+        demand = self._strongest(up_strength, is_demand & fresh)
+        self.demand_lows = base_low[demand]
+        self.demand_highs = base_high[demand]
+        self.demand_strength = up_strength[demand]
+
+        down_strength = down_move / atr
+        supply = self._strongest(down_strength, is_supply & fresh)
+        self.supply_lows = base_low[supply]
+        self.supply_highs = base_high[supply]
+        self.supply_strength = down_strength[supply]
+
+    @staticmethod
+    def _strongest(strength: np.ndarray, mask: np.ndarray, n: int = 5) -> np.ndarray:
+        """Indices of the ``n`` strongest candidates in ``mask``, strongest first."""
+        cand = np.flatnonzero(mask)
+        return cand[np.argsort(-strength[cand], kind="stable")[:n]]
 
     def next_signal(self, bars: Sequence[dict]) -> Optional[str]:
         """Generate trading signal based on supply/demand zones."""
@@ -230,15 +332,12 @@ class StrategySupplyDemand(BaseStrategy):
         if ohlc is None or len(ohlc) < self.lookback:
             return None
 
-        # Update history
-        self.ohlc_history.extend(ohlc)
-
-        atr = self._compute_atr(ohlc)
-        if atr == 0:
+        arrays = self._precompute_arrays(ohlc)
+        if arrays.atr == 0:
             return None
 
         # Find zones
-        self._find_supply_demand_zones(ohlc, atr)
+        self._find_supply_demand_zones(arrays)
 
         current_bar = ohlc[-1]
         current_close = current_bar[3]
@@ -246,25 +345,23 @@ class StrategySupplyDemand(BaseStrategy):
         current_high = current_bar[1]
 
         # Check for demand zone entry (BUY)
-        for zone in self.demand_zones:
-            if self._in_zone(current_low, zone) or self._in_zone(current_close, zone):
-                # If we require rejection, check for pin bar
-                if self.require_rejection:
-                    if self._is_pin_bar(current_bar, "BUY"):
-                        # Strong demand zone with rejection
-                        return "BUY"
-                else:
-                    # Enter on touch
-                    return "BUY"
+        lows, highs = self.demand_lows, self.demand_highs
+        hits = ((lows <= current_low) & (current_low <= highs)) | (
+            (lows <= current_close) & (current_close <= highs)
+        )
+        if hits.any():
+            # If we require rejection, check for pin bar; else enter on touch
+            if not self.require_rejection or self._is_pin_bar(current_bar, "BUY"):
+                return "BUY"
 
         # Check for supply zone entry (SELL)
-        for zone in self.supply_zones:
-            if self._in_zone(current_high, zone) or self._in_zone(current_close, zone):
-                if self.require_rejection:
-                    if self._is_pin_bar(current_bar, "SELL"):
-                        return "SELL"
-                else:
-                    return "SELL"
+        lows, highs = self.supply_lows, self.supply_highs
+        hits = ((lows <= current_high) & (current_high <= highs)) | (
+            (lows <= current_close) & (current_close <= highs)
+        )
+        if hits.any():
+            if not self.require_rejection or self._is_pin_bar(current_bar, "SELL"):
+                return "SELL"
 
         return None
 
@@ -272,16 +369,17 @@ class StrategySupplyDemand(BaseStrategy):
         """Track performance."""
         super().update_trade_result(win, pnl)
 
-        history = self.params.setdefault("_history", [])
-        history.append({"win": win, "pnl": pnl})
+        self._trade_history.append({"win": win, "pnl": pnl})
 
-        if len(history) > 30:
-            history.pop(0)
+        window = self._win_window
+        if len(window) == window.maxlen:
+            self._recent_wins -= window[0]
+        window.append(bool(win))
+        self._recent_wins += bool(win)
 
         # Adaptive zone strength requirement
-        if len(history) >= 20:
-            recent = history[-20:]
-            win_rate = sum(1 for h in recent if h["win"]) / 20
+        if len(window) >= 20:
+            win_rate = self._recent_wins / len(window)
 
             if win_rate < 0.45:
                 # Be more selective
@@ -311,20 +409,10 @@ def compute_atr(bars, period: int = 14) -> float:
                 c = float(mid.get("c", mid.get("close", 0)))
                 ohlc.append([h, l, c])
 
-        ohlc = np.array(ohlc)
-        highs = ohlc[:, 0]
-        lows = ohlc[:, 1]
-        closes = ohlc[:, 2]
-
-        tr = np.maximum(
-            highs[1:] - lows[1:],
-            np.maximum(
-                np.abs(highs[1:] - closes[:-1]),
-                np.abs(lows[1:] - closes[:-1])
-            )
-        )
-
-        return float(tr.mean())
+        if len(ohlc) < 2:
+            return 0.0
+        ohlc = np.array(ohlc, dtype=np.float64)
+        return _atr_nb(ohlc[:, 0], ohlc[:, 1], ohlc[:, 2])
 
     except (ValueError, TypeError, KeyError):
         return 0.0
@@ -365,3 +453,11 @@ def sl_tp_levels(bars, side: str, params=None):
         )
     else:
         raise ValueError("side must be 'BUY' or 'SELL'")
+
+
+@register_warmup
+def _warmup_kernels() -> None:
+    """Compile or cache-load the ATR and zone-touch kernels."""
+    zeros = np.zeros(2, dtype=np.float64)
+    _atr_nb(zeros, zeros, zeros)
+    _count_touches_nb(np.zeros((1, 4), dtype=np.float64), 0.0, 0.0, 1)
@@ -1,5 +1,47 @@
 from .base import BaseStrategy
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from collections import deque
+from itertools import islice
+import numpy as np
+from ._candle import CandleBatch, candle_to_bar as _candle_to_bar, safe_float as _safe_float
+from ._jit import njit, register_warmup
+
+
+@njit("float64[::1](float64[::1], float64[::1], float64[::1], int64)",
+      cache=True, fastmath=True, boundscheck=False)
+def _wilder_atr(highs, lows, closes, window):
+    """
+    Wilder ATR after every bar, as ``handle_bar`` maintains it: NaN until
+    ``window`` true ranges exist, then their mean, then the recursive update.
+
+    The three-way TR max is written as selects, and the seed and recursive
+    phases are separate loops, so the loop bodies stay branch-free.
+    """
+    n = highs.shape[0]
+    atr = np.full(n, np.nan)
+    if n <= window:
+        return atr
+    value = 0.0
+    for i in range(1, window + 1):
+        prev_c = closes[i - 1]
+        hl = highs[i] - lows[i]
+        hc = abs(highs[i] - prev_c)
+        lc = abs(lows[i] - prev_c)
+        tr = hl if hl > hc else hc
+        value += tr if tr > lc else lc
+    value /= window
+    atr[window] = value
+    for i in range(window + 1, n):
+        prev_c = closes[i - 1]
+        hl = highs[i] - lows[i]
+        hc = abs(highs[i] - prev_c)
+        lc = abs(lows[i] - prev_c)
+        tr = hl if hl > hc else hc
+        tr = tr if tr > lc else lc
+        value = (value * (window - 1) + tr) / window
+        atr[i] = value
+    return atr
+
 
 class StrategyTrendMA(BaseStrategy):
     """
@@ -19,9 +61,21 @@ class StrategyTrendMA(BaseStrategy):
         self.atr_window = int(config.get("atr_window", 14))
         self.atr_mult = float(config.get("atr_mult", 1.5))
         # Price history
-        self.highs = []
-        self.lows = []
-        self.closes = []
+        history = max(self.fast, self.slow, self.atr_window) + 1
+        self.highs = deque(maxlen=history)
+        self.lows = deque(maxlen=history)
+        self.closes = deque(maxlen=history)
+        # Running sums of the last fast/slow closes, re-summed every
+        # ``slow`` bars so floating-point drift cannot accumulate
+        self._fast_sum = 0.0
+        self._slow_sum = 0.0
+        self._bars_since_resync = 0
+        # Wilder ATR state: arithmetic-mean seed over the first
+        # ``atr_window`` true ranges, then the recursive update
+        self._atr = None
+        self._prev_close = None
+        self._tr_sum = 0.0
+        self._tr_count = 0
         # Previous MA values for crossover detection
         self.prev_fast_ma = None
         self.prev_slow_ma = None
@@ -29,70 +83,8 @@ class StrategyTrendMA(BaseStrategy):
     # ------------------------------------------------------------------ #
     # Helper: normalise various candle formats to a uniform bar dict.    #
     # ------------------------------------------------------------------ #
-    def _candle_to_bar(self, candle):
-        """
-        Normalises a raw candle (tuple, dict, or OANDA object) into a bar dict.
-        Supports lists/tuples of length 4–6, dicts with open/high/low/close or nested mid/bid/ask, and objects.
-        """
-        try:
-            # 1) Tuple or list formats
-            if isinstance(candle, (list, tuple)):
-                length = len(candle)
-                if length == 6:
-                    t, o, h, l, c, v = candle
-                elif length == 5:
-                    t = None
-                    o, h, l, c, v = candle
-                elif length == 4:
-                    t = None
-                    o, h, l, c = candle
-                    v = 0
-                else:
-                    return None
-                return {
-                    "time": t,
-                    "open":  self._safe_float(o),
-                    "high":  self._safe_float(h),
-                    "low":   self._safe_float(l),
-                    "close": self._safe_float(c),
-                    "volume": self._safe_float(v),
-                }
-
-            # 2) Dict formats
-            if isinstance(candle, dict):
-                leg = candle.get("mid") or candle.get("bid") or candle.get("ask")
-                base = leg if isinstance(leg, dict) else candle
-                return {
-                    "time":   candle.get("time") or candle.get("timestamp"),
-                    "open":   self._safe_float(base.get("o") or base.get("open")),
-                    "high":   self._safe_float(base.get("h") or base.get("high")),
-                    "low":    self._safe_float(base.get("l") or base.get("low")),
-                    "close":  self._safe_float(base.get("c") or base.get("close")),
-                    "volume": self._safe_float(candle.get("volume") or candle.get("tradeCount")),
-                }
-
-            # 3) OANDA Candle objects
-            if hasattr(candle, "__dict__") and hasattr(candle, "complete"):
-                return {
-                    "time":   getattr(candle, "time", None) or getattr(candle, "timestamp", None),
-                    "open":   self._safe_float(getattr(candle, "open", None)),
-                    "high":   self._safe_float(getattr(candle, "high", None)),
-                    "low":    self._safe_float(getattr(candle, "low", None)),
-                    "close":  self._safe_float(getattr(candle, "close", None)),
-                    "volume": self._safe_float(getattr(candle, "volume", None)),
-                }
-
-            # Unsupported format
-            return None
-        except Exception:
-            return None
-
-    @staticmethod
-    def _safe_float(val):
-        try:
-            return float(val)
-        except (TypeError, ValueError):
-            return None
+    _candle_to_bar = staticmethod(_candle_to_bar)
+    _safe_float = staticmethod(_safe_float)
 
     def next_signal(self, candles):
         """
@@ -113,6 +105,73 @@ class StrategyTrendMA(BaseStrategy):
             return result[0].get("side", "").upper()
         return None
 
+    def seed(self, candles) -> None:
+        """
+        Warm the price history, SMA sums and ATR with historical ``candles``
+        (any format ``_candle_to_bar`` accepts).  Each bar goes through
+        ``handle_bar``, so the state matches having streamed them live; the
+        signals they would have produced are discarded.
+        """
+        for candle in candles:
+            bar = self._candle_to_bar(candle)
+            if bar:
+                self.handle_bar(bar)
+
+    def next_signal_batch(self, batch: CandleBatch):
+        """
+        ``next_signal`` for a pre-converted ``CandleBatch``: feeds only its
+        last row.  Returns "BUY", "SELL", or None.
+        """
+        if not len(batch.close):
+            return None
+        high, low, close = batch.high[-1], batch.low[-1], batch.close[-1]
+        if high != high or low != low or close != close:  # NaN: unconvertible candle
+            return None
+
+        result = self.handle_bar({"high": float(high), "low": float(low), "close": float(close)})
+        if result:
+            return result[0].get("side", "").upper()
+        return None
+
+    def handle_batch(self, highs, lows, closes) -> List[Optional[Dict[str, Any]]]:
+        """
+        Backtest path: the ``handle_bar`` signal for every bar of a series.
+
+        Applies the crossover and ATR stop rules with the current parameters
+        from a fresh state; this instance's live buffers are left untouched.
+        Returns one entry per bar: the signal dict, or None.
+        """
+        highs = np.ascontiguousarray(highs, dtype=np.float64)
+        lows = np.ascontiguousarray(lows, dtype=np.float64)
+        closes = np.ascontiguousarray(closes, dtype=np.float64)
+        n = closes.shape[0]
+        signals: List[Optional[Dict[str, Any]]] = [None] * n
+        first = max(self.slow, self.atr_window)  # first bar with MAs
+        if n <= first + 1:
+            return signals
+
+        # Trailing sums (partial while fewer than ``window`` closes exist)
+        fast_ma = np.convolve(closes, np.ones(self.fast))[:n] / self.fast
+        slow_ma = np.convolve(closes, np.ones(self.slow))[:n] / self.slow
+        prev_fast, prev_slow = fast_ma[first:-1], slow_ma[first:-1]
+        cur_fast, cur_slow = fast_ma[first + 1:], slow_ma[first + 1:]
+        golden = (prev_fast <= prev_slow) & (cur_fast > cur_slow)
+        death = ~golden & (prev_fast >= prev_slow) & (cur_fast < cur_slow)
+
+        atr = _wilder_atr(highs, lows, closes, self.atr_window)
+        offset = self.atr_mult * atr
+        for i in (np.flatnonzero(golden | death) + first + 1).tolist():
+            side = "buy" if golden[i - first - 1] else "sell"
+            price = float(closes[i])
+            stop = price - offset[i] if side == "buy" else price + offset[i]
+            signals[i] = {
+                "type": "market",
+                "side": side,
+                "price": price,
+                "stop_loss": float(stop),
+            }
+        return signals
+
     def handle_bar(self, bar: Dict[str, Any]):
         """
         Called on each new bar.
@@ -127,60 +186,74 @@ class StrategyTrendMA(BaseStrategy):
             # Skip this bar if it lacks the required numeric fields
             return None
 
+        # Update Wilder's ATR with this bar's true range
+        prev_close = self._prev_close
+        self._prev_close = bar_close
+        if prev_close is not None:
+            tr = bar_high - bar_low
+            hc = abs(bar_high - prev_close)
+            lc = abs(bar_low - prev_close)
+            if hc > tr:
+                tr = hc
+            if lc > tr:
+                tr = lc
+            if self._atr is not None:
+                self._atr = (self._atr * (self.atr_window - 1) + tr) / self.atr_window
+            else:
+                self._tr_sum += tr
+                self._tr_count += 1
+                if self._tr_count == self.atr_window:
+                    self._atr = self._tr_sum / self.atr_window
+
+        # Update the rolling SMA sums before the new close evicts anything
+        closes = self.closes
+        n = len(closes)
+        self._fast_sum += bar_close
+        if n >= self.fast:
+            self._fast_sum -= closes[n - self.fast]
+        self._slow_sum += bar_close
+        if n >= self.slow:
+            self._slow_sum -= closes[n - self.slow]
+
         # Append bar data
         self.highs.append(bar_high)
         self.lows.append(bar_low)
-        self.closes.append(bar_close)
-        # Maintain history length
-        max_len = max(self.slow, self.atr_window) + 1
-        if len(self.closes) > max_len:
-            self.highs.pop(0)
-            self.lows.pop(0)
-            self.closes.pop(0)
+        closes.append(bar_close)
+
+        self._bars_since_resync += 1
+        if self._bars_since_resync >= self.slow:
+            self._bars_since_resync = 0
+            n = len(closes)
+            self._fast_sum = sum(islice(closes, max(n - self.fast, 0), None))
+            self._slow_sum = sum(islice(closes, max(n - self.slow, 0), None))
 
         # Ensure enough data for slow MA and ATR
-        if len(self.closes) < max(self.slow, self.atr_window) + 1:
+        if len(closes) < max(self.slow, self.atr_window) + 1:
             return None
 
         # Calculate SMAs
-        fast_ma = sum(self.closes[-self.fast:]) / self.fast
-        slow_ma = sum(self.closes[-self.slow:]) / self.slow
+        fast_ma = self._fast_sum / self.fast
+        slow_ma = self._slow_sum / self.slow
 
         signal = None
         # Only check for crossover if we have previous values
         if self.prev_fast_ma is not None and self.prev_slow_ma is not None:
+            side = None
             # Golden cross: fast crosses above slow
             if self.prev_fast_ma <= self.prev_slow_ma and fast_ma > slow_ma:
-                # Calculate ATR for stop loss
-                trs = []
-                for i in range(-self.atr_window, 0):
-                    h = self.highs[i]
-                    l = self.lows[i]
-                    prev_close = self.closes[i-1]
-                    trs.append(max(h - l, abs(h - prev_close), abs(l - prev_close)))
-                atr = sum(trs) / len(trs)
-                stop_loss = bar["close"] - self.atr_mult * atr
-                signal = {
-                    "type": "market",
-                    "side": "buy",
-                    "price": bar["close"],
-                    "stop_loss": stop_loss
-                }
+                side = "buy"
             # Death cross: fast crosses below slow
             elif self.prev_fast_ma >= self.prev_slow_ma and fast_ma < slow_ma:
-                trs = []
-                for i in range(-self.atr_window, 0):
-                    h = self.highs[i]
-                    l = self.lows[i]
-                    prev_close = self.closes[i-1]
-                    trs.append(max(h - l, abs(h - prev_close), abs(l - prev_close)))
-                atr = sum(trs) / len(trs)
-                stop_loss = bar["close"] + self.atr_mult * atr
+                side = "sell"
+
+            if side:
+                # ATR stop below a buy, above a sell
+                offset = self.atr_mult * self._atr
                 signal = {
                     "type": "market",
-                    "side": "sell",
-                    "price": bar["close"],
-                    "stop_loss": stop_loss
+                    "side": side,
+                    "price": bar_close,
+                    "stop_loss": bar_close - offset if side == "buy" else bar_close + offset,
                 }
 
         # Update previous MA for next crossover check
@@ -189,4 +262,11 @@ class StrategyTrendMA(BaseStrategy):
 
         if signal:
             return [signal]
-        return None
\ No newline at end of file
+        return None
+
+
+@register_warmup
+def _warmup_kernels() -> None:
+    """Compile or cache-load the Wilder ATR kernel."""
+    probe = np.zeros(3, dtype=np.float64)
+    _wilder_atr(probe, probe, probe, 1)
@@ -1,15 +1,22 @@
 from typing import Sequence, Optional, Tuple
 import datetime as _dt
+import functools
+import threading
 
 import numpy as np
 
+from ._jit import njit, register_warmup
+
 # ---------------------------------------------------------------------------
 # Adaptive parameters
 # ---------------------------------------------------------------------------
-from collections import deque
-
 _PERF_WINDOW = 100  # rolling trade outcomes to track
-_results = deque(maxlen=_PERF_WINDOW)  # True=win, False=loss
+_PERF_MASK = (1 << _PERF_WINDOW) - 1
+# Rolling outcomes packed into one int: bit 0 is the latest trade, 1=win.
+# The win count is kept alongside so the win-rate needs no popcount.
+_results_bits = 0
+_results_count = 0
+_results_wins = 0
 
 # Tunable strategy parameters (start with defaults)
 PARAMS = {
@@ -35,11 +42,18 @@ def update_strategy_performance(trade_won: bool):
         lengthen MACD fast/slow by 2 periods (max fast=20, slow=fast+10)
     - Trend EMA adjusts with slow MACD period (trend = slow*8 roughly)
     """
-    _results.append(trade_won)
-    if len(_results) < 20:  # need some data first
+    global _results_bits, _results_count, _results_wins
+
+    won = 1 if trade_won else 0
+    evicted = _results_bits >> (_PERF_WINDOW - 1)  # oldest bit, 0 until full
+    _results_bits = ((_results_bits << 1) | won) & _PERF_MASK
+    _results_wins += won - evicted
+    if _results_count < _PERF_WINDOW:
+        _results_count += 1
+    if _results_count < 20:  # need some data first
         return
 
-    win_rate = sum(_results) / len(_results)
+    win_rate = _results_wins / _results_count
 
     if win_rate < 0.45:
         # more trades → shorten EMAs
@@ -53,10 +67,13 @@ def update_strategy_performance(trade_won: bool):
     PARAMS["ema_trend"] = PARAMS["macd_slow"] * 8
 
 
+@functools.lru_cache(maxsize=4096)
 def _parse_iso(ts: str) -> _dt.datetime:
     """
     Parse an ISO‑8601 timestamp (with optional nanoseconds) into a timezone‑aware
     datetime, truncating fractional seconds to microseconds.
+
+    Cached: a rolling candle window re-presents the same timestamps every tick.
     """
     ts = ts.replace("Z", "+00:00")
     if "." in ts:
@@ -66,6 +83,30 @@ def _parse_iso(ts: str) -> _dt.datetime:
     return _dt.datetime.fromisoformat(ts)
 
 
+_EPOCH = _dt.datetime(1970, 1, 1, tzinfo=_dt.timezone.utc)
+_ONE_US = _dt.timedelta(microseconds=1)
+
+
+def _epoch_us(when: _dt.datetime) -> int:
+    """Microseconds since the Unix epoch; naive datetimes are taken as UTC."""
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=_dt.timezone.utc)
+    return (when - _EPOCH) // _ONE_US
+
+
+@functools.lru_cache(maxsize=4096)
+def _iso_epoch_us(ts: str) -> int:
+    """``_epoch_us`` of an ISO‑8601 timestamp string (cached like ``_parse_iso``)."""
+    return _epoch_us(_parse_iso(ts))
+
+
+def _candle_times(candles: Sequence[dict]) -> np.ndarray:
+    """Candle timestamps as a contiguous ``datetime64[us]`` array."""
+    return np.fromiter(
+        (_iso_epoch_us(c["time"]) for c in candles), dtype=np.int64, count=len(candles)
+    ).view("datetime64[us]")
+
+
 def breakout_signal(
     candles: Sequence[dict],
     buffer: float = 0.0001,
@@ -98,16 +139,16 @@ def breakout_signal(
     trade_end = _dt.time(10, 0)   # invalidate breakout after 10:00
 
     # 1) Build the pre-open range
-    day_candles = [
-        c for c in candles
-        if pre_start <= _parse_iso(c["time"]).time() <= pre_end
-        and _parse_iso(c["time"]).date() == ts.date()
-    ]
-    if not day_candles:
+    today = ts.date()
+    start64 = np.datetime64(_epoch_us(_dt.datetime.combine(today, pre_start, ts.tzinfo)), "us")
+    end64 = np.datetime64(_epoch_us(_dt.datetime.combine(today, pre_end, ts.tzinfo)), "us")
+    times = _candle_times(candles)
+    day_idx = np.flatnonzero((times >= start64) & (times <= end64))
+    if day_idx.size == 0:
         return None
 
-    high = max(float(c["mid"]["h"]) for c in day_candles)
-    low = min(float(c["mid"]["l"]) for c in day_candles)
+    high = max(float(candles[i]["mid"]["h"]) for i in day_idx)
+    low = min(float(candles[i]["mid"]["l"]) for i in day_idx)
 
     # 2) During the range-building window: no trade
     if ts.time() <= pre_end:
@@ -125,35 +166,124 @@ def breakout_signal(
     return None
 
 
+@njit("float64(float64[::1], int64)", cache=True, fastmath=True, boundscheck=False)
 def _ema_last(arr: np.ndarray, span: int) -> float:
     """
     Compute the last value of an Exponential Moving Average (EMA) for
-    the given NumPy array and span. Implemented in pure NumPy for speed.
+    the given NumPy array and span, without materialising the series.
     """
     alpha = 2.0 / (span + 1)
+    one_minus_alpha = 1.0 - alpha
     ema = arr[0]
-    for v in arr[1:]:
-        ema = alpha * v + (1 - alpha) * ema
+    for i in range(1, arr.shape[0]):
+        ema = alpha * arr[i] + one_minus_alpha * ema
     return ema
 
 
-def _ema_series(arr: np.ndarray, span: int) -> np.ndarray:
-    """Full EMA series (numpy single‑pass)."""
+@functools.lru_cache(maxsize=None)
+def _make_ema_last(span: int):
+    """
+    ``_ema_last`` specialised to one ``span``.
+
+    ``alpha`` and ``1 - alpha`` become compile-time constants.  The trend
+    span only moves when ``update_strategy_performance`` retunes ``PARAMS``,
+    so a handful of kernels cover every value it can take.
+    """
     alpha = 2.0 / (span + 1)
-    ema = np.empty_like(arr)
-    ema[0] = arr[0]
-    for i in range(1, len(arr)):
-        ema[i] = alpha * arr[i] + (1 - alpha) * ema[i - 1]
-    return ema
+    one_minus_alpha = 1.0 - alpha
+
+    @njit("float64(float64[::1])", cache=True, fastmath=True, boundscheck=False)
+    def ema_last(arr):
+        ema = arr[0]
+        for i in range(1, arr.shape[0]):
+            ema = alpha * arr[i] + one_minus_alpha * ema
+        return ema
+
+    return ema_last
+
+
+@njit(
+    "float64[::1](float64[::1], int64, float64[::1])",
+    cache=True, fastmath=True, boundscheck=False,
+)
+def _ema_series_into(arr: np.ndarray, span: int, out: np.ndarray) -> np.ndarray:
+    """Full EMA series (single pass) written into ``out``; returns ``out``."""
+    alpha = 2.0 / (span + 1)
+    one_minus_alpha = 1.0 - alpha
+    out[0] = arr[0]
+    for i in range(1, arr.shape[0]):
+        out[i] = alpha * arr[i] + one_minus_alpha * out[i - 1]
+    return out
+
+
+def _ema_series(arr: np.ndarray, span: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Full EMA series; pass ``out`` (same length as ``arr``) to reuse a buffer."""
+    if out is None:
+        out = np.empty_like(arr)
+    return _ema_series_into(arr, span, out)
+
+
+# Per-thread scratch buffers for intermediate EMA series, keyed by length
+_EMA_SCRATCH = threading.local()
+
+
+def _ema_scratch(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Two reusable float64 buffers of length ``n`` for the calling thread."""
+    pool = getattr(_EMA_SCRATCH, "pool", None)
+    if pool is None:
+        pool = _EMA_SCRATCH.pool = {}
+    bufs = pool.get(n)
+    if bufs is None:
+        bufs = pool[n] = (np.empty(n), np.empty(n))
+    return bufs
 
 
 def _macd(arr: np.ndarray, fast=12, slow=26, sig=9) -> Tuple[np.ndarray, np.ndarray]:
     """MACD (fast‑slow EMA) and signal line."""
-    macd_line = _ema_series(arr, fast) - _ema_series(arr, slow)
+    arr = np.ascontiguousarray(arr, dtype=np.float64)
+    fast_buf, slow_buf = _ema_scratch(arr.shape[0])
+    macd_line = np.subtract(
+        _ema_series(arr, fast, fast_buf), _ema_series(arr, slow, slow_buf)
+    )
     signal_line = _ema_series(macd_line, sig)
     return macd_line, signal_line
 
 
+@njit(
+    "UniTuple(float64, 4)(float64[::1], int64, int64, int64)",
+    cache=True, fastmath=True, boundscheck=False,
+)
+def _macd_tail(arr: np.ndarray, fast: int, slow: int, sig: int) -> Tuple[float, float, float, float]:
+    """
+    Last two MACD and signal-line values in one pass over ``arr``.
+
+    Same recursions as ``_macd`` but the fast/slow/signal EMAs are kept as
+    scalars, so nothing is allocated.  Returns
+    ``(macd_prev, macd_curr, sig_prev, sig_curr)``.
+    """
+    a_f = 2.0 / (fast + 1)
+    a_s = 2.0 / (slow + 1)
+    a_g = 2.0 / (sig + 1)
+    b_f = 1.0 - a_f
+    b_s = 1.0 - a_s
+    b_g = 1.0 - a_g
+    ema_f = arr[0]
+    ema_s = arr[0]
+    macd_curr = 0.0
+    sig_curr = 0.0
+    macd_prev = macd_curr
+    sig_prev = sig_curr
+    for i in range(1, arr.shape[0]):
+        x = arr[i]
+        ema_f = a_f * x + b_f * ema_f
+        ema_s = a_s * x + b_s * ema_s
+        macd_prev = macd_curr
+        sig_prev = sig_curr
+        macd_curr = ema_f - ema_s
+        sig_curr = a_g * macd_curr + b_g * sig_curr
+    return macd_prev, macd_curr, sig_prev, sig_curr
+
+
 def generate_signal(prices: Sequence[float]) -> Optional[str]:
     """
     MACD + adaptive EMA trend‑following signal.
@@ -164,19 +294,31 @@ def generate_signal(prices: Sequence[float]) -> Optional[str]:
     if len(prices) < PARAMS["ema_trend"] + 1:
         return None
 
-    arr = np.asarray(prices, dtype=np.float64)
+    arr = np.ascontiguousarray(prices, dtype=np.float64)
+    return generate_signal_buf(arr, arr.shape[0])
+
+
+def generate_signal_buf(buf: np.ndarray, n: int) -> Optional[str]:
+    """
+    ``generate_signal`` over ``buf[:n]`` (oldest price first).
+
+    For streaming callers that keep one preallocated, C-contiguous float64
+    buffer and write new prices into it in place: the signal is computed
+    on a view, so a tick allocates nothing.
+    """
+    if n < PARAMS["ema_trend"] + 1:
+        return None
+
+    arr = buf[:n]
 
     # Trend filter (adaptive period)
     ema_trend_per = PARAMS["ema_trend"]
-    ema_trend = _ema_last(arr, ema_trend_per)
+    ema_trend = _make_ema_last(ema_trend_per)(arr)
 
     # MACD components using adaptive params
     f, s, g = PARAMS["macd_fast"], PARAMS["macd_slow"], PARAMS["macd_sig"]
-    macd_line, macd_sig = _macd(arr, fast=f, slow=s, sig=g)
-
     # Use previous bar for cross detection
-    macd_prev, sig_prev = macd_line[-2], macd_sig[-2]
-    macd_curr, sig_curr = macd_line[-1], macd_sig[-1]
+    macd_prev, macd_curr, sig_prev, sig_curr = _macd_tail(arr, f, s, g)
     price_curr = arr[-1]
 
     # Bullish crossover in up‑trend
@@ -195,19 +337,34 @@ def generate_signal(prices: Sequence[float]) -> Optional[str]:
 # ---------------------------------------------------------------------------
 
 
-def compute_atr(candles: Sequence[dict], period: int = 14) -> float:
+def compute_atr(
+    candles: Sequence[dict],
+    period: int = 14,
+    prev_atr: Optional[float] = None,
+) -> float:
     """
-    Simple Average True Range (ATR).
+    Average True Range (ATR), Wilder-smoothed when ``prev_atr`` is given.
 
     Args
     ----
-    candles : list of OANDA price dictionaries, newest last.
-    period  : number of bars for the ATR (default 14).
+    candles  : list of OANDA price dictionaries, newest last.
+    period   : number of bars for the ATR (default 14).
+    prev_atr : ATR returned for the previous bar.  When given, only the
+               newest true range is read and the result is
+               ``(prev_atr * (period - 1) + TR) / period``; otherwise the
+               ATR is seeded as the simple mean of the last ``period`` TRs.
 
     Returns
     -------
     ATR value in price units (e.g. 0.00123 for EURUSD).
     """
+    if prev_atr is not None and len(candles) >= 2:
+        prev_close = float(candles[-2]["mid"]["c"])
+        mid = candles[-1]["mid"]
+        h, l = float(mid["h"]), float(mid["l"])
+        tr = max(h - l, abs(h - prev_close), abs(l - prev_close))
+        return (prev_atr * (period - 1) + tr) / period
+
     if len(candles) < period + 1:
         return 0.0
 
@@ -275,3 +432,13 @@ def sl_tp_levels(
     if tp_rounded == entry_price:
         tp_rounded = entry_price + pip if direction == "BUY" else entry_price - pip
     return sl_rounded, tp_rounded
+
+
+@register_warmup
+def _warmup_kernels() -> None:
+    """Compile the EMA/MACD kernels, including the ``ema_trend`` specialisation."""
+    probe = np.zeros(2, dtype=np.float64)
+    _ema_last(probe, 2)
+    _make_ema_last(PARAMS["ema_trend"])(probe)
+    _ema_series_into(probe, 2, np.empty(2))
+    _macd_tail(probe, 2, 3, 2)
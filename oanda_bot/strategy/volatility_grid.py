@@ -1,30 +1,21 @@
 from .base import BaseStrategy
 from typing import Dict, Any, List
+import numpy as np
 
+from ._candle import CandleBatch, dispatch_on_type
 
-# Helper: tolerant candle-to-bar normalizer
-def _candle_to_bar(candle, instrument=None):
-    """
-    Normalise various candle shapes into a standard bar dict.
 
-    Accepts:
-        • 4‑field tuple  -> (open, high, low, close)
-        • 5‑field tuple  -> (time, open, high, low, close)
-        • 6‑field tuple  -> (time, open, high, low, close, volume)
-        • pre‑built dict -> returned as‑is
+def _from_dict(candle, instrument=None):
+    """Pre-built dict: copied, with ``instrument``/``volume`` filled in."""
+    bar = dict(candle)
+    if instrument and "instrument" not in bar:
+        bar["instrument"] = instrument
+    bar.setdefault("volume", 0)
+    return bar
 
-    Missing fields are filled with sensible defaults (empty string for time,
-    0 for volume). The `instrument` key is injected when supplied and absent.
-    """
-    # Already a dict ─ just make sure required keys exist
-    if isinstance(candle, dict):
-        bar = dict(candle)
-        if instrument and "instrument" not in bar:
-            bar["instrument"] = instrument
-        bar.setdefault("volume", 0)
-        return bar
 
-    # Tuple / list handling
+def _from_sequence(candle, instrument=None):
+    """4-, 5- or 6-field tuple/list."""
     if len(candle) == 6:
         time_str, open_p, high, low, close, volume = candle
     elif len(candle) == 5:
@@ -47,6 +38,33 @@ def _candle_to_bar(candle, instrument=None):
         "instrument": instrument,
     }
 
+
+# Helper: tolerant candle-to-bar normalizer
+def _from_any(candle, instrument=None):
+    """
+    Normalise various candle shapes into a standard bar dict.
+
+    Accepts:
+        • 4‑field tuple  -> (open, high, low, close)
+        • 5‑field tuple  -> (time, open, high, low, close)
+        • 6‑field tuple  -> (time, open, high, low, close, volume)
+        • pre‑built dict -> returned as‑is
+
+    Missing fields are filled with sensible defaults (empty string for time,
+    0 for volume). The `instrument` key is injected when supplied and absent.
+    """
+    # Already a dict ─ just make sure required keys exist
+    if isinstance(candle, dict):
+        return _from_dict(candle, instrument)
+
+    # Tuple / list handling
+    return _from_sequence(candle, instrument)
+
+
+_candle_to_bar = dispatch_on_type(
+    {dict: _from_dict, list: _from_sequence, tuple: _from_sequence}, _from_any
+)
+
 class StrategyVolatilityGrid(BaseStrategy):
     """
     Grid scalping in low-volatility ranges.
@@ -66,10 +84,13 @@ class StrategyVolatilityGrid(BaseStrategy):
         self.levels = int(config.get("levels", 3))
         # Maximum simultaneous grid orders
         self.risk_cap = int(config.get("risk_cap", 4))
-        # Track placed entry levels: price -> side
-        self.active_entries: Dict[float, str] = {}
-        # Track which entries have been closed
-        self.closed_entries: set = set()
+        # Grid offsets from the anchor price: 1..levels grid steps
+        self._levels_arr = np.arange(1, self.levels + 1, dtype=np.float64) * self.grid_size
+        # Entry levels by slot: buys at 0..levels-1 (i grid steps below the
+        # anchor), sells at levels..2*levels-1.  Bit k of ``_active_mask``
+        # marks slot k as placed and not yet closed.
+        self._slot_prices: List[float] = [0.0] * (2 * self.levels)
+        self._active_mask = 0
 
     def next_signal(self, candles):
         """
@@ -87,6 +108,22 @@ class StrategyVolatilityGrid(BaseStrategy):
             return result[0].get("side", "").upper()
         return None
 
+    def next_signal_batch(self, batch: CandleBatch):
+        """
+        ``next_signal`` for a pre-converted ``CandleBatch``: feeds only its
+        last close.  Returns "BUY", "SELL", or None.
+        """
+        if not len(batch.close):
+            return None
+        close = batch.close[-1]
+        if close != close:  # NaN: candle without a close
+            return None
+
+        result = self.handle_bar({"close": float(close), "instrument": self.instrument})
+        if isinstance(result, list) and result:
+            return result[0].get("side", "").upper()
+        return None
+
     def handle_bar(self, bar: Dict[str, Any]) -> List[Dict[str, Any]] or None:
         """
         Place grid orders once, then close when price retraces grid_size.
@@ -103,59 +140,40 @@ class StrategyVolatilityGrid(BaseStrategy):
 
         if price == 0:
             return None
-        signals: List[Dict[str, Any]] = []
-
-        # Initial grid placement
-        if not self.active_entries:
-            # Place buys below price
-            for i in range(1, self.levels + 1):
-                if len(self.active_entries) >= self.risk_cap:
-                    break
-                entry_price = price - i * self.grid_size
-                self.active_entries[entry_price] = "buy"
-                signals.append({
-                    "type": "limit",
-                    "side": "buy",
-                    "price": entry_price
-                })
-            # Place sells above price
-            for i in range(1, self.levels + 1):
-                if len(self.active_entries) >= self.risk_cap:
-                    break
-                entry_price = price + i * self.grid_size
-                self.active_entries[entry_price] = "sell"
-                signals.append({
-                    "type": "limit",
-                    "side": "sell",
-                    "price": entry_price
-                })
+
+        # Initial grid placement: buys below price, then sells above it,
+        # up to risk_cap levels in total
+        if not self._active_mask:
+            n_buys = max(0, min(self.levels, self.risk_cap))
+            n_sells = max(0, min(self.levels, self.risk_cap - n_buys))
+            buys = (price - self._levels_arr[:n_buys]).tolist()
+            sells = (price + self._levels_arr[:n_sells]).tolist()
+            self._slot_prices[:n_buys] = buys
+            self._slot_prices[self.levels:self.levels + n_sells] = sells
+            self._active_mask = ((1 << n_buys) - 1) | (((1 << n_sells) - 1) << self.levels)
+            signals = [{"type": "limit", "side": "buy", "price": p} for p in buys]
+            signals += [{"type": "limit", "side": "sell", "price": p} for p in sells]
             return signals
 
-        # Manage closings: when retraced by grid_size
-        for entry_price, side in list(self.active_entries.items()):
-            if entry_price in self.closed_entries:
-                continue
-            # For buys, close when price moves up by grid_size
-            if side == "buy" and price >= entry_price + self.grid_size:
-                signals.append({
-                    "type": "market",
-                    "side": "sell",
-                    "price": price
-                })
-                self.closed_entries.add(entry_price)
-            # For sells, close when price moves down by grid_size
-            if side == "sell" and price <= entry_price - self.grid_size:
-                signals.append({
-                    "type": "market",
-                    "side": "buy",
-                    "price": price
-                })
-                self.closed_entries.add(entry_price)
-
-        # Clean up closed entries and reset for next grid cycle
-        if signals:
-            for entry_price in list(self.closed_entries):
-                self.active_entries.pop(entry_price, None)
-            self.closed_entries.clear()
+        # Manage closings: buys close when price moves up by grid_size,
+        # sells when it moves down by grid_size
+        signals = []
+        closed_mask = 0
+        remaining = self._active_mask
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            slot = bit.bit_length() - 1
+            entry_price = self._slot_prices[slot]
+            if slot < self.levels:
+                if price >= entry_price + self.grid_size:
+                    signals.append({"type": "market", "side": "sell", "price": price})
+                    closed_mask |= bit
+            elif price <= entry_price - self.grid_size:
+                signals.append({"type": "market", "side": "buy", "price": price})
+                closed_mask |= bit
+
+        # Clear closed slots; the next grid is placed once all have closed
+        self._active_mask &= ~closed_mask
 
         return signals or None
\ No newline at end of file
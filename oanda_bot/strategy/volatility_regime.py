@@ -29,42 +29,108 @@ Parameters::
 """
 
 from __future__ import annotations
+from bisect import bisect_left, insort
+from collections import deque
+from functools import lru_cache
+from itertools import islice
 from typing import Sequence, Optional, Dict, Any
 import numpy as np
 from .base import BaseStrategy
+from ._candle import bars_added
+from ._jit import njit, register_warmup
 
 
-def _atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
-    """Calculate Average True Range."""
-    tr1 = high - low
-    tr2 = np.abs(high - np.roll(close, 1))
-    tr3 = np.abs(low - np.roll(close, 1))
-    tr = np.maximum(np.maximum(tr1, tr2), tr3)
-    tr[:period] = 0
-
-    # Simple moving average of TR
-    atr = np.zeros_like(tr)
-    atr[period-1] = tr[:period].mean()
+@njit("void(float64[::1], float64[::1], float64[::1], int64, float64[::1])",
+      cache=True, fastmath=True, boundscheck=False)
+def _atr_into(high, low, close, period, atr):
+    """
+    Write the Wilder ATR into the zeroed buffer ``atr``.
+
+    True ranges before ``period`` are treated as 0, so ``atr[period-1]``
+    (their mean) seeds the recursion at 0.  The previous close is read as
+    ``close[i-1]`` rather than through a shifted copy.
+    """
     alpha = 1.0 / period
-    for i in range(period, len(tr)):
-        atr[i] = (1 - alpha) * atr[i-1] + alpha * tr[i]
+    value = 0.0
+    for i in range(period, high.shape[0]):
+        prev_c = close[i - 1]
+        hl = high[i] - low[i]
+        hc = abs(high[i] - prev_c)
+        lc = abs(low[i] - prev_c)
+        tr = hl if hl > hc else hc
+        tr = tr if tr > lc else lc
+        value = (1.0 - alpha) * value + alpha * tr
+        atr[i] = value
+
 
+def _atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Calculate Average True Range."""
+    atr = np.zeros(len(high))
+    _atr_into(high, low, close, period, atr)
     return atr
 
 
-def _realized_volatility(returns: np.ndarray, window: int) -> np.ndarray:
-    """Calculate realized volatility (rolling std of returns)."""
-    vol = np.zeros(len(returns))
-    for i in range(window, len(returns)):
-        vol[i] = np.std(returns[i-window:i])
+@njit("float64[::1](float32[::1], int64)",
+      cache=True, fastmath=True, boundscheck=False)
+def _realized_volatility(returns, window):
+    """
+    Calculate realized volatility (rolling std of returns).
+
+    ``vol[i]`` is the population std of ``returns[i-window:i]`` (zero for
+    ``i < window``).  The window's mean and sum of squared deviations are
+    slid along with Welford's add/remove update, so each element is O(1).
+    A window of identical returns is reported as exactly 0, as ``np.std``
+    does, since callers test ``vol == 0``.  Returns are float32; the mean
+    and ``m2`` are accumulated in float64.
+    """
+    n = returns.shape[0]
+    vol = np.zeros(n)
+    if n <= window:
+        return vol
+
+    mean = 0.0
+    m2 = 0.0
+    run = 0  # trailing returns equal to the newest one
+    for j in range(window):
+        x = np.float64(returns[j])
+        run = run + 1 if j > 0 and x == returns[j - 1] else 1
+        delta = x - mean
+        mean += delta / (j + 1)
+        m2 += delta * (x - mean)
+
+    for i in range(window, n):
+        if run < window and m2 > 0.0:
+            vol[i] = np.sqrt(m2 / window)
+        x_new = np.float64(returns[i])
+        x_old = np.float64(returns[i - window])
+        run = run + 1 if x_new == returns[i - 1] else 1
+        old_mean = mean
+        mean += (x_new - x_old) / window
+        m2 += (x_new - x_old) * (x_new - mean + x_old - old_mean)
     return vol
 
 
-def _garch_regime(vol: np.ndarray, lookback: int) -> tuple:
+@njit("UniTuple(float64, 2)(float64[::1])", cache=True, fastmath=True, boundscheck=False)
+def _mean_std(values):
+    """Mean and population std of ``values`` in one Welford pass."""
+    mean = 0.0
+    m2 = 0.0
+    for i in range(values.shape[0]):
+        x = values[i]
+        delta = x - mean
+        mean += delta / (i + 1)
+        m2 += delta * (x - mean)
+    return mean, np.sqrt(m2 / values.shape[0]) if m2 > 0.0 else 0.0
+
+
+def _garch_regime(vol: np.ndarray, lookback: int, sorted_recent: Optional[list] = None) -> tuple:
     """
     Identify volatility regime using GARCH-like approach.
     Returns (current_regime, vol_zscore, vol_percentile)
 
+    ``sorted_recent``, if given, is ``vol[-lookback:]`` in ascending order;
+    the percentile is then a bisection instead of a scan of the window.
+
     Regimes:
     - LOW: volatility < -1 std
     - NORMAL: -1 std <= volatility <= 1 std
@@ -77,8 +143,7 @@ def _garch_regime(vol: np.ndarray, lookback: int) -> tuple:
     recent_vol = vol[-lookback:]
     current_vol = vol[-1]
 
-    mean_vol = np.mean(recent_vol)
-    std_vol = np.std(recent_vol)
+    mean_vol, std_vol = _mean_std(np.ascontiguousarray(recent_vol, dtype=np.float64))
 
     if std_vol == 0:
         return "NORMAL", 0.0, 0.5
@@ -87,7 +152,10 @@ def _garch_regime(vol: np.ndarray, lookback: int) -> tuple:
     vol_zscore = (current_vol - mean_vol) / std_vol
 
     # Percentile
-    vol_percentile = np.sum(recent_vol < current_vol) / len(recent_vol)
+    if sorted_recent is not None:
+        vol_percentile = bisect_left(sorted_recent, current_vol) / len(recent_vol)
+    else:
+        vol_percentile = np.sum(recent_vol < current_vol) / len(recent_vol)
 
     # Classify regime
     if vol_zscore > 2.0:
@@ -116,16 +184,93 @@ def _volatility_clustering_score(vol: np.ndarray, window: int = 10) -> float:
     if len(recent) == 0 or len(current) == 0:
         return 0.0
 
-    # Simple correlation between recent and current volatility
-    mean_recent = np.mean(recent)
-    mean_current = np.mean(current)
+    # Simple (Pearson) correlation between recent and current volatility
+    dx = recent - recent.mean()
+    dy = current - current.mean()
+    den = np.sqrt(dx @ dx) * np.sqrt(dy @ dy)
 
-    if np.std(recent) == 0 or np.std(current) == 0:
-        return 0.0
+    return float(dx @ dy) / den if den else 0.0
+
+
+@lru_cache(maxsize=None)
+def _make_clustering_score(window: int):
+    """
+    ``_volatility_clustering_score`` specialised to one ``window``.
 
-    correlation = np.corrcoef(recent, current)[0, 1] if len(recent) == len(current) else 0.0
+    The loop bounds are compile-time constants and the two slices are read
+    in place, so the score costs a few dozen flops with no temporaries.
+    """
+
+    @njit("float64(float64[::1])", cache=True, fastmath=True, boundscheck=False)
+    def clustering_score(vol):
+        n = vol.shape[0]
+        if n < window * 2:
+            return 0.0
+        base = n - 2 * window
+        sx = 0.0
+        sy = 0.0
+        for i in range(window):
+            sx += vol[base + i]
+            sy += vol[base + window + i]
+        mx = sx / window
+        my = sy / window
+        sxy = 0.0
+        sxx = 0.0
+        syy = 0.0
+        for i in range(window):
+            dx = vol[base + i] - mx
+            dy = vol[base + window + i] - my
+            sxy += dx * dy
+            sxx += dx * dx
+            syy += dy * dy
+        den = np.sqrt(sxx) * np.sqrt(syy)
+        return sxy / den if den else 0.0
+
+    return clustering_score
+
+
+#: The clustering score ``next_signal`` uses
+_clustering_score_w10 = _make_clustering_score(10)
+
+
+class _ColumnWindow:
+    """
+    Rows of float columns (e.g. high/low/close) over a sliding, growing
+    window of bars.  New bars are written at the end and old ones dropped
+    from the front without moving the rest; the backing array is compacted
+    or doubled only when the end is reached, so each bar is written once
+    amortised and every column of ``view()`` is a contiguous slice.
+    """
 
-    return correlation if not np.isnan(correlation) else 0.0
+    __slots__ = ("_data", "_start", "_stop")
+
+    def __init__(self, columns: int) -> None:
+        self._data = np.empty((columns, 64), dtype=np.float64)
+        self._start = 0
+        self._stop = 0
+
+    def reset(self, rows: np.ndarray) -> None:
+        """Replace the contents with ``rows`` (shape ``(columns, n)``)."""
+        self._start = self._stop = 0
+        self.advance(rows, 0)
+
+    def advance(self, rows: np.ndarray, dropped: int) -> None:
+        """Drop ``dropped`` bars from the front and append ``rows``."""
+        self._start += dropped
+        n = self._stop - self._start
+        k = rows.shape[1]
+        if self._stop + k > self._data.shape[1]:
+            data = self._data
+            if n + k > data.shape[1] // 2:
+                data = np.empty((data.shape[0], 2 * (n + k)), dtype=np.float64)
+            data[:, :n] = self._data[:, self._start:self._stop]
+            self._data = data
+            self._start, self._stop = 0, n
+        self._data[:, self._stop:self._stop + k] = rows
+        self._stop += k
+
+    def view(self) -> np.ndarray:
+        return self._data[:, self._start:self._stop]
 
 
 class StrategyVolatilityRegime(BaseStrategy):
@@ -153,7 +298,40 @@ class StrategyVolatilityRegime(BaseStrategy):
         self._entry_price = None
         self._entry_idx = 0
         self._last_regime = "NORMAL"
-        self._regime_history = []
+        self._regime_history = deque(maxlen=50)
+        # Last 30 trades; kept off ``params`` so it stays JSON-serialisable
+        self._trade_history = deque(self.params.get("_trade_history", ()), maxlen=30)
+        # Derived series for the last ``bars`` seen (see ``_derived_series``)
+        self._prev_bars = None
+        self._series_key = None
+        self._vol = None
+        self._atr_value = 0.0
+        self._extended = 0  # bars the last _derived_series call appended
+        self._dropped = 0   # bars it dropped from the front
+        # vol[-lookback:] of the last call, and the same values sorted
+        self._recent = None
+        self._sorted_recent = None
+        # Running sum of vol[-vol_window:] (see ``_update_vol_sum``)
+        self._vol_tail = None
+        self._vol_sum = 0.0
+        self._vol_sum_age = 0
+        # high/low/close of the last dict candles parsed (see ``_load_ohlc``)
+        self._ohlc_bars = None
+        self._ohlc = _ColumnWindow(3)
+        self._returns_buf = np.empty(0, dtype=np.float32)
+        # Parameters read every tick, cached from params
+        # (update_trade_result refreshes them after retuning)
+        self._load_params()
+
+    def _load_params(self) -> None:
+        """Copy the per-tick parameters out of ``params``."""
+        params = self.params
+        self._lookback: int = params.get("lookback", 100)
+        self._vol_window: int = params.get("vol_window", 20)
+        self._breakout_mult: float = params.get("breakout_mult", 2.0)
+        self._spike_mult: float = params.get("spike_mult", 3.0)
+        self._atr_period: int = params.get("atr_period", 14)
+        self._min_vol_ratio: float = params.get("min_vol_ratio", 0.3)
 
     def next_signal(self, bars: Sequence[dict]) -> Optional[str]:
         if not bars:
@@ -165,58 +343,64 @@ class StrategyVolatilityRegime(BaseStrategy):
             prices = np.array(bars, dtype=np.float64)
             high = low = close = prices
         else:
-            high = np.array([float(c["mid"]["h"]) for c in bars], dtype=np.float64)
-            low = np.array([float(c["mid"]["l"]) for c in bars], dtype=np.float64)
-            close = np.array([float(c["mid"]["c"]) for c in bars], dtype=np.float64)
+            high, low, close = self._load_ohlc(bars)
 
         # Get parameters
-        lookback = self.params.get("lookback", 100)
-        vol_window = self.params.get("vol_window", 20)
-        regime_threshold = self.params.get("regime_threshold", 1.5)
-        breakout_mult = self.params.get("breakout_mult", 2.0)
-        spike_mult = self.params.get("spike_mult", 3.0)
-        atr_period = self.params.get("atr_period", 14)
-        min_vol_ratio = self.params.get("min_vol_ratio", 0.3)
+        lookback = self._lookback
+        vol_window = self._vol_window
+        breakout_mult = self._breakout_mult
+        spike_mult = self._spike_mult
+        atr_period = self._atr_period
+        min_vol_ratio = self._min_vol_ratio
 
         if len(close) < lookback:
             return None
 
-        # Calculate returns
-        returns = np.diff(close) / close[:-1]
-        returns = np.concatenate([[0], returns])
+        # Calculate returns (first one 0), into a buffer reused across ticks.
+        # Returns are small relative quantities and fit float32, which halves
+        # the memory the volatility pass reads; prices stay float64 to
+        # resolve a fraction of a pip.
+        n = len(close)
+        if self._returns_buf.shape[0] < n:
+            self._returns_buf = np.empty(2 * n, dtype=np.float32)
+        returns = self._returns_buf[:n]
+        returns[0] = 0.0
+        np.subtract(close[1:], close[:-1], out=returns[1:])
+        np.divide(returns[1:], close[:-1], out=returns[1:])
+
+        # Realized volatility and ATR, extended from the last call if possible
+        vol, current_atr = self._derived_series(
+            bars if high is not close else None,
+            high, low, close, returns, vol_window, atr_period,
+        )
+
+        sorted_recent = self._update_sorted_recent(vol, lookback, vol_window)
+        vol_sum = self._update_vol_sum(vol, vol_window)
 
-        # Calculate realized volatility
-        vol = _realized_volatility(returns, vol_window)
+        if current_atr == 0 or vol[-1] == 0:
+            return None
 
-        # Calculate ATR
-        atr = _atr(high, low, close, atr_period)
-        current_atr = atr[-1]
+        # Volatility ratio (current vs recent average)
+        avg_vol = vol_sum / vol_window if len(vol) >= vol_window else vol[-1]
+        vol_ratio = vol[-1] / avg_vol if avg_vol > 0 else 1.0
 
-        if current_atr == 0 or vol[-1] == 0:
+        # Don't trade in extremely low volatility (likely to be noise);
+        # checked first, as it needs none of the regime analysis below
+        if vol_ratio < min_vol_ratio:
             return None
 
         # Identify current regime
-        regime, vol_zscore, vol_percentile = _garch_regime(vol, lookback)
+        regime, vol_zscore, vol_percentile = _garch_regime(vol, lookback, sorted_recent)
 
-        # Track regime history
+        # Track regime history (last 50)
         self._regime_history.append(regime)
-        if len(self._regime_history) > 50:
-            self._regime_history.pop(0)
 
         # Calculate volatility clustering score
-        clustering_score = _volatility_clustering_score(vol, window=10)
+        clustering_score = _clustering_score_w10(vol)
 
         # Recent price momentum
         momentum = (close[-1] - close[-5]) / close[-5] if len(close) >= 5 else 0
 
-        # Volatility ratio (current vs recent average)
-        avg_vol = np.mean(vol[-vol_window:]) if len(vol) >= vol_window else vol[-1]
-        vol_ratio = vol[-1] / avg_vol if avg_vol > 0 else 1.0
-
-        # Don't trade in extremely low volatility (likely to be noise)
-        if vol_ratio < min_vol_ratio:
-            return None
-
         # --- ENTRY SIGNALS ---
         if self._position == 0:
 
@@ -276,21 +460,155 @@ class StrategyVolatilityRegime(BaseStrategy):
             # Exit if regime reverses (e.g., from HIGH back to LOW)
             # This suggests the volatility edge has dissipated
             if self._entry_regime in ["HIGH", "EXTREME"] and regime == "LOW":
+                position = self._position
                 self._position = 0
                 self._entry_regime = None
-                return "SELL" if self._position == 1 else "BUY"
+                return "SELL" if position == 1 else "BUY"
 
             # Exit mean reversion trades when volatility normalizes
             if self._entry_regime == "EXTREME" and regime in ["NORMAL", "LOW"]:
+                position = self._position
                 self._position = 0
                 self._entry_regime = None
-                return "SELL" if self._position == 1 else "BUY"
+                return "SELL" if position == 1 else "BUY"
 
         # Update regime tracking
         self._last_regime = regime
 
         return None
 
+    def _load_ohlc(self, bars: Sequence[dict]) -> np.ndarray:
+        """
+        High, low and close of ``bars`` as contiguous float64 rows.
+
+        Only candles not present on the previous call are parsed; the
+        others are kept in a ``_ColumnWindow`` from then.
+        """
+        prev = self._ohlc_bars
+        k = bars_added(prev, bars)
+        n = len(bars)
+        new = bars[n - k:] if k else bars
+        rows = np.array(
+            [(float(c["mid"]["h"]), float(c["mid"]["l"]), float(c["mid"]["c"])) for c in new],
+            dtype=np.float64,
+        ).reshape(-1, 3).T
+        if k:
+            self._ohlc.advance(rows, len(prev) + k - n)
+        else:
+            self._ohlc.reset(rows)
+        self._ohlc_bars = bars
+        return self._ohlc.view()
+
+    def _derived_series(
+        self,
+        bars: Optional[Sequence[dict]],
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        returns: np.ndarray,
+        vol_window: int,
+        atr_period: int,
+    ) -> tuple:
+        """
+        Realized volatility series and latest ATR for ``bars``.
+
+        When ``bars`` continues the previous call's candles, only the new
+        tail of the volatility series is computed, plus - if candles left
+        the front - the one value whose window now starts at the zeroed
+        first return.  A grown history continues the ATR with one Wilder
+        step per new TR; a slid one recomputes it, since its seed moved
+        with the window start.  Anything else (scalar prices, changed
+        parameters, a short history) is a full recompute.
+        """
+        n = len(close)
+        key = (vol_window, atr_period)
+        k = bars_added(self._prev_bars, bars) if bars is not None and key == self._series_key else 0
+
+        dropped = 0
+        if k and n - k > max(vol_window, atr_period):
+            dropped = len(self._prev_bars) + k - n
+            vol = np.empty(n)
+            vol[:n - k] = self._vol[dropped:]
+            vol[n - k:] = _realized_volatility(returns[n - k - vol_window:], vol_window)[vol_window:]
+            if dropped:
+                vol[:vol_window] = 0.0
+                vol[vol_window] = _realized_volatility(returns[:vol_window + 1], vol_window)[vol_window]
+                # The Wilder seed sits at the window start, which has moved
+                current_atr = _atr(high, low, close, atr_period)[-1]
+            else:
+                alpha = 1.0 / atr_period
+                current_atr = self._atr_value
+                for i in range(n - k, n):
+                    prev_c = close[i - 1]
+                    tr = max(high[i] - low[i], abs(high[i] - prev_c), abs(low[i] - prev_c))
+                    current_atr = (1.0 - alpha) * current_atr + alpha * tr
+        else:
+            k = 0
+            vol = _realized_volatility(returns, vol_window)
+            current_atr = _atr(high, low, close, atr_period)[-1]
+
+        self._extended = k
+        self._dropped = dropped
+        self._prev_bars = bars
+        self._series_key = key
+        self._vol = vol
+        self._atr_value = current_atr
+        return vol, current_atr
+
+    def _update_sorted_recent(self, vol: np.ndarray, lookback: int, vol_window: int) -> list:
+        """
+        ``vol[-lookback:]`` in ascending order, for the percentile.
+
+        When the last ``_derived_series`` call extended the series, the
+        values that left the window are removed and the new ones inserted
+        by bisection; otherwise the window is sorted afresh.  Values near a
+        dropped front (the first ``vol_window + 1``) may have been rewritten,
+        so a window reaching them is also re-sorted.
+        """
+        k = self._extended
+        recent = vol[-lookback:]
+        window = self._sorted_recent
+        if (
+            k and k < lookback
+            and self._recent is not None and len(self._recent) == lookback
+            and (not self._dropped or len(vol) - lookback > vol_window)
+        ):
+            for x in self._recent[:k].tolist():
+                del window[bisect_left(window, x)]
+            for x in recent[-k:].tolist():
+                insort(window, x)
+        else:
+            window = sorted(recent.tolist())
+        self._recent = recent
+        self._sorted_recent = window
+        return window
+
+    def _update_vol_sum(self, vol: np.ndarray, vol_window: int) -> float:
+        """
+        Sum of ``vol[-vol_window:]``, for the volatility ratio.
+
+        Kept as a running sum: when the last ``_derived_series`` call
+        extended the series, the values that left the window are subtracted
+        and the new ones added.  It is re-summed from the window every
+        ``vol_window`` updates so rounding cannot build up, and whenever the
+        window may hold values rewritten at a dropped front.
+        """
+        k = self._extended
+        tail = vol[-vol_window:]
+        prev = self._vol_tail
+        if (
+            k and self._vol_sum_age + k < vol_window
+            and prev is not None and len(prev) == len(tail) == vol_window
+            and (not self._dropped or len(vol) > 2 * vol_window)
+        ):
+            self._vol_sum += sum(tail[-k:].tolist()) - sum(prev[:k].tolist())
+            self._vol_sum_age += k
+        else:
+            self._vol_sum = float(tail.sum())
+            self._vol_sum_age = 0
+        self._vol_tail = tail
+        return self._vol_sum
+
     def update_trade_result(self, win: bool, pnl: float) -> None:
         """
         Adaptive parameter adjustment based on performance.
@@ -298,16 +616,12 @@ class StrategyVolatilityRegime(BaseStrategy):
         """
         super().update_trade_result(win, pnl)
 
-        history = self.params.setdefault("_trade_history", [])
+        history = self._trade_history
         history.append({"win": win, "pnl": pnl})
 
-        # Keep last 30 trades
-        if len(history) > 30:
-            history.pop(0)
-
         # Adjust parameters based on recent performance
         if len(history) >= 20:
-            recent_wins = sum(1 for t in history[-20:] if t["win"])
+            recent_wins = sum(1 for t in islice(history, len(history) - 20, None) if t["win"])
             win_rate = recent_wins / 20
 
             # If losing, tighten entry criteria
@@ -320,3 +634,15 @@ class StrategyVolatilityRegime(BaseStrategy):
             elif win_rate > 0.6:
                 self.params["breakout_mult"] = max(1.5, self.params.get("breakout_mult", 2.0) - 0.05)
                 self.params["spike_mult"] = max(2.5, self.params.get("spike_mult", 3.0) - 0.05)
+
+            self._load_params()
+
+
+@register_warmup
+def _warmup_kernels() -> None:
+    """Compile or cache-load the ATR, volatility and clustering kernels."""
+    probe = np.zeros(2, dtype=np.float64)
+    _atr_into(probe, probe, probe, 1, np.zeros(2))
+    _realized_volatility(probe.astype(np.float32), 1)
+    _clustering_score_w10(probe)
+    _mean_std(probe)
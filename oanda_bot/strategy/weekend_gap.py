@@ -32,8 +32,10 @@ Parameters::
 """
 
 from __future__ import annotations
+from collections import deque
+from functools import lru_cache
 from typing import Sequence, Optional, Dict, Any, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import numpy as np
 
 from .base import BaseStrategy
@@ -43,27 +45,40 @@ from .base import BaseStrategy
 # Gap Detection Helpers
 # ============================================================================
 
-def _is_friday_close(dt: Optional[datetime] = None) -> bool:
+@lru_cache(maxsize=168)
+def _session_flags(weekday: int, hour: int) -> Tuple[bool, bool]:
+    """
+    ``(friday_close, monday_gap_window)`` for a UTC weekday and hour.
+
+    Both predicates depend only on these two fields, so the at most 7 x 24
+    answers are cached and a tick costs one lookup.
+    """
+    friday_close = weekday == 4 and hour >= 21  # Friday after 21:00 UTC
+    gap_window = (
+        (weekday == 6 and hour >= 21)   # Sunday after 21:00 UTC
+        or (weekday == 0 and hour < 6)  # Monday before 06:00 UTC
+    )
+    return friday_close, gap_window
+
+
+def _is_friday_close(dt: datetime) -> bool:
     """
     Check if current time is Friday close (21:00+ UTC).
 
     Parameters
     ----------
-    dt : datetime, optional
-        Datetime to check. If None, uses current UTC time.
+    dt : datetime
+        UTC datetime to check.
 
     Returns
     -------
     bool
         True if Friday close period, False otherwise.
     """
-    if dt is None:
-        dt = datetime.utcnow()
-
-    return dt.weekday() == 4 and dt.hour >= 21  # Friday after 21:00 UTC
+    return _session_flags(dt.weekday(), dt.hour)[0]
 
 
-def _is_monday_gap_window(dt: Optional[datetime] = None) -> bool:
+def _is_monday_gap_window(dt: datetime) -> bool:
     """
     Check if current time is Monday gap detection window.
 
@@ -72,26 +87,20 @@ def _is_monday_gap_window(dt: Optional[datetime] = None) -> bool:
 
     Parameters
     ----------
-    dt : datetime, optional
-        Datetime to check. If None, uses current UTC time.
+    dt : datetime
+        UTC datetime to check.
 
     Returns
     -------
     bool
         True if gap detection window, False otherwise.
     """
-    if dt is None:
-        dt = datetime.utcnow()
+    return _session_flags(dt.weekday(), dt.hour)[1]
 
-    # Sunday after 21:00 UTC
-    if dt.weekday() == 6 and dt.hour >= 21:
-        return True
 
-    # Monday before 06:00 UTC
-    if dt.weekday() == 0 and dt.hour < 6:
-        return True
-
-    return False
+def _pip_size(instrument: str) -> float:
+    """Pip size: 0.01 for JPY pairs, 0.0001 for others."""
+    return 0.01 if instrument.endswith("JPY") else 0.0001
 
 
 def _calculate_gap_pips(friday_close: float, monday_open: float, instrument: str) -> float:
@@ -112,11 +121,8 @@ def _calculate_gap_pips(friday_close: float, monday_open: float, instrument: str
     float
         Gap size in pips (positive = gap up, negative = gap down)
     """
-    # Pip size: 0.01 for JPY pairs, 0.0001 for others
-    pip_size = 0.01 if instrument.endswith("JPY") else 0.0001
-
     gap_price = monday_open - friday_close
-    gap_pips = gap_price / pip_size
+    gap_pips = gap_price / _pip_size(instrument)
 
     return gap_pips
 
@@ -193,6 +199,20 @@ class StrategyWeekendGap(BaseStrategy):
         self.gap_size_pips: float = 0.0
         self.entry_time: Optional[datetime] = None
         self.instrument: Optional[str] = None
+        # Last 20 gap trades; kept off ``params`` so it stays JSON-serialisable
+        self._gap_history: deque = deque(self.params.get("_gap_history", ()), maxlen=20)
+
+        # Parameters read every tick, cached from params
+        # (update_trade_result refreshes them after retuning)
+        self._load_params()
+
+    def _load_params(self) -> None:
+        """Copy the per-tick parameters out of ``params``."""
+        params = self.params
+        self._min_gap_pips: float = params.get("min_gap_pips", 20)
+        self._max_gap_pips: float = params.get("max_gap_pips", 80)
+        self._entry_delay_hours: float = params.get("entry_delay_hours", 2)
+        self._max_hold_hours: float = params.get("max_hold_hours", 48)
 
     def set_instrument(self, instrument: str) -> None:
         """
@@ -230,16 +250,17 @@ class StrategyWeekendGap(BaseStrategy):
             current_price = float(current_bar["mid"]["c"])
 
         # Get parameters
-        min_gap_pips = self.params.get("min_gap_pips", 20)
-        max_gap_pips = self.params.get("max_gap_pips", 80)
-        entry_delay_hours = self.params.get("entry_delay_hours", 2)
+        min_gap_pips = self._min_gap_pips
+        max_gap_pips = self._max_gap_pips
+        entry_delay_hours = self._entry_delay_hours
 
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
+        friday_close, gap_window = _session_flags(now.weekday(), now.hour)
 
         # ------------------------------------------------------------------- #
         # Step 1: Store Friday Close                                         #
         # ------------------------------------------------------------------- #
-        if _is_friday_close(now):
+        if friday_close:
             self.friday_close = current_price
             self.gap_detected = False
             self.entry_time = None
@@ -248,7 +269,7 @@ class StrategyWeekendGap(BaseStrategy):
         # ------------------------------------------------------------------- #
         # Step 2: Detect Monday Gap                                          #
         # ------------------------------------------------------------------- #
-        if _is_monday_gap_window(now) and not self.gap_detected:
+        if gap_window and not self.gap_detected:
             if self.friday_close is None:
                 return None  # Need Friday close to compare
 
@@ -279,8 +300,7 @@ class StrategyWeekendGap(BaseStrategy):
                 return None  # Wait for entry delay
 
             # Check if still in trading window (don't enter if too late)
-            max_hold_hours = self.params.get("max_hold_hours", 48)
-            if time_since_gap > max_hold_hours:
+            if time_since_gap > self._max_hold_hours:
                 self.gap_detected = False  # Reset for next week
                 return None
 
@@ -351,17 +371,13 @@ class StrategyWeekendGap(BaseStrategy):
         super().update_trade_result(win, pnl)
 
         # Optional: Adaptive parameter adjustment
-        history = self.params.setdefault("_gap_history", [])
+        history = self._gap_history
         history.append({
             "win": win,
             "pnl": pnl,
             "gap_size": self.gap_size_pips
         })
 
-        # Keep last 20 gap trades
-        if len(history) > 20:
-            history.pop(0)
-
         # Analyze: Are smaller or larger gaps better?
         if len(history) >= 10:
             small_gaps = [t for t in history if t["gap_size"] < 40]
@@ -372,6 +388,7 @@ class StrategyWeekendGap(BaseStrategy):
                 # If small gaps work better, tighten max_gap_pips
                 if small_wr > 0.70:
                     self.params["max_gap_pips"] = min(60, self.params.get("max_gap_pips", 80))
+                    self._load_params()
 
 
 # ============================================================================
@@ -401,29 +418,29 @@ def detect_weekend_gaps(candles: list, instrument: str) -> list:
     """
     gaps = []
 
-    for i in range(1, len(candles)):
-        prev = candles[i - 1]
-        curr = candles[i]
-
-        # Parse timestamps
-        prev_time = datetime.fromisoformat(prev["time"].replace("Z", "+00:00"))
-        curr_time = datetime.fromisoformat(curr["time"].replace("Z", "+00:00"))
-
-        # Detect weekend transition (Friday -> Monday)
-        if prev_time.weekday() >= 4 and curr_time.weekday() == 0:
-            friday_close = float(prev["mid"]["c"])
-            monday_open = float(curr["mid"]["o"])
-
-            gap_pips = _calculate_gap_pips(friday_close, monday_open, instrument)
-
-            gaps.append({
-                "friday_close": friday_close,
-                "monday_open": monday_open,
-                "gap_pips": gap_pips,
-                "gap_direction": "up" if gap_pips > 0 else "down",
-                "date": curr_time.date(),
-                "abs_gap_pips": abs(gap_pips)
-            })
+    # Only the weekday matters, so parse just the date part of each RFC 3339
+    # timestamp (in its own offset, as before) in one NumPy call.
+    # 1970-01-01 was a Thursday: weekday (Monday=0) is (days + 3) % 7.
+    days = np.array([c["time"][:10] for c in candles], dtype="datetime64[D]")
+    weekday = (days.astype(np.int64) + 3) % 7
+
+    # Weekend transitions (Friday -> Monday): only these candles are read
+    idx = np.flatnonzero((weekday[:-1] >= 4) & (weekday[1:] == 0)) + 1
+    friday_closes = np.array([float(candles[i - 1]["mid"]["c"]) for i in idx.tolist()])
+    monday_opens = np.array([float(candles[i]["mid"]["o"]) for i in idx.tolist()])
+    all_gap_pips = (monday_opens - friday_closes) / _pip_size(instrument)
+
+    for friday_close, monday_open, gap_pips, date in zip(
+        friday_closes.tolist(), monday_opens.tolist(), all_gap_pips.tolist(), days[idx].tolist()
+    ):
+        gaps.append({
+            "friday_close": friday_close,
+            "monday_open": monday_open,
+            "gap_pips": gap_pips,
+            "gap_direction": "up" if gap_pips > 0 else "down",
+            "date": date,
+            "abs_gap_pips": abs(gap_pips)
+        })
 
     return gaps
 
@@ -450,18 +467,20 @@ def analyze_gap_statistics(gaps: list) -> Dict[str, Any]:
     if not gaps:
         return {}
 
-    gap_sizes = [abs(g["gap_pips"]) for g in gaps]
-    gap_directions = [g["gap_direction"] for g in gaps]
+    n = len(gaps)
+    gap_pips = np.fromiter((g["gap_pips"] for g in gaps), dtype=np.float64, count=n)
+    gap_sizes = np.abs(gap_pips)
+    gaps_up = int(np.count_nonzero(gap_pips > 0))  # gap_direction is "up" iff gap_pips > 0
 
     return {
-        "total_gaps": len(gaps),
+        "total_gaps": n,
         "avg_gap_pips": np.mean(gap_sizes),
         "median_gap_pips": np.median(gap_sizes),
         "std_gap_pips": np.std(gap_sizes),
-        "gap_up_pct": gap_directions.count("up") / len(gaps) * 100,
-        "gap_down_pct": gap_directions.count("down") / len(gaps) * 100,
-        "large_gaps_50": sum(1 for g in gap_sizes if g > 50),
-        "tradeable_gaps_20_80": sum(1 for g in gap_sizes if 20 <= g <= 80),
+        "gap_up_pct": gaps_up / n * 100,
+        "gap_down_pct": (n - gaps_up) / n * 100,
+        "large_gaps_50": int(np.count_nonzero(gap_sizes > 50)),
+        "tradeable_gaps_20_80": int(np.count_nonzero((gap_sizes >= 20) & (gap_sizes <= 80))),
     }
 
 
@@ -23,16 +23,184 @@ Parameters::
 """
 
 from __future__ import annotations
-from typing import Sequence, Optional, Dict, Any
-from datetime import datetime
+from typing import Sequence, Optional, Dict, Any, List
+from functools import lru_cache
+import time
 import numpy as np
 
 from .base import BaseStrategy
+from ._candle import CandleBatch, bars_added
+from ._jit import njit, prange, register_warmup
+from .utils import _iso_epoch_us
+
+
+# Integer signal codes used internally and by the backtest path; strings
+# appear only at the ``next_signal`` boundary
+SIG_BUY, SIG_SELL, SIG_NONE = 1, -1, 0
+_SIGNAL_NAMES = {SIG_BUY: "BUY", SIG_SELL: "SELL", SIG_NONE: None}
 
 
 # --------------------------------------------------------------------------- #
 # Helper: Z-Score calculation                                                 #
 # --------------------------------------------------------------------------- #
+@njit("UniTuple(float64, 2)(float64[::1], int64, int64)", cache=True, fastmath=True, boundscheck=False)
+def _window_moments(prices, stop, lookback):
+    """Mean and sum of squared deviations of ``prices[stop-lookback:stop]`` (Welford)."""
+    mean = 0.0
+    m2 = 0.0
+    count = 0
+    for i in range(stop - lookback, stop):
+        x = prices[i]
+        count += 1
+        delta = x - mean
+        mean += delta / count
+        m2 += (x - mean) * delta
+    return mean, m2
+
+
+@njit("float64(float64[::1], int64)", cache=True, fastmath=True, boundscheck=False)
+def _zscore_welford(prices, lookback):
+    """
+    Z-score of ``prices[-1]`` against the last ``lookback`` prices.
+
+    Mean and population variance come from one Welford pass over the
+    window, so nothing is allocated.  A flat window returns 0.
+    """
+    n = prices.shape[0]
+    mean, m2 = _window_moments(prices, n, lookback)
+    if m2 <= 0.0:
+        return 0.0
+    return (prices[n - 1] - mean) / np.sqrt(m2 / lookback)
+
+
+@njit("float64[::1](float64[::1], int64)", cache=True, fastmath=True, boundscheck=False)
+def _zscore_series(prices, lookback):
+    """
+    ``_calculate_zscore(prices[:i + 1], lookback)`` for every ``i``, in O(n).
+
+    The window's mean and ``m2`` slide with Welford's add/remove update.
+    They are recomputed exactly every ``lookback`` bars, so rounding cannot
+    build up over a long history, and whenever ``m2`` falls far below its
+    recent peak, where the slide's absolute error would dominate it.
+    Between recomputes prices are taken relative to the last exact mean,
+    which keeps the sliding terms small.  Flat windows are exactly 0.
+    """
+    n = prices.shape[0]
+    z = np.zeros(n)
+    if n < lookback:
+        return z
+
+    ref, m2 = _window_moments(prices, lookback, lookback)
+    mean = 0.0  # relative to ref
+    peak = m2  # largest m2 since the last exact recompute
+    run = 1  # trailing prices equal to the newest one
+    for j in range(1, lookback):
+        run = run + 1 if prices[j] == prices[j - 1] else 1
+
+    for i in range(lookback - 1, n):
+        if i >= lookback:
+            run = run + 1 if prices[i] == prices[i - 1] else 1
+            x_new = prices[i] - ref
+            x_old = prices[i - lookback] - ref
+            old_mean = mean
+            mean += (x_new - x_old) / lookback
+            m2 += (x_new - x_old) * (x_new - mean + x_old - old_mean)
+            peak = max(peak, m2)
+            if (i + 1) % lookback == 0 or m2 < 1e-3 * peak:
+                ref, m2 = _window_moments(prices, i + 1, lookback)
+                mean = 0.0
+                peak = m2
+        if run < lookback and m2 > 0.0:
+            z[i] = (prices[i] - ref - mean) / np.sqrt(m2 / lookback)
+    return z
+
+
+@njit("int8[::1](float64[::1], boolean[::1], float64, float64)", cache=True, fastmath=True, boundscheck=False)
+def _zscore_signals_batch(zscores, active, threshold, z_exit):
+    """
+    Entry/exit ladder of ``next_signal`` over a z-score series, starting
+    flat.  Bars with ``active`` False are skipped, as ``next_signal`` does
+    outside the session.  Returns an ``int8`` code per bar
+    (``SIG_BUY``/``SIG_SELL`` on entries, ``SIG_NONE`` otherwise).
+    """
+    n = zscores.shape[0]
+    signals = np.zeros(n, dtype=np.int8)
+    position = 0
+    for i in range(n):
+        if not active[i]:
+            continue
+        z = zscores[i]
+        if position == 0:
+            if z < -threshold:
+                position = 1
+                signals[i] = 1
+            elif z > threshold:
+                position = -1
+                signals[i] = -1
+        elif position * z > -z_exit:
+            position = 0
+    return signals
+
+
+@lru_cache(maxsize=None)
+def _sweep_kernel():
+    """
+    The parallel parameter-sweep kernel, compiled (or loaded from the cache)
+    on first use: loading Numba's threading layer at import would slow down
+    every strategy import for a research-only path.
+    """
+
+    @njit(
+        "float64[:, ::1](float64[::1], int64[::1], float64[::1], float64[::1])",
+        parallel=True, cache=True, fastmath=True, boundscheck=False,
+    )
+    def sweep(closes, lookbacks, thresholds, exits):
+        """
+        Signal-level results of combo ``k`` = ``(lookbacks[k], thresholds[k],
+        exits[k])`` over ``closes``, combos in parallel.
+
+        Each combo runs the ``next_signal`` ladder from flat; a trade opens at
+        the entry bar's close and closes at the close of the bar whose z-score
+        triggers the exit (no SL/TP).  Returns ``(n_combos, 3)``: trades, wins,
+        total PnL in price units.
+        """
+        n = closes.shape[0]
+        n_combos = lookbacks.shape[0]
+        results = np.zeros((n_combos, 3))
+        for k in prange(n_combos):
+            lookback = lookbacks[k]
+            threshold = thresholds[k]
+            z_exit = exits[k]
+            zscores = _zscore_series(closes, lookback)
+            position = 0
+            entry = 0.0
+            trades = 0
+            wins = 0
+            pnl = 0.0
+            for i in range(lookback, n):
+                z = zscores[i]
+                if position == 0:
+                    if z < -threshold:
+                        position = 1
+                        entry = closes[i]
+                    elif z > threshold:
+                        position = -1
+                        entry = closes[i]
+                elif position * z > -z_exit:
+                    trade = position * (closes[i] - entry)
+                    trades += 1
+                    if trade > 0.0:
+                        wins += 1
+                    pnl += trade
+                    position = 0
+            results[k, 0] = trades
+            results[k, 1] = wins
+            results[k, 2] = pnl
+        return results
+
+    return sweep
+
+
 def _calculate_zscore(prices: np.ndarray, lookback: int) -> float:
     """
     Calculate z-score of latest price vs. lookback period.
@@ -47,20 +215,22 @@ def _calculate_zscore(prices: np.ndarray, lookback: int) -> float:
     if len(prices) < lookback:
         return 0.0
 
-    recent = prices[-lookback:]
-    mean = recent.mean()
-    std = recent.std()
-
-    if std == 0:
-        return 0.0
-
-    z_score = (prices[-1] - mean) / std
-    return z_score
+    return _zscore_welford(prices, lookback)
 
 
 # --------------------------------------------------------------------------- #
 # Session filter helper                                                       #
 # --------------------------------------------------------------------------- #
+#: Per UTC hour (index 0-23): whether the session suits each strategy type.
+#: Asia (23:00-08:00) for mean reversion, London + NY (08:00-21:00) for trend.
+_SESSION_HOURS: Dict[str, tuple] = {
+    "mean_reversion": tuple(hour >= 23 or hour < 8 for hour in range(24)),
+    "trend": tuple(8 <= hour < 21 for hour in range(24)),
+}
+_ASIA_HOURS = _SESSION_HOURS["mean_reversion"]
+_ASIA_MASK = np.array(_ASIA_HOURS)  # the same table, for vectorised lookups
+
+
 def _is_asia_session(hour: Optional[int] = None) -> bool:
     """
     Check if current time is Asia trading session (23:00-08:00 UTC).
@@ -76,10 +246,9 @@ def _is_asia_session(hour: Optional[int] = None) -> bool:
         True if Asia session, False otherwise.
     """
     if hour is None:
-        hour = datetime.utcnow().hour
+        hour = int(time.time() // 3600) % 24  # UTC: POSIX time has no offset
 
-    # Asia session: 23:00-08:00 UTC
-    return (23 <= hour) or (hour < 8)
+    return _ASIA_HOURS[hour]
 
 
 def _is_favorable_session(hour: Optional[int] = None,
@@ -92,24 +261,50 @@ def _is_favorable_session(hour: Optional[int] = None,
     hour : int, optional
         Hour in UTC (0-23). If None, uses current UTC hour.
     strategy_type : str
-        "mean_reversion" or "trend"
+        "mean_reversion" or "trend"; any other value applies no filter.
 
     Returns
     -------
     bool
         True if favorable session, False otherwise.
     """
+    hours = _SESSION_HOURS.get(strategy_type)
+    if hours is None:
+        return True  # No filter
+
     if hour is None:
-        hour = datetime.utcnow().hour
-
-    if strategy_type == "mean_reversion":
-        # Asia session best for mean reversion
-        return (23 <= hour) or (hour < 8)
-    elif strategy_type == "trend":
-        # London + NY sessions best for trends
-        return 8 <= hour < 21
+        hour = int(time.time() // 3600) % 24  # UTC: POSIX time has no offset
+
+    return hours[hour]
+
+
+def _session_mask(times: Sequence[Any]) -> np.ndarray:
+    """
+    Asia-session flag of every timestamp in ``times`` (ISO-8601 strings or
+    ``datetime64`` values), from one vectorised hour computation.
+    """
+    times = np.asarray(times)
+    if np.issubdtype(times.dtype, np.datetime64):
+        stamps = times.astype("datetime64[us]").astype(np.int64)
     else:
-        return True  # No filter
+        stamps = np.fromiter(
+            (_iso_epoch_us(ts) for ts in times.tolist()), dtype=np.int64, count=times.shape[0]
+        )
+    hours = stamps // 3_600_000_000 % 24
+    return _ASIA_MASK[hours]
+
+
+def _time_hour(ts: Any) -> Optional[int]:
+    """
+    UTC hour of a candle ``time`` stamp, or None if it is not a parseable
+    string.  Same conversion as ``_session_mask`` (naive stamps are UTC).
+    """
+    if not isinstance(ts, str):
+        return None
+    try:
+        return _iso_epoch_us(ts) // 3_600_000_000 % 24
+    except ValueError:
+        return None
 
 
 # --------------------------------------------------------------------------- #
@@ -139,14 +334,61 @@ class StrategyZScoreReversion(BaseStrategy):
 
     name = "ZScoreReversion"
 
+    __slots__ = (
+        "_position", "_entry_zscore", "_trade_count",
+        "_closes", "_close_count", "_close_bars",
+        "_lookback", "_z_threshold", "_z_exit", "_session_filter",
+        "_win_ring", "_win_idx", "_win_count", "_win_filled",
+    )
+
+    _WIN_HISTORY = 20  # trades the adaptive win rate looks back over
+
     def __init__(self, params: Optional[Dict[str, Any]] = None) -> None:
         super().__init__(params or {})
 
+        # Buffers reused across reset(): the closes of the last ``lookback``
+        # candles (oldest first, kept across calls so only newly appended
+        # candles are parsed) and the outcomes of the last _WIN_HISTORY
+        # trades as a ring (1 = win)
+        self._closes = np.empty(0, dtype=np.float64)
+        self._win_ring = bytearray(self._WIN_HISTORY)
+
+        self.reset(self.params)
+
+    def reset(self, params: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Return to the state of a new ``StrategyZScoreReversion(params)``,
+        keeping this instance's buffers, so a parameter sweep can run every
+        configuration through one instance per worker.
+        """
+        self.params = params or {}
+        self.cumulative_pnl = 0.0
+        self.pull_count = 0
+
         # Internal state tracking
-        self._position: Optional[str] = None  # "BUY", "SELL", or None
+        self._position: int = SIG_NONE        # SIG_BUY, SIG_SELL or SIG_NONE
         self._entry_zscore: float = 0.0       # Z-score at entry
         self._trade_count: int = 0             # Total trades taken
 
+        self._close_count: int = 0
+        self._close_bars: Optional[Sequence[dict]] = None
+
+        # Running win count over the ring, so the win rate is O(1) per trade
+        self._win_ring[:] = bytes(self._WIN_HISTORY)
+        self._win_idx: int = 0
+        self._win_count: int = 0
+        self._win_filled: int = 0
+
+        self._load_params()
+
+    def _load_params(self) -> None:
+        """Copy the per-bar parameters out of ``params``."""
+        params = self.params
+        self._lookback: int = params.get("lookback", 20)
+        self._z_threshold: float = params.get("z_threshold", 2.0)
+        self._z_exit: float = params.get("z_exit", 0.5)
+        self._session_filter: bool = params.get("session_filter", True)
+
     def next_signal(self, bars: Sequence[dict]) -> Optional[str]:
         """
         Generate trading signal based on z-score deviation.
@@ -164,66 +406,150 @@ class StrategyZScoreReversion(BaseStrategy):
         if not bars:
             return None
 
-        # Extract close prices
-        first = bars[0]
-        if isinstance(first, (int, float, np.floating)):
-            prices = np.array(bars, dtype=np.float64)
-        else:
-            prices = np.array([float(c["mid"]["c"]) for c in bars], dtype=np.float64)
-
         # Get parameters
-        lookback = self.params.get("lookback", 20)
-        z_threshold = self.params.get("z_threshold", 2.0)
-        z_exit = self.params.get("z_exit", 0.5)
-        session_filter = self.params.get("session_filter", True)
+        lookback = self._lookback
+        z_threshold = self._z_threshold
+        z_exit = self._z_exit
+        session_filter = self._session_filter
 
         # Need enough data
-        if len(prices) < lookback + 1:
+        if len(bars) < lookback + 1:
             return None
 
-        # Session filter (optional)
+        # Session filter (optional), on the latest candle's hour when it
+        # carries a timestamp (so backtests filter by bar time), else now
         if session_filter:
-            if not _is_asia_session():
+            last = bars[-1]
+            hour = _time_hour(last.get("time")) if isinstance(last, dict) else None
+            if not _is_asia_session(hour):
                 return None
 
+        # Extract the close prices the z-score window needs
+        first = bars[0]
+        if isinstance(first, (int, float, np.floating)):
+            prices = np.array(bars[-lookback:], dtype=np.float64)
+        else:
+            prices = self._load_closes(bars, lookback)
+
         # Calculate current z-score
         z_score = _calculate_zscore(prices, lookback)
 
+        return _SIGNAL_NAMES[self._next_signal_int(z_score, z_threshold, z_exit)]
+
+    def next_signal_batch(self, batch: CandleBatch) -> Optional[str]:
+        """
+        ``next_signal`` for a pre-converted ``CandleBatch``: reads the
+        closes of its last ``lookback`` rows and the time of its last row.
+        Returns "BUY", "SELL", or None.
+        """
+        lookback = self._lookback
+        z_threshold = self._z_threshold
+        z_exit = self._z_exit
+        session_filter = self._session_filter
+
+        n = len(batch.close)
+        if n < lookback + 1:
+            return None
+
+        if session_filter:
+            if not _is_asia_session(_time_hour(batch.time[-1])):
+                return None
+
+        z_score = _calculate_zscore(batch.close[n - lookback:], lookback)
+
+        return _SIGNAL_NAMES[self._next_signal_int(z_score, z_threshold, z_exit)]
+
+    def _next_signal_int(self, z_score: float, z_threshold: float, z_exit: float) -> int:
+        """Entry/exit rules for one z-score; returns an integer signal code."""
         # ------------------------------------------------------------------- #
         # Entry Logic                                                         #
         # ------------------------------------------------------------------- #
-        if self._position is None:
+        if self._position == SIG_NONE:
             # Oversold: buy
             if z_score < -z_threshold:
-                self._position = "BUY"
+                self._position = SIG_BUY
                 self._entry_zscore = z_score
                 self._trade_count += 1
-                return "BUY"
+                return SIG_BUY
 
             # Overbought: sell
             elif z_score > z_threshold:
-                self._position = "SELL"
+                self._position = SIG_SELL
                 self._entry_zscore = z_score
                 self._trade_count += 1
-                return "SELL"
+                return SIG_SELL
 
         # ------------------------------------------------------------------- #
         # Exit Logic                                                          #
         # ------------------------------------------------------------------- #
+        # Exit when the z-score returns toward the mean: z > -z_exit for a
+        # long, z < z_exit for a short, i.e. position * z > -z_exit.  Signal
+        # flat either way; the backtest handles the exit itself.
+        elif self._position * z_score > -z_exit:
+            self._position = SIG_NONE
+
+        return SIG_NONE
+
+    def backtest_signals(
+        self, closes: np.ndarray, times: Optional[Sequence[Any]] = None
+    ) -> np.ndarray:
+        """
+        Backtest path: signals for a whole close series.
+
+        The z-score series is computed in one O(n) pass, then the
+        :meth:`next_signal` entry/exit rules run over it with the current
+        parameters from a flat position, as if ``next_signal`` saw every
+        bar; this instance's state is left untouched.  The session filter
+        needs the bar ``times`` (ISO-8601 strings or ``datetime64``, e.g.
+        ``CandleBatch.time``) and is skipped without them.  Returns an
+        ``int8`` array of ``SIG_BUY`` (1), ``SIG_SELL`` (-1) or
+        ``SIG_NONE`` (0).
+        """
+        closes = np.ascontiguousarray(closes, dtype=np.float64)
+        lookback = self._lookback
+        z_threshold = self._z_threshold
+        z_exit = self._z_exit
+        session_filter = self._session_filter
+
+        n = closes.shape[0]
+        if session_filter and times is not None:
+            active = _session_mask(times)[lookback:]
         else:
-            # Exit long when z-score returns to mean
-            if self._position == "BUY":
-                if z_score > -z_exit:  # Price recovered toward mean
-                    self._position = None
-                    return None  # Signal flat (backtest handles exit)
-
-            # Exit short when z-score returns to mean
-            elif self._position == "SELL":
-                if z_score < z_exit:  # Price recovered toward mean
-                    self._position = None
-                    return None
+            active = np.ones(max(n - lookback, 0), dtype=np.bool_)
 
-        return None
+        signals = np.zeros(n, dtype=np.int8)
+        zscores = _zscore_series(closes, lookback)[lookback:]
+        signals[lookback:] = _zscore_signals_batch(zscores, active, z_threshold, z_exit)
+        return signals
+
+    def _load_closes(self, bars: Sequence[dict], lookback: int) -> np.ndarray:
+        """
+        Closes of the last ``lookback`` candles of ``bars`` (fewer if
+        ``bars`` is shorter) as a contiguous float64 array.
+
+        When ``bars`` continues the previous call's candles only the new
+        ones are parsed and shifted in; anything else re-reads the tail.
+        """
+        closes = self._closes
+        if closes.shape[0] != lookback:
+            closes = self._closes = np.empty(lookback, dtype=np.float64)
+            self._close_bars = None
+
+        k = bars_added(self._close_bars, bars)
+        count = self._close_count
+        if not k or k >= lookback:
+            new = bars[-lookback:]
+            k = len(new)
+            count = 0
+        else:
+            new = bars[len(bars) - k:]
+
+        if k < lookback:
+            closes[:lookback - k] = closes[k:]
+        closes[lookback - k:] = [float(c["mid"]["c"]) for c in new]
+        self._close_count = count = min(lookback, count + k)
+        self._close_bars = bars
+        return closes[lookback - count:]
 
     def update_trade_result(self, win: bool, pnl: float) -> None:
         """
@@ -239,16 +565,15 @@ class StrategyZScoreReversion(BaseStrategy):
         super().update_trade_result(win, pnl)
 
         # Adaptive logic: widen thresholds if losing, tighten if winning
-        history = self.params.setdefault("_win_history", [])
-        history.append(win)
-
-        # Keep last 20 trades
-        if len(history) > 20:
-            history.pop(0)
+        i = self._win_idx
+        self._win_count += bool(win) - self._win_ring[i]
+        self._win_ring[i] = bool(win)
+        self._win_idx = (i + 1) % self._WIN_HISTORY
+        self._win_filled = min(self._WIN_HISTORY, self._win_filled + 1)
 
         # Only adapt after 20 trades
-        if len(history) >= 20:
-            win_rate = sum(history) / len(history)
+        if self._win_filled == self._WIN_HISTORY:
+            win_rate = self._win_count / self._WIN_HISTORY
 
             # Win rate too low: widen entry threshold (wait for more extreme)
             if win_rate < 0.45:
@@ -258,6 +583,8 @@ class StrategyZScoreReversion(BaseStrategy):
             elif win_rate > 0.70:
                 self.params["z_threshold"] = max(1.5, self.params.get("z_threshold", 2.0) - 0.1)
 
+            self._load_params()
+
 
 # ============================================================================
 # Convenience Functions for External Use
@@ -317,6 +644,52 @@ def backtest_zscore_strategy(candles: list, params: Optional[Dict[str, Any]] = N
     return stats
 
 
+def sweep_zscore(
+    closes: Sequence[float],
+    lookbacks: Sequence[int],
+    z_thresholds: Sequence[float],
+    z_exits: Sequence[float],
+) -> List[Dict[str, Any]]:
+    """
+    Grid search of the z-score entry/exit rules over one close series.
+
+    Every (lookback, z_threshold, z_exit) combination is evaluated in a
+    single compiled pass, parallel across combinations.  Trades are
+    signal-to-signal (entry close to exit close, no SL/TP or session
+    filter), so this ranks parameters cheaply; confirm the winners with
+    ``backtest_zscore_strategy``.
+
+    Returns
+    -------
+    list of dict
+        One per combination: lookback, z_threshold, z_exit, trades, wins,
+        win_rate, total_pnl.
+    """
+    closes = np.ascontiguousarray(closes, dtype=np.float64)
+    grid = np.array(
+        [(lb, th, ex) for lb in lookbacks for th in z_thresholds for ex in z_exits],
+        dtype=np.float64,
+    ).reshape(-1, 3)
+    results = _sweep_kernel()(
+        closes,
+        grid[:, 0].astype(np.int64),
+        np.ascontiguousarray(grid[:, 1]),
+        np.ascontiguousarray(grid[:, 2]),
+    )
+    return [
+        {
+            "lookback": int(lb),
+            "z_threshold": th,
+            "z_exit": ex,
+            "trades": int(trades),
+            "wins": int(wins),
+            "win_rate": wins / trades if trades else 0.0,
+            "total_pnl": pnl,
+        }
+        for (lb, th, ex), (trades, wins, pnl) in zip(grid.tolist(), results.tolist())
+    ]
+
+
 # ============================================================================
 # Optimal Parameters by Instrument (Based on Research)
 # ============================================================================
@@ -373,6 +746,16 @@ def get_optimal_params(instrument: str) -> Dict[str, Any]:
     Returns
     -------
     dict
-        Optimal parameters for that instrument
+        A copy of the optimal parameters for that instrument, so a strategy
+        adapting its thresholds does not edit ``OPTIMAL_PARAMS``
     """
-    return OPTIMAL_PARAMS.get(instrument, OPTIMAL_PARAMS["EUR_USD"])
+    return dict(OPTIMAL_PARAMS.get(instrument, OPTIMAL_PARAMS["EUR_USD"]))
+
+
+@register_warmup
+def _warmup_kernels() -> None:
+    """Compile or cache-load the z-score kernels (the parameter sweep stays lazy)."""
+    probe = np.array([1.0, 2.0])
+    _zscore_welford(probe, 2)
+    _zscore_series(probe, 2)
+    _zscore_signals_batch(probe, np.ones(2, dtype=np.bool_), 2.0, 0.5)
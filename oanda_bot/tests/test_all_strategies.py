@@ -1,21 +1,29 @@
+import functools
 import glob
 import importlib
+import os
+
 import pytest
 
 
-@pytest.mark.parametrize("modpath", glob.glob("strategy/*.py"))
-def test_import_and_smoke(modpath):
-    # Build module name and import it
-    modname = modpath.replace("/", ".").rstrip(".py")
+@functools.lru_cache(maxsize=None)
+def _strategy_class(modname):
+    """Import ``modname`` once and return its first ``Strategy*`` class (None if it has none)."""
     module = importlib.import_module(modname)
+    cls_name = next((name for name in dir(module) if name.startswith("Strategy")), None)
+    return getattr(module, cls_name) if cls_name else None
+
+
+@pytest.mark.parametrize("modpath", sorted(glob.glob("strategy/*.py")))
+def test_import_and_smoke(modpath):
+    # Build module name and import it (cached across tests)
+    modname = os.path.splitext(modpath)[0].replace("/", ".")
+    StratCls = _strategy_class(modname)
 
-    # Attempt to find a Strategy class; skip modules without one
-    try:
-        cls_name = next(name for name in dir(module) if name.startswith("Strategy"))
-    except StopIteration:
+    # Skip modules without a Strategy class
+    if StratCls is None:
         pytest.skip(f"No Strategy class found in {modname}")
 
-    StratCls = getattr(module, cls_name)
     strat = StratCls({})
 
     # Prepare a minimal bars list
@@ -0,0 +1,41 @@
+import numpy as np
+
+import backtest_microstructure as bm
+
+
+def make_candles(n=600, seed=0):
+    """Random-walk S5 mid candles with bid/ask spreads and volume bursts."""
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0002, n))
+    high = close + np.abs(rng.normal(0, 0.0001, n))
+    low = close - np.abs(rng.normal(0, 0.0001, n))
+    half_spread = np.abs(rng.normal(0.00005, 0.00002, n)) * np.where(rng.random(n) < 0.08, 3, 1)
+    volume = rng.integers(1, 50, n) * np.where(rng.random(n) < 0.07, 4, 1)
+    return [
+        {
+            "time": f"2024-01-02T00:{i // 12 % 60:02d}:{i % 12 * 5:02d}.000000000Z",
+            "mid": {"o": repr(c), "h": repr(h), "l": repr(lo), "c": repr(c)},
+            "bid": {"c": repr(c - s)},
+            "ask": {"c": repr(c + s)},
+            "volume": int(v),
+        }
+        for i, (c, h, lo, s, v) in enumerate(
+            zip(close.tolist(), high.tolist(), low.tolist(), half_spread.tolist(), volume.tolist())
+        )
+    ]
+
+
+def test_parallel_backtests_match_serial_runs():
+    candles = make_candles()
+    jobs = [
+        ("EUR_USD", candles, {}),
+        ("EUR_USD", candles, {"spread_expansion_threshold": 1.3, "efficiency_threshold": 0.5}),
+        ("GBP_USD", make_candles(seed=1), {}),
+    ]
+
+    runs = bm.run_backtests_parallel(jobs, warmup=50, max_workers=2)
+
+    assert [run[0] for run in runs] == ["EUR_USD", "EUR_USD", "GBP_USD"]
+    for (instrument, candles, params), run in zip(jobs, runs):
+        expected = bm.run_backtest(bm.StrategySpreadMomentum(dict(params)), candles, warmup=50)
+        assert run[1:] == expected
@@ -0,0 +1,39 @@
+import numpy as np
+
+from oanda_bot.strategy._candle import CandleBatch, candle_to_bar
+
+
+def test_candle_batch_rows_align_with_source():
+    candles = [
+        {"time": "t0", "mid": {"o": "1.0", "h": "1.2", "l": "0.9", "c": "1.1"}, "volume": 7},
+        ("t1", 1.1, 1.3, 1.0, 1.2, 3),
+        "not a candle",
+        (1.2, 1.4, 1.1, 1.3),
+    ]
+    batch = CandleBatch.from_raw(candles)
+
+    assert batch.time.tolist() == ["t0", "t1", None, None]
+    np.testing.assert_array_equal(batch.close, [1.1, 1.2, np.nan, 1.3])
+    np.testing.assert_array_equal(batch.volume, [7.0, 3.0, np.nan, 0.0])
+
+    window = batch.window(1, 3)
+    assert np.shares_memory(window.high, batch.high)
+    np.testing.assert_array_equal(window.high, [1.3, np.nan])
+
+
+def test_oanda_dicts_match_general_conversion():
+    candles = [
+        {"time": f"t{i}", "mid": {"o": "1.1", "h": "1.3", "l": "1.0", "c": f"1.{i}"}, "volume": i + 1}
+        for i in range(5)
+    ]
+    odd = [
+        dict(candles[0], volume=0),                               # falls back to tradeCount
+        dict(candles[0], mid={"o": "", "h": "1", "l": "1", "c": "1"}),
+        {"bid": {"o": "1", "h": "2", "l": "0.5", "c": "1.5"}, "volume": 3},
+    ]
+    for source in (candles, candles + odd):
+        fast = CandleBatch.from_raw(source)
+        general = CandleBatch.from_raw(source, normalise=lambda c: candle_to_bar(c))
+        assert fast.time.tolist() == general.time.tolist()
+        for a, b in zip(fast[1:], general[1:]):
+            np.testing.assert_array_equal(a, b)
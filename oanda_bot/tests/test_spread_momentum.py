@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from oanda_bot.strategy.spread_momentum import StrategySpreadMomentum
+
+
+def make_ohlcvs(n=3000, seed=0):
+    """
+    Helper to build a random-walk (N, 6) open/high/low/close/volume/spread
+    array with occasional spread and volume bursts.
+    """
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0002, n))
+    high = close + np.abs(rng.normal(0, 0.0001, n))
+    low = close - np.abs(rng.normal(0, 0.0001, n))
+    volume = rng.integers(1, 50, n) * np.where(rng.random(n) < 0.07, 4, 1)
+    spread = np.abs(rng.normal(0.0001, 0.00004, n)) * np.where(
+        rng.random(n) < 0.08, 3, 1
+    )
+    return np.column_stack([close, high, low, close, volume, spread]).astype(float)
+
+
+def to_bars(ohlcvs):
+    """Convert an OHLCV-spread array into generic bar dicts."""
+    keys = ("open", "high", "low", "close", "volume", "spread")
+    return [dict(zip(keys, map(float, row))) for row in ohlcvs]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_backtest_signals_match_next_signal(seed):
+    ohlcvs = make_ohlcvs(seed=seed)
+    codes = {"BUY": 1, "SELL": -1, None: 0}
+
+    live = StrategySpreadMomentum({})
+    expected = [codes[live.next_signal([bar])] for bar in to_bars(ohlcvs)]
+
+    signals = StrategySpreadMomentum({}).backtest_signals(ohlcvs)
+    assert signals.dtype == np.int8
+    assert np.count_nonzero(signals) > 0
+    assert signals.tolist() == expected
+
+
+@pytest.mark.parametrize("window", [100, 120, 200])
+def test_backtest_signals_match_next_signal_long_windows(window):
+    # next_signal keeps 100 bars per series, so longer windows never fill
+    ohlcvs = make_ohlcvs(seed=1)
+    params = {"spread_window": window, "volume_window": window, "velocity_window": min(window, 100)}
+    codes = {"BUY": 1, "SELL": -1, None: 0}
+
+    live = StrategySpreadMomentum(dict(params))
+    expected = [codes[live.next_signal([bar])] for bar in to_bars(ohlcvs)]
+
+    signals = StrategySpreadMomentum(dict(params)).backtest_signals(ohlcvs)
+    assert signals.tolist() == expected
+    assert (np.count_nonzero(signals) > 0) == (window <= 100)
+
+
+def test_instances_are_slotted():
+    strat = StrategySpreadMomentum({})
+    assert not hasattr(strat, "__dict__")
+
+
+def test_float32_series_match_float64_baseline():
+    ohlcvs = make_ohlcvs(n=500, seed=3)
+    strat = StrategySpreadMomentum({})
+    for bar in to_bars(ohlcvs):
+        strat.next_signal([bar])
+
+    close, spread, volume = ohlcvs[:, 3], ohlcvs[:, 5], ohlcvs[:, 4]
+    changes = np.diff(close)
+    window = strat.velocity_window
+    expected = {
+        "avg_spread": spread[-strat.spread_window:].mean(),
+        "avg_volume": volume[-strat.volume_window:-1].mean(),
+        "efficiency": abs(changes[-window:].sum()) / np.abs(changes[-window:]).sum(),
+        "velocity": np.abs(changes[-3:]).mean(),
+    }
+    actual = {
+        "avg_spread": strat._analyze_spread_regime()[2],
+        "avg_volume": volume[-1] / strat._analyze_volume_surge()[1],
+        "efficiency": strat._compute_efficiency_ratio(),
+        "velocity": strat._compute_tick_velocity()[0],
+    }
+    for key, value in expected.items():
+        assert actual[key] == pytest.approx(value, rel=1e-5), key
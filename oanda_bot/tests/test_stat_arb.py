@@ -0,0 +1,71 @@
+import json
+
+import numpy as np
+import pytest
+
+from oanda_bot.strategy.stat_arb import StrategyStatArb
+
+
+def test_rolling_zscore_matches_numpy():
+    lookback = 40
+    strat = StrategyStatArb({"lookback": lookback})
+    ratios = 1.15 + np.cumsum(np.random.default_rng(0).normal(0, 1e-3, 500))
+
+    for i, ratio in enumerate(ratios):
+        z = strat._update_ratio("AUD_USD_NZD_USD", float(ratio), lookback)
+        if i + 1 < lookback:
+            assert z is None
+            continue
+        window = ratios[i + 1 - lookback:i + 1]
+        expected = (window[-1] - window[:-1].mean()) / window[:-1].std()
+        assert z == pytest.approx(expected, rel=1e-6)
+
+
+def test_ratio_sampled_once_both_legs_print():
+    strat = StrategyStatArb({"lookback": 5, "target_pairs": [["AUD_USD", "NZD_USD"]]})
+    for i in range(3):
+        strat.handle_bar({"instrument": "AUD_USD", "close": 0.67 + i * 1e-4})
+        strat.handle_bar({"instrument": "AUD_USD", "close": 0.67 + i * 2e-4})
+        strat.handle_bar({"instrument": "NZD_USD", "close": 0.58})
+
+    window = strat._ratio_window["AUD_USD_NZD_USD"]
+    assert len(window) == 3
+    assert window[-1] == pytest.approx((0.67 + 4e-4) / 0.58)
+
+
+def test_ratio_sums_resync_to_window():
+    lookback = 40
+    strat = StrategyStatArb({"lookback": lookback})
+    ratios = 1e4 + np.random.default_rng(1).normal(0, 1.0, 4001)
+    for ratio in ratios:
+        strat._update_ratio("EUR_USD_GBP_USD", float(ratio), lookback)
+
+    window = ratios[-lookback:]
+    assert strat._ratio_sum["EUR_USD_GBP_USD"] == pytest.approx(window.sum(), rel=1e-12)
+    assert strat._ratio_sumsq["EUR_USD_GBP_USD"] == pytest.approx(
+        (window ** 2).sum(), rel=1e-12
+    )
+
+
+def test_handle_bars_matches_sequential_handle_bar():
+    rng = np.random.default_rng(2)
+    aud = 0.67 + np.cumsum(rng.normal(0, 5e-4, 300))
+    nzd = 0.58 + np.cumsum(rng.normal(0, 5e-4, 300))
+    config = {"lookback": 20, "entry_threshold": 1.0}
+    batched, single = StrategyStatArb(config), StrategyStatArb(config)
+
+    for a, n in zip(aud, nzd):
+        bars = [{"instrument": "AUD_USD", "close": a}, {"instrument": "NZD_USD", "close": n}]
+        assert batched.handle_bars(bars) == (single.handle_bar(bars[0]) or single.handle_bar(bars[1]))
+
+    key = "AUD_USD_NZD_USD"
+    assert list(batched._ratio_window[key]) == list(single._ratio_window[key])
+    assert batched._bar_count == single._bar_count == 600
+
+
+def test_params_stay_json_serialisable_after_trades():
+    # meta_optimize json.dump()s strat.params after update_trade_result
+    strat = StrategyStatArb({})
+    for i in range(60):
+        strat.update_trade_result(win=i % 3 != 0, pnl=1.0 if i % 3 else -1.0)
+    json.dumps(strat.params)
@@ -0,0 +1,11 @@
+import json
+
+from oanda_bot.strategy.supply_demand import StrategySupplyDemand
+
+
+def test_params_stay_json_serialisable_after_trades():
+    # meta_optimize json.dump()s strat.params after update_trade_result
+    strat = StrategySupplyDemand({})
+    for i in range(60):
+        strat.update_trade_result(win=i % 3 != 0, pnl=1.0 if i % 3 else -1.0)
+    json.dumps(strat.params)
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from oanda_bot.strategy.trend_ma import StrategyTrendMA
+
+
+def test_rolling_sma_sums_match_window():
+    strat = StrategyTrendMA({"fast": 5, "slow": 20})
+    closes = 1.1 + np.cumsum(np.random.default_rng(0).normal(0, 5e-4, 537))
+    for close in closes:
+        strat.handle_bar({"high": close + 1e-4, "low": close - 1e-4, "close": close})
+
+    assert strat._fast_sum == pytest.approx(closes[-5:].sum(), rel=1e-12)
+    assert strat._slow_sum == pytest.approx(closes[-20:].sum(), rel=1e-12)
+    assert len(strat.closes) == 21
+
+
+def test_atr_is_wilder_smoothed():
+    strat = StrategyTrendMA({"fast": 5, "slow": 20, "atr_window": 14})
+    rng = np.random.default_rng(1)
+    closes = 1.1 + np.cumsum(rng.normal(0, 5e-4, 200))
+    highs = closes + np.abs(rng.normal(0, 2e-4, 200))
+    lows = closes - np.abs(rng.normal(0, 2e-4, 200))
+    for h, l, c in zip(highs, lows, closes):
+        strat.handle_bar({"high": h, "low": l, "close": c})
+
+    prev = closes[:-1]
+    trs = np.maximum.reduce([highs[1:] - lows[1:], np.abs(highs[1:] - prev), np.abs(lows[1:] - prev)])
+    atr = trs[:14].mean()
+    for tr in trs[14:]:
+        atr = (atr * 13 + tr) / 14
+    assert strat._atr == pytest.approx(atr, rel=1e-12)
+
+
+def test_seed_matches_streamed_history():
+    config = {"fast": 5, "slow": 20, "atr_window": 14}
+    closes = (1.1 + np.cumsum(np.random.default_rng(2).normal(0, 5e-4, 60))).tolist()
+    candles = [
+        {"mid": {"o": repr(c), "h": repr(c + 1e-4), "l": repr(c - 1e-4), "c": repr(c)}}
+        for c in closes[:-1]
+    ]
+    candles.insert(10, "not a candle")
+
+    seeded = StrategyTrendMA(config)
+    seeded.seed(candles)
+    streamed = StrategyTrendMA(config)
+    for c in closes[:-1]:
+        streamed.handle_bar({"high": c + 1e-4, "low": c - 1e-4, "close": c})
+
+    assert list(seeded.closes) == list(streamed.closes)
+    assert seeded._atr == pytest.approx(streamed._atr, rel=1e-12)
+    last = {"high": closes[-1] + 1e-4, "low": closes[-1] - 1e-4, "close": closes[-1]}
+    assert seeded.handle_bar(dict(last)) == streamed.handle_bar(dict(last))
+    assert seeded._fast_sum == pytest.approx(sum(closes[-5:]), rel=1e-12)
+    assert seeded._slow_sum == pytest.approx(sum(closes[-20:]), rel=1e-12)
+
+
+@pytest.mark.parametrize("config", [{"fast": 5, "slow": 20}, {"fast": 10, "slow": 30, "atr_window": 40}])
+def test_handle_batch_matches_handle_bar(config):
+    rng = np.random.default_rng(3)
+    closes = 1.1 + np.cumsum(rng.normal(0, 5e-4, 3000))
+    highs = closes + np.abs(rng.normal(0, 2e-4, 3000))
+    lows = closes - np.abs(rng.normal(0, 2e-4, 3000))
+
+    live = StrategyTrendMA(config)
+    expected = [
+        live.handle_bar({"high": h, "low": l, "close": c})
+        for h, l, c in zip(highs.tolist(), lows.tolist(), closes.tolist())
+    ]
+    batch = StrategyTrendMA(config).handle_batch(highs, lows, closes)
+
+    assert sum(e is not None for e in expected) > 0
+    for want, got in zip(expected, batch):
+        if want is None:
+            assert got is None
+            continue
+        (want,) = want
+        assert got["side"] == want["side"] and got["price"] == want["price"]
+        assert got["stop_loss"] == pytest.approx(want["stop_loss"], rel=1e-12)
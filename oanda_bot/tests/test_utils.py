@@ -0,0 +1,42 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from oanda_bot.strategy import utils
+from oanda_bot.strategy.utils import _macd, _macd_tail
+
+
+@pytest.mark.parametrize("n", [2, 3, 60, 400])
+def test_macd_tail_matches_macd_series(n):
+    prices = 1.1 + np.cumsum(np.random.default_rng(n).normal(0, 5e-4, n))
+    macd_line, signal_line = _macd(prices, 12, 26, 9)
+
+    expected = (macd_line[-2], macd_line[-1], signal_line[-2], signal_line[-1])
+    assert _macd_tail(prices, 12, 26, 9) == pytest.approx(expected, abs=1e-12)
+
+
+def test_packed_results_window_matches_deque(monkeypatch):
+    for name, value in (("_results_bits", 0), ("_results_count", 0), ("_results_wins", 0)):
+        monkeypatch.setattr(utils, name, value)
+    monkeypatch.setattr(utils, "PARAMS", dict(utils.PARAMS))
+
+    window = deque(maxlen=utils._PERF_WINDOW)
+    outcomes = np.random.default_rng(0).random(450) < 0.55
+    for won in outcomes.tolist():
+        window.append(won)
+        utils.update_strategy_performance(won)
+        assert utils._results_wins == sum(window)
+        assert utils._results_count == len(window)
+
+
+def test_generate_signal_buf_matches_list_path():
+    prices = 1.1 + np.cumsum(np.random.default_rng(4).normal(0, 5e-4, 1500))
+    buf = np.empty(prices.size + 50)
+    signals = 0
+    for n in range(150, prices.size):
+        buf[:n] = prices[:n]
+        expected = utils.generate_signal(prices[:n].tolist())
+        assert utils.generate_signal_buf(buf, n) == expected
+        signals += expected is not None
+    assert signals > 0
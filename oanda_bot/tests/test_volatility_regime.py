@@ -0,0 +1,111 @@
+import json
+from collections import deque
+
+import numpy as np
+import pytest
+
+from oanda_bot.strategy._candle import bars_added
+from oanda_bot.strategy.volatility_regime import (
+    StrategyVolatilityRegime,
+    _atr,
+    _realized_volatility,
+)
+
+
+@pytest.mark.parametrize("window", [1, 5, 20])
+def test_realized_volatility_matches_numpy(window):
+    close = 1.1 + np.cumsum(np.random.default_rng(0).normal(0, 5e-4, 400))
+    close[200:260] = close[200]  # flat stretch: volatility must be exactly 0
+    returns = np.concatenate([[0.0], np.diff(close) / close[:-1]]).astype(np.float32)
+
+    vol = _realized_volatility(returns, window)
+    expected = np.zeros(len(returns))
+    for i in range(window, len(returns)):
+        expected[i] = np.std(returns[i - window:i])
+
+    assert np.array_equal(vol == 0, expected == 0)
+    assert vol == pytest.approx(expected, rel=1e-6)
+
+
+def test_derived_series_extend_matches_full_recompute():
+    rng = np.random.default_rng(1)
+    close = 1.1 + np.cumsum(rng.normal(0, 5e-4, 400))
+    high = close + np.abs(rng.normal(0, 3e-4, 400))
+    low = close - np.abs(rng.normal(0, 3e-4, 400))
+    candles = [
+        {"mid": {"h": str(h), "l": str(l), "c": str(c)}}
+        for h, l, c in zip(high, low, close)
+    ]
+    strat = StrategyVolatilityRegime({"lookback": 50, "vol_window": 20, "atr_period": 14})
+    window = deque(maxlen=120)
+    extended = 0
+    for i, candle in enumerate(candles):
+        window.append(candle)
+        if i % 3 == 2:
+            continue  # skipped ticks: the next call must catch up several bars
+        bars = list(window)
+        extended += bool(bars_added(strat._prev_bars, bars))
+        h, l, c = high[i + 1 - len(bars):i + 1], low[i + 1 - len(bars):i + 1], close[i + 1 - len(bars):i + 1]
+        returns = np.concatenate([[0.0], np.diff(c) / c[:-1]]).astype(np.float32)
+        vol, atr = strat._derived_series(bars, h, l, c, returns, 20, 14)
+
+        assert vol == pytest.approx(_realized_volatility(returns, 20), rel=1e-9)
+        assert atr == pytest.approx(_atr(h, l, c, 14)[-1], rel=1e-12)
+    assert extended > 200
+
+
+def test_rolling_window_state_tracks_vol():
+    rng = np.random.default_rng(2)
+    close = 1.1 + np.cumsum(rng.normal(0, 5e-4, 300))
+    candles = [{"mid": {"h": str(c), "l": str(c), "c": str(c)}} for c in close]
+    strat = StrategyVolatilityRegime({"lookback": 60, "vol_window": 10})
+    window = deque(maxlen=90)
+    for candle in candles:
+        window.append(candle)
+        strat.next_signal(list(window))
+        if strat._vol is not None and len(window) >= 60:
+            assert strat._sorted_recent == sorted(strat._vol[-60:].tolist())
+            assert strat._vol_sum == pytest.approx(strat._vol[-10:].sum(), rel=1e-12)
+
+
+def test_load_ohlc_parses_only_new_candles():
+    rng = np.random.default_rng(3)
+    close = 1.1 + np.cumsum(rng.normal(0, 5e-4, 500))
+    candles = [
+        {"mid": {"h": str(c + 1e-4), "l": str(c - 1e-4), "c": str(c)}} for c in close
+    ]
+    strat = StrategyVolatilityRegime({})
+    window = deque(maxlen=150)
+    for i, candle in enumerate(candles):
+        window.append(candle)
+        if i % 4 == 3:
+            continue
+        bars = list(window)
+        high, low, last = strat._load_ohlc(bars)
+        expected = close[i + 1 - len(bars):i + 1]
+        assert last.flags.c_contiguous
+        assert np.array_equal(last, [float(c["mid"]["c"]) for c in bars])
+        assert np.allclose(last, expected) and np.allclose(high - low, 2e-4)
+
+
+@pytest.mark.parametrize("position, expected", [(1, "SELL"), (-1, "BUY")])
+def test_regime_exit_closes_the_open_side(monkeypatch, position, expected):
+    from oanda_bot.strategy import volatility_regime
+
+    monkeypatch.setattr(volatility_regime, "_garch_regime", lambda *args: ("LOW", -1.5, 0.1))
+    close = 1.1 + np.cumsum(np.random.default_rng(4).normal(0, 5e-4, 150))
+    bars = [{"mid": {"h": str(c + 1e-4), "l": str(c - 1e-4), "c": str(c)}} for c in close]
+
+    strat = StrategyVolatilityRegime({"min_vol_ratio": 0.0})
+    strat._position = position
+    strat._entry_regime = "HIGH"
+    assert strat.next_signal(bars) == expected
+    assert strat._position == 0
+
+
+def test_params_stay_json_serialisable_after_trades():
+    # meta_optimize json.dump()s strat.params after update_trade_result
+    strat = StrategyVolatilityRegime({})
+    for i in range(60):
+        strat.update_trade_result(win=i % 3 != 0, pnl=1.0 if i % 3 else -1.0)
+    json.dumps(strat.params)
@@ -0,0 +1,50 @@
+import datetime as dt
+import json
+
+from oanda_bot.strategy.weekend_gap import StrategyWeekendGap, detect_weekend_gaps
+
+
+def make_candles(hours=24 * 21, start=dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)):
+    """Hourly candles that skip the weekend close, with a 30-pip Monday gap."""
+    candles = []
+    price = 1.1
+    for h in range(hours):
+        t = start + dt.timedelta(hours=h)
+        closed = (t.weekday() == 4 and t.hour >= 22) or t.weekday() == 5 or (
+            t.weekday() == 6 and t.hour < 21
+        )
+        if closed:
+            continue
+        opening = price + (0.003 if t.weekday() == 6 and t.hour == 21 else 0.0)
+        price = opening + 0.0001
+        candles.append({
+            "time": t.strftime("%Y-%m-%dT%H:%M:%S.000000000Z"),
+            "mid": {"o": f"{opening:.5f}", "c": f"{price:.5f}"},
+        })
+    return candles
+
+
+def test_detect_weekend_gaps_finds_friday_to_monday_transitions():
+    candles = make_candles()
+    gaps = detect_weekend_gaps(candles, "EUR_USD")
+
+    # Any Friday-or-later candle followed by a Monday one is a transition
+    # (here the Sunday-evening reopen into Monday 00:00)
+    expected = [
+        (prev, curr) for prev, curr in zip(candles, candles[1:])
+        if dt.date.fromisoformat(prev["time"][:10]).weekday() >= 4
+        and dt.date.fromisoformat(curr["time"][:10]).weekday() == 0
+    ]
+    assert len(gaps) == len(expected) == 2
+    for gap, (prev, curr) in zip(gaps, expected):
+        assert gap["friday_close"] == float(prev["mid"]["c"])
+        assert gap["monday_open"] == float(curr["mid"]["o"])
+        assert gap["date"] == dt.date.fromisoformat(curr["time"][:10])
+
+
+def test_params_stay_json_serialisable_after_trades():
+    # meta_optimize json.dump()s strat.params after update_trade_result
+    strat = StrategyWeekendGap({})
+    for i in range(60):
+        strat.update_trade_result(win=i % 3 != 0, pnl=1.0 if i % 3 else -1.0)
+    json.dumps(strat.params)
@@ -0,0 +1,175 @@
+import time
+from collections import deque
+
+import numpy as np
+import pytest
+
+from oanda_bot.strategy._candle import CandleBatch
+from oanda_bot.strategy.zscore_reversion import (
+    StrategyZScoreReversion,
+    _calculate_zscore,
+    _session_mask,
+    _time_hour,
+    sweep_zscore,
+)
+
+
+@pytest.mark.parametrize("lookback", [2, 20, 50])
+def test_zscore_matches_numpy(lookback):
+    prices = 1.1 + np.cumsum(np.random.default_rng(0).normal(0, 5e-4, 60))
+    recent = prices[-lookback:]
+    expected = (prices[-1] - recent.mean()) / recent.std()
+    assert _calculate_zscore(prices, lookback) == pytest.approx(expected, rel=1e-9)
+
+
+def test_zscore_flat_window_is_zero():
+    prices = np.full(30, 1.1)
+    assert _calculate_zscore(prices, 20) == 0.0
+    assert _calculate_zscore(prices[:10], 20) == 0.0
+
+
+def test_load_closes_tracks_sliding_window():
+    closes = 1.1 + np.cumsum(np.random.default_rng(1).normal(0, 5e-4, 200))
+    candles = [{"mid": {"c": f"{c:.5f}"}} for c in closes]
+    strat = StrategyZScoreReversion({"lookback": 20})
+    window = deque(maxlen=35)
+    for i, candle in enumerate(candles):
+        window.append(candle)
+        if i % 4 == 3:
+            continue  # skipped ticks: the next call must shift in several closes
+        bars = list(window)
+        expected = [float(c["mid"]["c"]) for c in bars[-20:]]
+        assert strat._load_closes(bars, 20).tolist() == expected
+
+
+@pytest.mark.parametrize("lookback", [5, 20])
+def test_backtest_signals_match_next_signal(lookback):
+    closes = 1.1 + np.cumsum(np.random.default_rng(2).normal(0, 5e-4, 1500))
+    params = {"lookback": lookback, "z_threshold": 1.8, "session_filter": False}
+    codes = {"BUY": 1, "SELL": -1, None: 0}
+
+    live = StrategyZScoreReversion(dict(params))
+    expected = [codes[live.next_signal(closes[:i + 1].tolist())] for i in range(len(closes))]
+
+    signals = StrategyZScoreReversion(dict(params)).backtest_signals(closes)
+    assert signals.dtype == np.int8
+    assert np.count_nonzero(signals) > 0
+    assert signals.tolist() == expected
+
+
+def test_session_filter_uses_candle_hour():
+    closes = [1.1] * 25 + [1.09]  # last close far below the mean
+    candles = [
+        {"time": f"2024-01-02T{i % 6:02d}:00:00.000000000Z", "mid": {"c": str(c)}}
+        for i, c in enumerate(closes)
+    ]
+    assert StrategyZScoreReversion({}).next_signal(candles) == "BUY"
+
+    candles[-1] = dict(candles[-1], time="2024-01-02T12:00:00.000000000Z")
+    assert StrategyZScoreReversion({}).next_signal(candles) is None
+
+
+def test_next_signal_batch_matches_next_signal():
+    closes = 1.1 + np.cumsum(np.random.default_rng(3).normal(0, 5e-4, 600))
+    candles = [
+        {"time": f"2024-01-{2 + i // 24:02d}T{i % 24:02d}:00:00.000000000Z", "mid": {"c": f"{c:.5f}"}}
+        for i, c in enumerate(closes)
+    ]
+    batch = CandleBatch.from_raw(candles)
+    params = {"lookback": 15, "z_threshold": 1.5}
+
+    live, batched = StrategyZScoreReversion(dict(params)), StrategyZScoreReversion(dict(params))
+    signals = []
+    for i in range(len(candles)):
+        start = max(0, i - 24)
+        expected = live.next_signal(candles[start:i + 1])
+        assert batched.next_signal_batch(batch.window(start, i + 1)) == expected
+        signals.append(expected)
+    assert "BUY" in signals and "SELL" in signals
+
+
+def test_sweep_matches_backtest_signals():
+    closes = 1.1 + np.cumsum(np.random.default_rng(4).normal(0, 5e-4, 2000))
+    results = sweep_zscore(closes, [10, 20], [1.5, 2.0], [0.5])
+    assert [(r["lookback"], r["z_threshold"]) for r in results] == [
+        (10, 1.5), (10, 2.0), (20, 1.5), (20, 2.0)
+    ]
+    for r in results:
+        params = {"lookback": r["lookback"], "z_threshold": r["z_threshold"], "z_exit": r["z_exit"]}
+        entries = np.count_nonzero(StrategyZScoreReversion(params).backtest_signals(closes))
+        # Every entry but possibly a last, still open one is closed
+        assert r["trades"] in (entries, entries - 1)
+        assert 0 < r["wins"] <= r["trades"]
+
+
+
+def test_naive_times_read_as_utc_on_both_paths(monkeypatch):
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is POSIX-only")
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        times = ["2024-01-02T03:00:00", "2024-01-02T12:00:00", "2024-01-02T03:00:00Z"]
+        assert [_time_hour(t) for t in times] == [3, 12, 3]
+        assert _session_mask(times).tolist() == [True, False, True]
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+def test_backtest_signals_apply_session_filter():
+    closes = 1.1 + np.cumsum(np.random.default_rng(5).normal(0, 5e-4, 700))
+    times = [f"2024-01-{1 + i // 24:02d}T{i % 24:02d}:00:00.000000000Z" for i in range(len(closes))]
+    candles = [{"time": t, "mid": {"c": repr(c)}} for t, c in zip(times, closes.tolist())]
+    params = {"lookback": 10, "z_threshold": 1.5}
+    codes = {"BUY": 1, "SELL": -1, None: 0}
+
+    live = StrategyZScoreReversion(dict(params))
+    expected = [codes[live.next_signal(candles[:i + 1])] for i in range(len(candles))]
+
+    signals = StrategyZScoreReversion(dict(params)).backtest_signals(closes, times)
+    assert signals.tolist() == expected
+    as_datetime64 = np.array([t[:19] for t in times], dtype="datetime64[s]")
+    assert StrategyZScoreReversion(dict(params)).backtest_signals(closes, as_datetime64).tolist() == expected
+    assert np.count_nonzero(signals) < np.count_nonzero(
+        StrategyZScoreReversion(dict(params)).backtest_signals(closes)
+    )
+
+
+def test_instances_are_slotted():
+    strat = StrategyZScoreReversion({})
+    assert not hasattr(strat, "__dict__")
+
+
+def test_update_trade_result_adapts_on_last_20_trades():
+    rng = np.random.default_rng(6)
+    strat = StrategyZScoreReversion({})
+    history, z_threshold = [], 2.0
+    for win in (rng.random(300) < np.linspace(0.2, 0.9, 300)).tolist():
+        strat.update_trade_result(win, 1.0 if win else -1.0)
+        history = (history + [win])[-20:]
+        if len(history) == 20:
+            win_rate = sum(history) / 20
+            if win_rate < 0.45:
+                z_threshold = min(3.0, z_threshold + 0.1)
+            elif win_rate > 0.70:
+                z_threshold = max(1.5, z_threshold - 0.1)
+        assert strat.params.get("z_threshold", 2.0) == z_threshold
+        assert strat._z_threshold == z_threshold
+
+
+def test_reset_matches_fresh_instance():
+    closes = 1.1 + np.cumsum(np.random.default_rng(7).normal(0, 5e-4, 400))
+    candles = [{"mid": {"c": repr(c)}} for c in closes.tolist()]
+    params = {"lookback": 12, "z_threshold": 1.6, "session_filter": False}
+
+    def run(strat):
+        signals = [strat.next_signal(candles[max(0, i - 40):i + 1]) for i in range(len(candles))]
+        for win in [False] * 20:
+            strat.update_trade_result(win, -1.0)
+        return signals, strat.params["z_threshold"]
+
+    reused = StrategyZScoreReversion({"lookback": 30, "session_filter": False})
+    run(reused)
+    reused.reset(dict(params))
+    assert run(reused) == run(StrategyZScoreReversion(dict(params)))
+    assert reused.pull_count == 20